@@ -0,0 +1,101 @@
+import numpy as np
+
+MILESTONES = {"1st": 0.0, "50%": 0.5, "90%": 0.9, "Last": 1.0}
+NEVER = -1  # Round reported for a node / milestone that was never reached
+
+
+def milestone_dead_count(p, num_nodes):
+    """
+    Dead-node count at which the p-milestone is reached: the (int(p * N) + 1)-th death.
+    """
+    return min(int(p * num_nodes), num_nodes - 1) + 1
+
+
+def sorted_deaths(death_round):
+    """
+    Per-node death rounds (-1 = never died) in ascending order, survivors last as NEVER.
+    """
+    death_round = np.asarray(death_round, dtype=np.int64)
+    never = np.iinfo(np.int64).max
+    ordered = np.sort(np.where(death_round < 0, never, death_round), axis=-1)
+    return np.where(ordered == never, NEVER, ordered)
+
+
+def dead_counts(death_round, rounds):
+    """
+    Rebuilds the per-round dead-node series from a death log.
+
+    Returns:
+    - dead: (rounds,) int32 number of nodes dead at the end of each round
+    """
+    deaths = sorted_deaths(death_round)
+    deaths = deaths[deaths >= 0]
+    return np.searchsorted(deaths, np.arange(rounds), side="right").astype(np.int32)
+
+
+def time_to_k_dead(dead, k):
+    """
+    First round with at least k dead nodes, by np.searchsorted over a per-round
+    dead-node series (non-decreasing).
+
+    Parameters:
+    - dead: (ROUNDS,) dead-node counts
+    - k: scalar or array of dead-node counts
+
+    Returns:
+    - round index (same shape as k), NEVER where k is not reached
+    """
+    dead = np.asarray(dead)
+    rounds = np.searchsorted(dead, k, side="left")
+    return np.where(rounds < len(dead), rounds, NEVER)
+
+
+def milestone_rounds(dead, num_nodes):
+    """
+    MILESTONES rounds from per-round dead-node counts (time_to_k_dead at each
+    milestone's dead count), matching milestone_table on the same run's death log.
+
+    Parameters:
+    - dead: (..., ROUNDS) dead-node counts per round (one row per run)
+    - num_nodes: nodes per run
+
+    Returns:
+    - dict milestone name → (...,) round index, NEVER where not reached
+    """
+    counts = [milestone_dead_count(p, num_nodes) for p in MILESTONES.values()]
+    rounds = np.apply_along_axis(time_to_k_dead, -1, np.asarray(dead), counts)
+    return {name: rounds[..., i] for i, name in enumerate(MILESTONES)}
+
+
+def death_percentile(death_round, p):
+    """
+    Round of the p-milestone: the (int(p * N) + 1)-th node death, the population
+    percentile utils.print_node_death_comparison reports (p=0 → first, p=1 → last death).
+
+    Returns:
+    - round index, NEVER if fewer nodes have died
+    """
+    deaths = sorted_deaths(death_round)
+    return int(deaths[milestone_dead_count(p, deaths.shape[-1]) - 1])
+
+
+def lifetime_metrics(death_round):
+    """
+    Standard network lifetime metrics from a per-node death log.
+
+    Returns:
+    - dict with FND (first node dead), HND (half of the nodes dead, the "50%"
+      milestone) and LND (last node dead), NEVER where not reached
+    """
+    return {
+        "FND": death_percentile(death_round, MILESTONES["1st"]),
+        "HND": death_percentile(death_round, MILESTONES["50%"]),
+        "LND": death_percentile(death_round, MILESTONES["Last"]),
+    }
+
+
+def milestone_table(death_round):
+    """
+    MILESTONES rounds (1st / 50% / 90% / Last) from a per-node death log.
+    """
+    return {name: death_percentile(death_round, p) for name, p in MILESTONES.items()}
@@ -0,0 +1,245 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from clustering import form_clusters, nearest_CH
+from communication import transmit
+from deployment import Deployment
+from params import SimParams
+
+from e_deecp.init_nodes import initialize_nodes as init_proposed_nodes, total_energy as total_energy_proposed
+from deecp.init_nodes import total_energy as total_energy_baseline
+from e_deecp.ch_selection import select_CHs as select_CHs_proposed
+from deecp.ch_selection import select_CHs as select_CHs_baseline
+
+from q_learn_deecp.q_learning_agent import QLearningPopulation
+from q_learn_deecp.q_learning_ch_selection import select_CHs_population, update_population
+
+# ------------------------------
+# Scenarios
+# ------------------------------
+SEED = 48
+CH_DENSITY = 0.05                      # Fixed CH fraction for kernel inputs and scaling runs
+KERNEL_SIZES = (50, 200, 1000, 5000, 20000)
+SCALING_SIZES = (50, 200, 1000, 5000, 20000)
+SCALING_ROUNDS = 50                    # Rounds per end-to-end scaling run
+PAPER_CONFIGS = [(50, 0.21), (100, 0.05), (150, 0.02), (200, 0.01)]  # simulate_network.py grid
+METHODS = ("baseline", "proposed", "q_learning")
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "benchmark_history.jsonl")
+DEFAULT_THRESHOLD = 0.20               # Allowed slowdown vs the previous run (20 %)
+
+
+def best_time(func, repeat=5, number=1):
+    """
+    Best-of-repeat wall time of one func() call, in seconds (number calls per sample).
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return min(samples)
+
+
+def kernel_inputs(num_nodes, seed=SEED, ch_density=CH_DENSITY):
+    """
+    Fixed per-size inputs: seeded layout, three-level energies, all nodes alive
+    and a seeded CH set of density ch_density.
+    """
+    params = SimParams.from_config(NUM_NODES=num_nodes, p_opt=ch_density)
+    rng = np.random.RandomState(seed)
+    deployment = Deployment.random(seed, params)
+    energies, _ = init_proposed_nodes(params, rng=rng)
+    alive = np.ones(num_nodes, dtype=bool)
+    is_CH = rng.rand(num_nodes) < ch_density
+    is_CH[0] = True  # At least one CH
+    return params, deployment, energies, alive, is_CH
+
+
+def kernel_benchmarks(sizes=KERNEL_SIZES, repeat=5):
+    """
+    Times each per-round kernel on its own.
+
+    Returns:
+    - results: dict benchmark name → seconds per call
+    """
+    results = {}
+    for N in sizes:
+        params, deployment, energies, alive, is_CH = kernel_inputs(N)
+        positions = deployment.positions
+        E_base, E_prop = total_energy_baseline(params), total_energy_proposed(params)
+        rng = np.random.RandomState(SEED)
+        population = QLearningPopulation(N)
+
+        CH_indices, CM_indices, assign = form_clusters(positions, is_CH, alive, deployment=deployment)
+
+        kernels = {
+            "select_CHs/baseline": lambda: select_CHs_baseline(
+                positions, energies, alive, E_base, 1, deployment=deployment, params=params, rng=rng),
+            "select_CHs/proposed": lambda: select_CHs_proposed(
+                positions, energies, alive, E_prop, 1, deployment=deployment, params=params, rng=rng),
+            "select_CHs/q_learning": lambda: select_CHs_population(
+                positions, energies, alive, E_prop, 1, population, deployment=deployment, params=params, rng=rng),
+            "form_clusters": lambda: form_clusters(positions, is_CH, alive, deployment=deployment),
+            "nearest_CH/brute": lambda: nearest_CH(positions[CM_indices], positions[CH_indices], "brute"),
+            "nearest_CH/kdtree": lambda: nearest_CH(positions[CM_indices], positions[CH_indices], "kdtree"),
+            "nearest_CH/grid": lambda: nearest_CH(positions[CM_indices], positions[CH_indices], "grid"),
+            "transmit": lambda: transmit(
+                positions, energies.copy(), CH_indices, CM_indices, assign, deployment=deployment, params=params),
+            "update_population": lambda: update_population(
+                population, alive, energies, deployment.d_sink_norm, 1.0, 1, params),
+        }
+        for name, func in kernels.items():
+            results[f"kernel/{name}/N={N}"] = best_time(func, repeat=repeat)
+
+    return results
+
+
+def simulate_benchmarks(cases, repeat=1, **simulate_kwargs):
+    """
+    Times end-to-end index.simulate (simulate_kwargs, e.g. backend, are forwarded).
+
+    Parameters:
+    - cases: iterable of (name, SimParams, method)
+
+    Returns:
+    - results: dict benchmark name → seconds per run
+    """
+    from index import simulate
+
+    # Warm-up (lazy imports, JIT compilation of fused backends) outside the timings
+    for method in {method for _, _, method in cases}:
+        simulate(method=method, params=SimParams.from_config(NUM_NODES=50, ROUNDS=2), seed=SEED, **simulate_kwargs)
+
+    return {
+        name: best_time(lambda: simulate(method=method, params=params, seed=SEED, **simulate_kwargs), repeat=repeat)
+        for name, params, method in cases
+    }
+
+
+def scaling_cases(sizes=SCALING_SIZES, rounds=SCALING_ROUNDS):
+    """
+    Short runs (rounds rounds) at fixed CH density across node counts.
+    """
+    return [
+        (f"simulate/{method}/N={N}/R={rounds}",
+         SimParams.from_config(NUM_NODES=N, p_opt=CH_DENSITY, ROUNDS=rounds), method)
+        for N in sizes
+        for method in METHODS
+    ]
+
+
+def paper_cases(configs=PAPER_CONFIGS):
+    """
+    Full-length runs of the simulate_network.py (NUM_NODES, p_opt) grid.
+    """
+    return [
+        (f"paper/{method}/N={N}/p={p}", SimParams.from_config(NUM_NODES=N, p_opt=p), method)
+        for N, p in configs
+        for method in METHODS
+    ]
+
+
+# ------------------------------
+# History and regression check
+# ------------------------------
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(path, record):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def find_regressions(results, history, host, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares results against the latest earlier timing of each benchmark on the same host.
+
+    Returns:
+    - list of (name, previous seconds, current seconds) slower by more than threshold
+    """
+    previous = {}
+    for record in history:
+        if record.get("host") == host:
+            previous.update(record["results"])
+
+    return [
+        (name, previous[name], seconds)
+        for name, seconds in results.items()
+        if name in previous and seconds > previous[name] * (1 + threshold)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kernel and end-to-end simulate benchmarks")
+    parser.add_argument("--scenario", choices=["kernels", "scaling", "paper", "all"], default="all")
+    parser.add_argument("--sizes", type=int, nargs="+", help="node counts for kernels / scaling")
+    parser.add_argument("--rounds", type=int, default=SCALING_ROUNDS, help="rounds per scaling run")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per kernel (best is kept)")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON-lines history file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fail when a benchmark is this fraction slower than its last run")
+    parser.add_argument("--backend", default="numpy", help="simulate backend for end-to-end runs (see fused.py)")
+    parser.add_argument("--no-record", action="store_true", help="check without appending to the history")
+    args = parser.parse_args(argv)
+
+    results = {}
+    if args.scenario in ("kernels", "all"):
+        results.update(kernel_benchmarks(args.sizes or KERNEL_SIZES, repeat=args.repeat))
+    suffix = "" if args.backend == "numpy" else f"/{args.backend}"
+    cases = []
+    if args.scenario in ("scaling", "all"):
+        cases += scaling_cases(args.sizes or SCALING_SIZES, args.rounds)
+    if args.scenario in ("paper", "all"):
+        cases += paper_cases()
+    cases = [(name + suffix, params, method) for name, params, method in cases]
+    results.update(simulate_benchmarks(cases, backend=args.backend))
+
+    host = platform.node()
+    regressions = find_regressions(results, load_history(args.history), host, args.threshold)
+
+    for name, seconds in results.items():
+        print(f"{name:<50} {seconds * 1e3:>12.3f} ms")
+
+    if not args.no_record:
+        append_history(args.history, {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "host": host,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "results": results,
+        })
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+        for name, before, after in regressions:
+            print(f"  {name:<48} {before * 1e3:>10.3f} → {after * 1e3:>10.3f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,20 @@
 import numpy as np
 
-def form_clusters(positions, is_CH, alive):
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional, the grid index covers large runs without it
+    cKDTree = None
+
+BRUTE_FORCE_MAX_PAIRS = 12_000     # CM x CH pairs below which a dense distance matrix wins (benchmark.py kernel/nearest_CH)
+CHUNK_PAIRS = 1_000_000            # distance matrix entries evaluated per chunk
+KDTREE_K = 4                       # tree candidates re-checked per CM for exact tie-breaking
+GRID_MAX_PER_CELL = 64             # denser CH cells fall back to brute force
+CLUSTERING_MODES = ("full", "incremental")
+CHURN_REBUILD_FRACTION = 0.1       # CH / CM churn fraction above which IncrementalClusters rebuilds
+NODES_PER_CELL = 16                # nodes per cell of the IncrementalClusters member grid
+UPDATE_BRUTE_MAX_PAIRS = 20_000    # brute-force limit for IncrementalClusters searches (tree/grid above)
+
+def form_clusters(positions, is_CH, alive, method="auto", deployment=None):
     """
     Assigns each alive Cluster Member (CM) to the nearest alive Cluster Head (CH).
 
@@ -8,6 +22,8 @@ def form_clusters(positions, is_CH, alive):
     - positions: ndarray of shape (N, 2), node coordinates
     - is_CH: Boolean array, True if node is a Cluster Head
     - alive: Boolean array, True if node is alive
+    - method: "auto", "brute", "kdtree", "grid" or "loop" (original per-CM loop)
+    - deployment: cached Deployment; its pairwise distance matrix is used when present
 
     Returns:
     - CH_indices: indices of alive CHs
@@ -21,10 +37,406 @@ def form_clusters(positions, is_CH, alive):
     if CH_indices.size == 0:
         return CH_indices, CM_indices, cluster_assignments  # No CHs to assign
 
-    # Assign each CM to the nearest CH
-    for cm in CM_indices:
-        distances = np.linalg.norm(positions[CH_indices] - positions[cm], axis=1)
-        nearest_ch_index = np.argmin(distances)
-        cluster_assignments[cm] = CH_indices[nearest_ch_index]
+    if method == "loop":
+        # Assign each CM to the nearest CH
+        for cm in CM_indices:
+            distances = np.linalg.norm(positions[CH_indices] - positions[cm], axis=1)
+            nearest_ch_index = np.argmin(distances)
+            cluster_assignments[cm] = CH_indices[nearest_ch_index]
+
+        return CH_indices, CM_indices, cluster_assignments
+
+    if method == "auto" and deployment is not None and deployment.d_pair is not None:
+        nearest = np.argmin(deployment.d_pair[np.ix_(CM_indices, CH_indices)], axis=1)
+        cluster_assignments[CM_indices] = CH_indices[nearest]
+        return CH_indices, CM_indices, cluster_assignments
+
+    if method == "auto":
+        method = choose_method(CM_indices.size, CH_indices.size)
+
+    nearest = nearest_CH(positions[CM_indices], positions[CH_indices], method)
+    cluster_assignments[CM_indices] = CH_indices[nearest]
+
+    return CH_indices, CM_indices, cluster_assignments
+
+
+def form_clusters_replicas(positions, is_CH, alive, num_replicas, d_pair=None, max_pairs=BRUTE_FORCE_MAX_PAIRS):
+    """
+    form_clusters for num_replicas independent networks stored as consecutive,
+    equally sized blocks of one node array (ensemble lockstep): each CM joins
+    the nearest alive CH of its own block.
+
+    Small blocks are searched in one pass over a (blocks, K) table: every CM
+    is compared with its block's CHs only, in ascending order and padded to
+    the largest CH count by repeating the block's first CH, so distances and
+    tie-breaking (first minimum) match form_clusters on each block alone.
+    Blocks whose CM x CH pairs exceed max_pairs are searched one by one with
+    the index choose_method picks.
+
+    Parameters:
+    - positions: (num_replicas * N, 2) node coordinates, block after block
+    - is_CH, alive: (num_replicas * N,) Boolean arrays
+    - num_replicas: number of blocks
+    - d_pair: optional (num_replicas, N, N) per-block Deployment.d_pair, read instead of recomputing distances
+    - max_pairs: per-block CM x CH pairs up to which the single pass is used
+
+    Returns:
+    - CH_indices, CM_indices, cluster_assignments as in form_clusters, in flat node ids
+    """
+    N = len(positions) // num_replicas
+    CH_indices = np.flatnonzero(is_CH & alive)
+    CM_indices = np.flatnonzero(~is_CH & alive)
+    cluster_assignments = -np.ones(len(positions), dtype=int)
 
+    ch_block = CH_indices // N
+    counts = np.bincount(ch_block, minlength=num_replicas)
+    members = CM_indices[counts[CM_indices // N] > 0]  # Blocks without CHs stay unassigned
+    if members.size == 0:
+        return CH_indices, CM_indices, cluster_assignments
+
+    K = int(counts.max())
+    ch_start = np.concatenate(([0], np.cumsum(counts)))
+    if choose_method(-(-members.size // num_replicas), K, max_pairs) != "brute":
+        cm_start = np.searchsorted(members, np.arange(num_replicas + 1) * N)
+        for block in np.flatnonzero(counts):
+            cms = members[cm_start[block]:cm_start[block + 1]]
+            if cms.size == 0:
+                continue
+            chs = CH_indices[ch_start[block]:ch_start[block + 1]]
+            method = choose_method(cms.size, chs.size, max_pairs)
+            cluster_assignments[cms] = chs[nearest_CH(positions[cms], positions[chs], method)]
+        return CH_indices, CM_indices, cluster_assignments
+
+    # (blocks, K) table of CH ids, padded with each block's first CH (a repeated
+    # candidate never wins a tie, argmin keeps the first minimum)
+    table = np.repeat(CH_indices[np.minimum(ch_start[:-1], CH_indices.size - 1)][:, None], K, axis=1)
+    table[ch_block, np.arange(CH_indices.size) - ch_start[ch_block]] = CH_indices
+    table_local = table % N
+
+    rows = max(1, CHUNK_PAIRS // K)
+    for start in range(0, members.size, rows):
+        cms = members[start:start + rows]
+        block = cms // N
+        if d_pair is not None:
+            # Flat d_pair index (block * N + cm) * N + ch, where cm's flat id is block * N + cm
+            d = np.take(d_pair, cms[:, None] * N + table_local[block])
+        else:
+            diff = positions[table[block]] - positions[cms][:, None, :]
+            d = np.sqrt(np.add.reduce(diff * diff, axis=-1))
+        cluster_assignments[cms] = table[block, np.argmin(d, axis=1)]
     return CH_indices, CM_indices, cluster_assignments
+
+
+def choose_method(num_CMs, num_CHs, max_pairs=BRUTE_FORCE_MAX_PAIRS):
+    """
+    Picks the assignment backend from the round's CM and CH counts.
+    """
+    if num_CMs * num_CHs <= max_pairs or num_CHs <= KDTREE_K:
+        return "brute"
+    return "kdtree" if cKDTree is not None else "grid"
+
+
+def nearest_CH(cm_pos, ch_pos, method="brute"):
+    """
+    Finds the nearest CH for every CM point.
+
+    Distances are evaluated exactly like np.linalg.norm(..., axis=1) in the
+    per-CM loop, and ties go to the lowest CH position, matching np.argmin.
+
+    Parameters:
+    - cm_pos: (M, 2) CM coordinates
+    - ch_pos: (K, 2) CH coordinates, K > 0
+    - method: "brute", "kdtree" or "grid"
+
+    Returns:
+    - nearest: (M,) positions into ch_pos
+    """
+    if method == "kdtree" and cKDTree is not None:
+        return _nearest_kdtree(cm_pos, ch_pos)
+    if method == "grid":
+        return _nearest_grid(cm_pos, ch_pos)
+    return _nearest_brute(cm_pos, ch_pos)
+
+
+def _distances(cm_pos, ch_pos, candidates):
+    """
+    Exact CM→candidate distances; candidates is (M, C) with -1 padding (→ inf).
+    """
+    diff = ch_pos[np.maximum(candidates, 0)] - cm_pos[:, None, :]
+    d = np.sqrt(np.add.reduce(diff * diff, axis=-1))
+    d[candidates < 0] = np.inf
+    return d
+
+
+def _pick(d, candidates):
+    """
+    Lowest candidate among the minimum distances of each row.
+    """
+    d_min = d.min(axis=1)
+    tied = (d == d_min[:, None]) & (candidates >= 0)
+    return np.where(tied, candidates, np.iinfo(candidates.dtype).max).min(axis=1), d_min
+
+
+def _nearest_brute(cm_pos, ch_pos):
+    nearest = np.empty(len(cm_pos), dtype=int)
+    rows = max(1, CHUNK_PAIRS // len(ch_pos))
+
+    for start in range(0, len(cm_pos), rows):
+        block = cm_pos[start:start + rows]
+        diff = ch_pos[None, :, :] - block[:, None, :]
+        d = np.sqrt(np.add.reduce(diff * diff, axis=-1))
+        nearest[start:start + rows] = np.argmin(d, axis=1)  # first minimum = lowest CH
+
+    return nearest
+
+
+def _nearest_kdtree(cm_pos, ch_pos):
+    k = min(KDTREE_K, len(ch_pos))
+    tree_d, candidates = cKDTree(ch_pos).query(cm_pos, k=k)
+    candidates = np.sort(candidates.reshape(len(cm_pos), k), axis=1)
+    tree_d = tree_d.reshape(len(cm_pos), k)
+
+    nearest, d_min = _pick(_distances(cm_pos, ch_pos, candidates), candidates)
+
+    # Rows whose k-th candidate may tie the minimum could hide an equidistant,
+    # lower-indexed CH beyond k: resolve those exactly
+    if k < len(ch_pos):
+        unsure = tree_d[:, -1] <= d_min * (1 + 1e-9) + 1e-12
+        if np.any(unsure):
+            nearest[unsure] = _nearest_brute(cm_pos[unsure], ch_pos)
+
+    return nearest
+
+
+def _nearest_grid(cm_pos, ch_pos):
+    """
+    Uniform-grid index over the CHs, searching the 3x3 cell block around each CM.
+
+    Any CH outside the block is at least one cell size away, so rows whose best
+    distance is strictly smaller are exact; the rest fall back to brute force.
+    """
+    if len(cm_pos) == 0:
+        return np.empty(0, dtype=int)
+    lo = np.minimum(cm_pos.min(axis=0), ch_pos.min(axis=0))
+    span = max(float(np.max(np.maximum(cm_pos.max(axis=0), ch_pos.max(axis=0)) - lo)), 1e-9)
+    cells = max(1, int(np.sqrt(len(ch_pos))))
+    cell = span / cells
+
+    def cell_xy(points):
+        return np.clip(((points - lo) / cell).astype(int), 0, cells - 1)
+
+    # Bucket CHs by cell into a padded (cells^2 + 1, m) table; the extra row stays empty
+    ch_xy = cell_xy(ch_pos)
+    ch_cell = ch_xy[:, 0] * cells + ch_xy[:, 1]
+    order = np.argsort(ch_cell, kind="stable")
+    counts = np.bincount(ch_cell, minlength=cells * cells)
+    m = counts.max()
+    if m > GRID_MAX_PER_CELL:
+        return _nearest_brute(cm_pos, ch_pos)
+
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    slot = np.arange(len(ch_pos)) - starts[ch_cell[order]]
+    table = -np.ones((cells * cells + 1, m), dtype=int)
+    table[ch_cell[order], slot] = order
+
+    # Gather the 3x3 neighbourhood of every CM
+    cm_xy = cell_xy(cm_pos)
+    blocks = []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            x, y = cm_xy[:, 0] + dx, cm_xy[:, 1] + dy
+            inside = (x >= 0) & (x < cells) & (y >= 0) & (y < cells)
+            blocks.append(table[np.where(inside, x * cells + y, cells * cells)])
+    candidates = np.concatenate(blocks, axis=1)
+
+    nearest, d_min = _pick(_distances(cm_pos, ch_pos, candidates), candidates)
+
+    unsure = ~(d_min < cell)
+    if np.any(unsure):
+        nearest[unsure] = _nearest_brute(cm_pos[unsure], ch_pos)
+
+    return nearest
+
+
+class IncrementalClusters:
+    """
+    form_clusters maintained across rounds instead of recomputed.
+
+    Keeps each CM's nearest CH and its distance, an index CH → members and a
+    static uniform grid of the nodes with a per-cell upper bound on member
+    distances. Each round only these nodes are searched:
+    - CMs that left (died or became CH) are detached
+    - members of removed CHs and newly joined CMs search all current CHs
+    - members in cells close enough to an added CH compare against the added CHs
+
+    A kept member's CH stays nearest among the surviving CHs, so comparing it
+    with the added ones (ties → lowest index) reproduces the from-scratch
+    assignment exactly. When CH additions + removals exceed churn_threshold
+    times the CH count, or the nodes to re-search exceed it times the CM
+    count, the round is rebuilt with form_clusters instead.
+
+    The index is a CSR table (CH-sorted members) from the last rebuild plus a
+    journal of later reassignments; entries are checked against the current
+    assignment when read, so updates never rewrite it and cost O(churn). The
+    journal is folded into a new table once it reaches N entries.
+
+    Calls return the same triple as form_clusters; cluster_assignments is a
+    reused buffer (valid until the next call).
+    """
+    def __init__(self, positions, deployment=None, churn_threshold=CHURN_REBUILD_FRACTION):
+        self.positions = positions
+        self.deployment = deployment
+        self.churn_threshold = churn_threshold
+        N = len(positions)
+        self.is_CH = np.zeros(N, dtype=bool)
+        self.is_CM = np.zeros(N, dtype=bool)
+        self.assignments = -np.ones(N, dtype=int)
+        self.dist = np.full(N, np.inf)
+        self.rebuilds = 0
+        self.updates = 0
+        self.searched = 0                      # Nodes re-searched by incremental updates
+        self.stale = True
+
+        # Static node grid (CSR by cell)
+        lo, hi = positions.min(axis=0), positions.max(axis=0)
+        self.cells = max(1, int(np.sqrt(N / NODES_PER_CELL)))
+        self.cell = max(float(np.max(hi - lo)), 1e-9) / self.cells
+        xy = np.clip(((positions - lo) / self.cell).astype(int), 0, self.cells - 1)
+        self.node_cell = xy[:, 0] * self.cells + xy[:, 1]
+        self.cell_order = np.argsort(self.node_cell, kind="stable")
+        counts = np.bincount(self.node_cell, minlength=self.cells * self.cells)
+        self.cell_start = np.concatenate(([0], np.cumsum(counts)))
+        self.reach = np.zeros(self.cells * self.cells)  # ≥ max member distance per cell
+        gx, gy = np.divmod(np.arange(self.cells * self.cells), self.cells)
+        self.cell_lo = lo + self.cell * np.stack([gx, gy], axis=1)
+
+    def __call__(self, is_CH, alive):
+        CH_new = is_CH & alive
+        CM_new = ~is_CH & alive
+        CH_indices = np.flatnonzero(CH_new)
+        CM_indices = np.flatnonzero(CM_new)
+
+        if CH_indices.size == 0:
+            self._detach(np.flatnonzero(self.is_CM))
+            self.is_CH, self.is_CM = CH_new, np.zeros_like(CM_new)
+            return CH_indices, CM_indices, self.assignments
+
+        added = np.flatnonzero(CH_new & ~self.is_CH)
+        removed = np.flatnonzero(self.is_CH & ~CH_new)
+        limit = self.churn_threshold
+        rebuild = not self.is_CH.any() or added.size + removed.size > limit * CH_indices.size
+        if not rebuild:
+            if self.stale:
+                self._index()
+            orphans = self._members(removed)
+            orphans = orphans[CM_new[orphans]]
+            joined = np.flatnonzero(CM_new & ~self.is_CM)
+            rebuild = orphans.size + joined.size > limit * CM_indices.size
+        if rebuild:
+            self._rebuild(is_CH, alive, CM_indices)
+            self.is_CH, self.is_CM = CH_new, CM_new
+            return CH_indices, CM_indices, self.assignments
+
+        self.updates += 1
+        # CMs that died or became CH, and members of removed CHs
+        self._detach(np.flatnonzero(self.is_CM & ~CM_new))
+        self._detach(orphans)
+
+        # Kept members closer to an added CH
+        if added.size:
+            self._attach_added(added)
+
+        # Orphans and newly joined CMs search every current CH
+        search = np.concatenate([orphans, joined])
+        if search.size:
+            method = choose_method(search.size, CH_indices.size, UPDATE_BRUTE_MAX_PAIRS)
+            nearest = nearest_CH(self.positions[search], self.positions[CH_indices], method)
+            self._assign(search, CH_indices[nearest])
+            self.searched += search.size
+
+        self.is_CH, self.is_CM = CH_new, CM_new
+        return CH_indices, CM_indices, self.assignments
+
+    def _rebuild(self, is_CH, alive, CM_indices):
+        self.rebuilds += 1
+        _, _, self.assignments = form_clusters(self.positions, is_CH, alive, deployment=self.deployment)
+        self.dist = np.full(len(self.positions), np.inf)
+        diff = self.positions[self.assignments[CM_indices]] - self.positions[CM_indices]
+        self.dist[CM_indices] = np.sqrt(np.add.reduce(diff * diff, axis=-1))
+        self.stale = True  # Index and reach are rebuilt when the next round updates
+
+    def _index(self):
+        """
+        Rebuilds the CSR member table and per-cell reach from the current
+        assignment and empties the journal.
+        """
+        members = np.flatnonzero(self.assignments >= 0)
+        order = np.argsort(self.assignments[members], kind="stable")
+        self.index_nodes = members[order]
+        self.index_start = np.searchsorted(self.assignments[self.index_nodes], np.arange(len(self.positions) + 1))
+        self.journal = []
+        self.journal_size = 0
+        self.reach[:] = 0
+        np.maximum.at(self.reach, self.node_cell[members], self.dist[members])
+        self.stale = False
+
+    def _members(self, heads):
+        """
+        Current members of the given CHs (index table + journal, stale entries dropped).
+        """
+        if heads.size == 0:
+            return np.empty(0, dtype=int)
+        lengths = self.index_start[heads + 1] - self.index_start[heads]
+        offsets = np.repeat(self.index_start[heads] - np.cumsum(lengths) + lengths, lengths)
+        parts = [self.index_nodes[offsets + np.arange(lengths.sum())]]
+        if self.journal:
+            self.journal = [np.concatenate(self.journal)]
+            parts.append(self.journal[0])
+        candidates = np.unique(np.concatenate(parts))
+        return candidates[np.isin(self.assignments[candidates], heads)]
+
+    def _detach(self, nodes):
+        self.assignments[nodes] = -1
+        self.dist[nodes] = np.inf
+
+    def _assign(self, nodes, heads):
+        """
+        Attaches nodes to heads and journals the move.
+        """
+        diff = self.positions[heads] - self.positions[nodes]
+        self.dist[nodes] = np.sqrt(np.add.reduce(diff * diff, axis=-1))
+        self.assignments[nodes] = heads
+        np.maximum.at(self.reach, self.node_cell[nodes], self.dist[nodes])
+        self.journal.append(nodes)
+        self.journal_size += nodes.size
+        if self.journal_size >= len(self.positions):
+            self._index()
+
+    def _attach_added(self, added):
+        # Cells whose nearest point to an added CH lies within the cell's reach
+        ch_pos = self.positions[added]
+        gap = np.maximum(np.maximum(self.cell_lo[None, :, :] - ch_pos[:, None, :],
+                                    ch_pos[:, None, :] - (self.cell_lo[None, :, :] + self.cell)), 0)
+        near = np.sqrt(np.add.reduce(gap * gap, axis=-1))
+        cells = np.flatnonzero(np.any(near <= self.reach * (1 + 1e-9) + 1e-12, axis=0))
+        if cells.size == 0:
+            return
+
+        # Nodes of those cells that are still attached members
+        lengths = self.cell_start[cells + 1] - self.cell_start[cells]
+        offsets = np.repeat(self.cell_start[cells] - np.cumsum(lengths) + lengths, lengths)
+        nodes = self.cell_order[offsets + np.arange(lengths.sum())]
+        nodes = nodes[self.assignments[nodes] >= 0]
+        if nodes.size == 0:
+            return
+
+        # Nearest added CH (exact, ties → lowest index since added is ascending)
+        method = choose_method(nodes.size, added.size, UPDATE_BRUTE_MAX_PAIRS)
+        best = added[nearest_CH(self.positions[nodes], ch_pos, method)]
+        diff = self.positions[best] - self.positions[nodes]
+        d_best = np.sqrt(np.add.reduce(diff * diff, axis=-1))
+        current = self.assignments[nodes]
+        switch = (d_best < self.dist[nodes]) | ((d_best == self.dist[nodes]) & (best < current))
+        if np.any(switch):
+            self._assign(nodes[switch], best[switch])
+        self.searched += nodes.size
@@ -1,7 +1,57 @@
 import numpy as np
-from config import *
+from params import resolve
 
-def transmit(positions, energies, CH_indices, CM_indices, cluster_assignments):
+def tx_energy(d, params=None):
+    """
+    Eq. (8) transmit energy for an array of distances, switching between the
+    free-space (d^2) and multipath (d^4) models with a mask at do = sqrt(Efs / Emp).
+    """
+    params = resolve(params)
+    packet_size, Eelec, Efs, Emp = params.packet_size, params.Eelec, params.Efs, params.Emp
+
+    d = np.asarray(d, dtype=float)
+    do = np.sqrt(Efs / Emp)
+    return packet_size * (Eelec + np.where(d < do, Efs * d**2, Emp * d**4))
+
+
+def link_counts(positions, CH_indices, CM_indices, cluster_assignments, deployment=None, params=None, ch_d=None):
+    """
+    Counts the links of one communication round.
+
+    ch_d holds each CH's transmit distance (the next hop under multi-hop
+    routing); by default CHs send straight to the sink.
+
+    Returns:
+    - dict with "orphans" (CMs without a CH, sent direct to sink), and
+      "multipath" / "free_space" transmissions (d >= do / d < do in Eq. (8))
+    """
+    params = resolve(params)
+    do = np.sqrt(params.Efs / params.Emp)
+    SINK_POS = np.array(params.SINK_POS)
+
+    ch_of = cluster_assignments[CM_indices]
+    orphan = ch_of == -1
+    if deployment is not None and deployment.d_pair is not None:
+        cm_d = deployment.d_pair[CM_indices, np.maximum(ch_of, 0)]
+        cm_d[orphan] = deployment.d_sink[CM_indices[orphan]]
+    else:
+        dest = np.where(orphan[:, None], SINK_POS, positions[np.maximum(ch_of, 0)])
+        cm_d = np.linalg.norm(positions[CM_indices] - dest, axis=1)
+    if ch_d is None and deployment is not None:
+        ch_d = deployment.d_sink[CH_indices]
+    elif ch_d is None:
+        ch_d = np.linalg.norm(positions[CH_indices] - SINK_POS, axis=1)
+
+    multipath = int(np.count_nonzero(cm_d >= do) + np.count_nonzero(ch_d >= do))
+    return {
+        "orphans": int(np.count_nonzero(orphan)),
+        "multipath": multipath,
+        "free_space": len(CM_indices) + len(CH_indices) - multipath,
+    }
+
+
+def transmit(positions, energies, CH_indices, CM_indices, cluster_assignments, vectorized=True, deployment=None,
+             params=None, stats=None, router=None):
     """
     Simulates one communication round:
     - CMs send data to CHs
@@ -18,11 +68,64 @@ def transmit(positions, energies, CH_indices, CM_indices, cluster_assignments):
     - CH_indices: list of current cluster heads
     - CM_indices: list of cluster members
     - cluster_assignments: mapping from CM to CH index
+    - vectorized: bulk array accounting (False runs the per-node loop)
+    - deployment: cached Deployment with per-node sink / pairwise ETx
+    - params: SimParams (defaults to a config.py snapshot)
+    - stats: optional dict, updated with link_counts for this round (and "relays" with a router)
+    - router: routing.MultiHopRouter for multi-hop CH → sink delivery (None = single hop)
 
     Returns:
     - Updated energies
     - Packet count for throughput tracking
     """
+    params = resolve(params)
+    packet_size, Eelec, EDA, Efs, Emp = params.packet_size, params.Eelec, params.EDA, params.Efs, params.Emp
+    SINK_POS = params.SINK_POS
+
+    if router is not None and not vectorized:
+        raise ValueError("multi-hop routing requires vectorized=True")
+
+    routed = router.costs(CH_indices) if router is not None and len(CH_indices) else None
+    if stats is not None:
+        ch_d = routed[2] if routed is not None else None
+        stats.update(link_counts(positions, CH_indices, CM_indices, cluster_assignments, deployment, params, ch_d))
+
+    if vectorized:
+        ch_of = cluster_assignments[CM_indices]
+        orphan = ch_of == -1
+
+        # CM → CH, or direct to sink when no CH was found
+        if deployment is not None and deployment.etx_pair is not None:
+            cm_cost = deployment.etx_pair[CM_indices, np.maximum(ch_of, 0)]
+            cm_cost[orphan] = deployment.etx_sink[CM_indices[orphan]]
+        else:
+            # CM → CH distances in the positions' dtype, as in the nearest-CH search and Deployment.d_pair
+            diff = positions[np.maximum(ch_of, 0)] - positions[CM_indices]
+            cm_d = np.sqrt(np.add.reduce(diff * diff, axis=-1)).astype(float)
+            if deployment is not None:
+                cm_d[orphan] = deployment.d_sink[CM_indices[orphan]]
+            else:
+                cm_d[orphan] = np.linalg.norm(positions[CM_indices[orphan]] - np.array(SINK_POS), axis=1)
+            cm_cost = tx_energy(cm_d, params)
+        energies[CM_indices] -= cm_cost
+
+        # CH receives + aggregates data: scatter-add applied in CM order like the loop
+        np.subtract.at(energies, ch_of[~orphan], packet_size * Eelec + packet_size * EDA)
+
+        # CH to sink transmission, direct or relayed through other CHs
+        if routed is not None:
+            cost, relays, _ = routed
+            energies[CH_indices] -= cost
+            if stats is not None:
+                stats["relays"] = relays
+        elif deployment is not None:
+            energies[CH_indices] -= deployment.etx_sink[CH_indices]
+        else:
+            d = np.linalg.norm(positions[CH_indices] - np.array(SINK_POS), axis=1)
+            energies[CH_indices] -= tx_energy(d, params)
+
+        return energies, len(CM_indices) + len(CH_indices)
+
     packets = 0
     do = np.sqrt(Efs / Emp)  # Threshold distance (crossover for model selection)
 
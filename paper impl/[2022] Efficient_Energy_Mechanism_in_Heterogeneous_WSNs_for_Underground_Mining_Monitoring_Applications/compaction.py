@@ -0,0 +1,76 @@
+import numpy as np
+
+REPACK_DEAD_FRACTION = 0.25  # Share of dead slots in the view above which it is repacked
+
+
+class AliveView:
+    """
+    Compacted structure-of-arrays view of the live nodes for index.simulate.
+
+    Per-round kernels (election, clustering, communication, Q-update) run on
+    the view's arrays instead of the full NUM_NODES ones, so their cost follows
+    the surviving population. View slots keep ascending node order, so batched
+    random draws, nearest-CH tie-breaking and scatter-add order are the same as
+    on the full arrays and results are identical.
+
+    Nodes that die stay in the view (masked as dead) until more than
+    repack_fraction of it is dead; repack() then writes the view state back to
+    the full arrays and rebuilds it from the survivors, so the total repack
+    cost is a geometric series.
+
+    Attributes:
+    - ids: (n,) original node ID of every view slot (ascending)
+    - positions, energies: (n, 2) / (n,) view arrays
+    - deployment: Deployment restricted to ids (sink distances, ETx, pairwise tables)
+    - population: QLearningPopulation restricted to ids, or None
+    - full_energies, full_population: the full-size state, current after sync()
+    """
+    def __init__(self, deployment, energies, population=None, repack_fraction=REPACK_DEAD_FRACTION):
+        self.full_deployment = deployment
+        self.full_energies = energies
+        self.full_population = population
+        self.repack_fraction = repack_fraction
+        self.repacks = 0
+        self._pack(np.flatnonzero(energies > 0))
+
+    def _pack(self, ids):
+        self.ids = ids
+        self.deployment = self.full_deployment.subset(ids)
+        self.positions = self.deployment.positions
+        self.energies = self.full_energies[ids]
+        self.population = self.full_population.subset(ids) if self.full_population is not None else None
+        self.repacked = True  # Read by the caller to rebind its view-sized helpers
+
+    def sync(self, energies=None):
+        """
+        Writes the view's energies (or the given current view energies) and
+        Q-state back to the full arrays.
+
+        Returns:
+        - full_energies, full_population
+        """
+        if energies is not None:
+            self.energies = energies
+        self.full_energies[self.ids] = self.energies
+        if self.population is not None:
+            self.full_population.assign(self.ids, self.population)
+        return self.full_energies, self.full_population
+
+    def maybe_repack(self, energies, num_alive):
+        """
+        Repacks once the dead share of the view exceeds repack_fraction.
+
+        Parameters:
+        - energies: the view energies after the round (the caller's current array)
+        - num_alive: alive nodes in the view
+
+        Returns:
+        - True when the view was rebuilt
+        """
+        if len(self.ids) - num_alive <= self.repack_fraction * len(self.ids):
+            self.energies = energies
+            return False
+        self.sync(energies)
+        self.repacks += 1
+        self._pack(self.ids[energies > 0])
+        return True
@@ -0,0 +1,121 @@
+import numpy as np
+
+RNG_MODES = ("global", "philox")
+METHODS = ("baseline", "proposed", "q_learning")
+STREAMS = ("election", "explore", "action")  # Independent draws a node makes in one round
+WORDS_PER_BLOCK = 4                          # 64-bit outputs per Philox4x64 counter value
+SPARSE_SPAN = 12                             # Spanned / requested blocks above which only requested blocks are evaluated
+
+# Philox4x64-10 constants (Random123, as in np.random.Philox)
+PHILOX_ROUNDS = 10
+PHILOX_M = (0xD2E7470EE14C6C93, 0xCA5A826395121157)
+PHILOX_W = (0x9E3779B97F4A7C15, 0xBB67AE8584CAA73B)
+MASK64 = (1 << 64) - 1
+LO32, SHIFT32 = np.uint64(0xFFFFFFFF), np.uint64(32)
+
+
+def _mulhilo(a, b):
+    """
+    High and low 64-bit words of the 128-bit product a * b (a: int constant, b: uint64 array).
+    """
+    a_lo, a_hi = np.uint64(a & 0xFFFFFFFF), np.uint64(a >> 32)
+    b_lo, b_hi = b & LO32, b >> SHIFT32
+    p0, p1, p2, p3 = a_lo * b_lo, a_lo * b_hi, a_hi * b_lo, a_hi * b_hi
+    carry = ((p0 >> SHIFT32) + (p1 & LO32) + (p2 & LO32)) >> SHIFT32
+    return p3 + (p1 >> SHIFT32) + (p2 >> SHIFT32) + carry, b * np.uint64(a)
+
+
+def philox4x64(counter, key):
+    """
+    Philox4x64-10 block function on arrays of counters.
+
+    Parameters:
+    - counter: four uint64 arrays (counter words, lowest first)
+    - key: two 64-bit key words
+
+    Returns:
+    - four uint64 arrays, the output words of each counter (np.random.Philox order)
+    """
+    c0, c1, c2, c3 = counter
+    k0, k1 = int(key[0]), int(key[1])
+    for _ in range(PHILOX_ROUNDS):
+        hi0, lo0 = _mulhilo(PHILOX_M[0], c0)
+        hi1, lo1 = _mulhilo(PHILOX_M[1], c2)
+        c0, c1, c2, c3 = hi1 ^ c1 ^ np.uint64(k0), lo1, hi0 ^ c3 ^ np.uint64(k1), lo0
+        k0, k1 = (k0 + PHILOX_W[0]) & MASK64, (k1 + PHILOX_W[1]) & MASK64
+    return c0, c1, c2, c3
+
+
+class CounterRNG:
+    """
+    Order-independent random numbers keyed by (seed, method, round, node).
+
+    Every draw is a pure function of its key: the Philox key is derived from
+    (seed, method) and the 256-bit counter is (node // 4 + 1, round, stream, 0)
+    (np.random.Philox(counter=(node // 4, ...)) advances before its first
+    block), node taking word node % 4 of that block. A node's uniform
+    therefore does not depend on which other nodes draw, in what order or in
+    which process, so serial loops, vectorized kernels, compacted views and
+    sharded runs all see the same numbers.
+
+    Draws for a set of nodes come from one np.random.Generator(Philox) pass
+    over the blocks spanning them (C speed) while those are at most
+    SPARSE_SPAN times the blocks holding the nodes. Sparser sets (a few live
+    nodes of a large compacted run) evaluate philox4x64 on their own blocks
+    only, so the cost follows the number of nodes, not their ID range.
+    """
+    def __init__(self, seed=48, method="baseline"):
+        self.seed = seed
+        self.method = method
+        self.key = np.random.SeedSequence([seed, METHODS.index(method)]).generate_state(2, np.uint64)
+
+    def uniforms(self, round_num, ids, stream="election"):
+        """
+        One uniform in [0, 1) per node of ids (any order), for this round and stream.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if ids.size == 0:
+            return np.empty(0)
+        first = int(ids.min()) // WORDS_PER_BLOCK
+        span = int(ids.max()) // WORDS_PER_BLOCK + 1 - first
+        if span <= SPARSE_SPAN * -(-ids.size // WORDS_PER_BLOCK):
+            bitgen = np.random.Philox(key=self.key, counter=[first, round_num, STREAMS.index(stream), 0])
+            return np.random.Generator(bitgen).random(span * WORDS_PER_BLOCK)[ids - first * WORDS_PER_BLOCK]
+
+        blocks, inverse = np.unique(ids // WORDS_PER_BLOCK, return_inverse=True)
+        counter = (blocks.astype(np.uint64) + np.uint64(1), np.full(blocks.size, round_num, dtype=np.uint64),
+                   np.full(blocks.size, STREAMS.index(stream), dtype=np.uint64), np.zeros(blocks.size, dtype=np.uint64))
+        words = np.stack(philox4x64(counter, self.key), axis=1)[inverse, ids % WORDS_PER_BLOCK]
+        return (words >> np.uint64(11)) * (1.0 / 2**53)  # Generator.random's 53-bit double
+
+    def round(self, round_num, ids=None):
+        return RoundRNG(self, round_num, ids)
+
+
+class RoundRNG:
+    """
+    One round of a CounterRNG, passed as rng to the election and Q-learning kernels.
+
+    ids maps the kernel's node indices to node IDs (e.g. AliveView.ids) so
+    compacted or sharded arrays draw the numbers of the original nodes.
+    """
+    def __init__(self, source, round_num, ids=None):
+        self.source = source
+        self.round_num = round_num
+        self.ids = ids
+
+    def uniforms(self, nodes, stream="election"):
+        nodes = np.asarray(nodes, dtype=np.int64)
+        return self.source.uniforms(self.round_num, nodes if self.ids is None else self.ids[nodes], stream)
+
+    def uniform(self, node, stream="election"):
+        """
+        Scalar draw of one node (per-node loops).
+        """
+        return float(self.uniforms(np.array([node]), stream)[0])
+
+    def integers(self, nodes, high, stream="action"):
+        """
+        One integer in [0, high) per node.
+        """
+        return (self.uniforms(nodes, stream) * high).astype(np.int64)
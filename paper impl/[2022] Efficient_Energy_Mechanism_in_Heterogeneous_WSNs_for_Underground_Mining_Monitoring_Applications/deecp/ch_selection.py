@@ -1,7 +1,9 @@
 import numpy as np
-from config import *
+from election import epoch_thresholds, draw_CHs, node_draw
+from params import resolve
 
-def select_CHs(positions, energies, alive, E_total, round_num):
+def select_CHs(positions, energies, alive, E_total, round_num, vectorized=True, deployment=None, params=None,
+               rng=None):
     """
     Selects Cluster Heads based on DEECP logic.
     
@@ -15,11 +17,25 @@ def select_CHs(positions, energies, alive, E_total, round_num):
     - alive: boolean array for alive status
     - E_total: initial total energy of network
     - round_num: current round number
+    - vectorized: use the mask-based NumPy path (False runs the per-node loop)
+    - deployment: cached Deployment geometry (unused by baseline DEECP)
+    - params: SimParams (defaults to a config.py snapshot)
+    - rng: generator(s) for the batched draw, see election.rng_blocks (a counter_rng.RoundRNG
+      also drives the per-node loop)
 
     Returns:
     - is_CH: boolean array (True if selected as CH)
     """
-    E_avg = E_total * (1 - round_num / ROUNDS) / NUM_NODES  # Eq. (7)
+    params = resolve(params)
+    NUM_NODES, p_opt = params.NUM_NODES, params.p_opt
+
+    E_avg = E_total * (1 - round_num / params.ROUNDS) / NUM_NODES  # Eq. (7)
+
+    if vectorized:
+        # Eq. (6) thresholds + one batched draw (same RNG order as the loop)
+        threshold = ch_thresholds(positions, energies, alive, E_total, round_num, deployment, params)
+        return draw_CHs(alive, threshold, rng)
+
     is_CH = np.zeros(NUM_NODES, dtype=bool)
 
     for i in range(NUM_NODES):
@@ -37,7 +53,24 @@ def select_CHs(positions, energies, alive, E_total, round_num):
             threshold = 0
 
         # Node becomes CH if random number < threshold
-        if np.random.rand() < threshold:
+        if node_draw(rng, i) < threshold:
             is_CH[i] = True
 
     return is_CH
+
+
+def ch_thresholds(positions, energies, alive, E_total, round_num, deployment=None, params=None):
+    """
+    Eq. (5) - (7) candidacy thresholds of all nodes (0 for dead nodes), the
+    part of select_CHs that precedes the random draw.
+    """
+    params = resolve(params)
+    E_avg = E_total * (1 - round_num / params.ROUNDS) / params.NUM_NODES  # Eq. (7)
+
+    # Eq. (5) for all alive nodes at once
+    Pi = np.zeros(len(energies))
+    if E_avg > 0:
+        Pi[alive] = params.p_opt * (energies[alive] / E_avg)
+
+    # Eq. (6)
+    return epoch_thresholds(Pi, round_num)
@@ -1,23 +1,35 @@
 import numpy as np
-from config import *
+from network_state import NetworkState
+from params import resolve
 
-def initialize_nodes():
+def initialize_nodes(params=None, rng=None, as_state=False, dtype=np.float64, positions=None):
     """
     Initializes nodes with energy and type:
     - Normal nodes have energy = Eo
     - High-energy nodes have energy = Eo * (1 + alpha)
     
     Based on two-level heterogeneity model (Equation 1).
+
+    Parameters:
+    - params: SimParams (defaults to a config.py snapshot)
+    - rng: RandomState-like generator for the type permutation (default: global np.random)
+    - as_state: return a NetworkState (int8 types) instead of the two float64 arrays
+    - dtype: energy / position dtype of the state (float64 or float32)
+    - positions: node coordinates stored in the state (as_state only)
     
     Returns:
     - energies: array of node initial energies
     - types: 0 for normal, 1 for high-energy nodes
+    - or, with as_state=True, a NetworkState holding both
     """
-    energies = np.zeros(NUM_NODES)
-    types = np.zeros(NUM_NODES)  # 0 = normal, 1 = high-energy
+    params = resolve(params)
+    NUM_NODES, Eo, alpha, h = params.NUM_NODES, params.Eo, params.alpha, params.h
+
+    state = NetworkState.allocate(NUM_NODES, dtype, positions)
+    energies, types = state.energies, state.types  # types: 0 = normal, 1 = high-energy
 
     Nh = int(h * NUM_NODES)  # Number of high-energy nodes
-    node_indices = np.random.permutation(NUM_NODES)
+    node_indices = (np.random if rng is None else rng).permutation(NUM_NODES)
 
     high_energy_nodes = node_indices[:Nh]
     normal_energy_nodes = node_indices[Nh:]
@@ -28,4 +40,13 @@ def initialize_nodes():
     energies[normal_energy_nodes] = Eo
     types[normal_energy_nodes] = 0  # Normal-energy
 
-    return energies, types
+    if as_state:
+        return state
+    return energies, types.astype(float)
+
+def total_energy(params=None):
+    """
+    Eq. (2): initial total energy of the two-level heterogeneous network
+    """
+    params = resolve(params)
+    return params.NUM_NODES * params.Eo * (1 + params.alpha * params.h)
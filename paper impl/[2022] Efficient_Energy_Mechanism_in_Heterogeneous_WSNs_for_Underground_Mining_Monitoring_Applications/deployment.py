@@ -0,0 +1,72 @@
+import numpy as np
+from communication import tx_energy
+from params import resolve
+
+PAIRWISE_MAX_NODES = 1000  # N above which the (N, N) distance/ETx matrices are skipped
+
+class Deployment:
+    """
+    Geometry and radio costs of one node layout, computed once per deployment.
+
+    Node positions never move during a simulation, so distances to the sink,
+    their normalized form (Q-learning state / reward) and the Eq. (8) transmit
+    energy to the sink are cached here and read by all protocols and phases.
+    One Deployment can be shared by the baseline, proposed and q_learning runs
+    of the same seed.
+
+    Attributes:
+    - positions: (N, 2) node coordinates (float32 input stays float32, anything else is float64)
+    - sink_pos: (2,) sink coordinates
+    - d_sink: (N,) node → sink distances
+    - d_sink_norm: (N,) distances normalized by the field diagonal
+    - etx_sink: (N,) Eq. (8) energy to send one packet to the sink
+    - d_pair, etx_pair: (N, N) node → node distances / ETx, or None for large N
+    """
+    def __init__(self, positions, params=None, pairwise=None):
+        params = resolve(params)
+        positions = np.asarray(positions)
+        self.positions = positions.astype(np.result_type(positions.dtype, np.float32), copy=False)  # float32 kept
+        self.sink_pos = np.array(params.SINK_POS, dtype=float)
+        self.num_nodes = len(self.positions)
+
+        self.d_sink = np.linalg.norm(self.positions - self.sink_pos, axis=1)
+        self.d_sink_norm = self.d_sink / (np.sqrt(params.AREA**2 + params.AREA**2) + 1e-9)
+        self.etx_sink = tx_energy(self.d_sink, params)
+
+        if pairwise is None:
+            pairwise = self.num_nodes <= PAIRWISE_MAX_NODES
+
+        self.d_pair = None
+        self.etx_pair = None
+        if pairwise:
+            # d_pair[i, j] = |p_j - p_i|, evaluated like the per-CM norm in clustering
+            diff = self.positions[None, :, :] - self.positions[:, None, :]
+            self.d_pair = np.sqrt(np.add.reduce(diff * diff, axis=-1))
+            self.etx_pair = tx_energy(self.d_pair, params)
+
+    @classmethod
+    def random(cls, seed=48, params=None, **kwargs):
+        """
+        Uniform random layout drawn exactly like index.simulate does after seeding.
+        """
+        params = resolve(params)
+        positions = np.random.RandomState(seed).rand(params.NUM_NODES, 2) * params.AREA
+        return cls(positions, params, **kwargs)
+
+    def subset(self, ids):
+        """
+        Deployment of the nodes ids (ascending, or a slice for zero-copy views)
+        only, sliced from this one's cached arrays so every cost is
+        bit-identical to the full layout.
+        """
+        sub = object.__new__(type(self))
+        sub.positions = self.positions[ids]
+        sub.sink_pos = self.sink_pos
+        sub.num_nodes = len(sub.positions)
+        sub.d_sink = self.d_sink[ids]
+        sub.d_sink_norm = self.d_sink_norm[ids]
+        sub.etx_sink = self.etx_sink[ids]
+        pair = (ids, ids) if isinstance(ids, slice) else np.ix_(ids, ids)
+        sub.d_pair = None if self.d_pair is None else self.d_pair[pair]
+        sub.etx_pair = None if self.etx_pair is None else self.etx_pair[pair]
+        return sub
@@ -1,7 +1,9 @@
 import numpy as np
-from config import *
+from election import epoch_thresholds, draw_CHs, node_draw
+from params import resolve
 
-def select_CHs(positions, energies, alive, E_total, round_num):
+def select_CHs(positions, energies, alive, E_total, round_num, vectorized=True, deployment=None, params=None,
+               rng=None):
     """
     Selects Cluster Heads (CHs) using energy and distance-aware probabilistic thresholds.
 
@@ -16,11 +18,26 @@ def select_CHs(positions, energies, alive, E_total, round_num):
     - alive: boolean array indicating alive status
     - E_total: total initial energy of network
     - round_num: current round number
+    - vectorized: use the mask-based NumPy path (False runs the per-node loop)
+    - deployment: cached Deployment geometry (distance to sink)
+    - params: SimParams (defaults to a config.py snapshot)
+    - rng: generator(s) for the batched draw, see election.rng_blocks (a counter_rng.RoundRNG
+      also drives the per-node loop)
 
     Returns:
     - is_CH: boolean array indicating CH selection
     """
-    E_avg = E_total * (1 - round_num / ROUNDS) / NUM_NODES  # Eq. (7)
+    params = resolve(params)
+    NUM_NODES, p_opt, SINK_POS = params.NUM_NODES, params.p_opt, params.SINK_POS
+    h, alpha, S, beta = params.h, params.alpha, params.S, params.beta
+
+    E_avg = E_total * (1 - round_num / params.ROUNDS) / NUM_NODES  # Eq. (7)
+
+    if vectorized:
+        # One batched draw (same RNG order as the loop)
+        threshold = ch_thresholds(positions, energies, alive, E_total, round_num, deployment, params)
+        return draw_CHs(alive, threshold, rng)
+
     is_CH = np.zeros(NUM_NODES, dtype=bool)
 
     for i in range(NUM_NODES):
@@ -45,7 +62,33 @@ def select_CHs(positions, energies, alive, E_total, round_num):
         threshold /= d_to_sink if d_to_sink > 0 else 1  # Avoid div by 0
 
         # Node becomes CH if random number falls below threshold
-        if np.random.rand() < threshold:
+        if node_draw(rng, i) < threshold:
             is_CH[i] = True
 
     return is_CH
+
+
+def ch_thresholds(positions, energies, alive, E_total, round_num, deployment=None, params=None):
+    """
+    Eq. (7), (11), (12) candidacy thresholds of all nodes (0 for dead nodes),
+    the part of select_CHs that precedes the random draw.
+    """
+    params = resolve(params)
+    h, alpha, S, beta = params.h, params.alpha, params.S, params.beta
+    E_avg = E_total * (1 - round_num / params.ROUNDS) / params.NUM_NODES  # Eq. (7)
+
+    # Eq. (11) for all alive nodes at once
+    scaling = (1 + h * (alpha + S * beta)) * E_avg
+    Pi = np.zeros(len(energies))
+    if scaling > 0:
+        Pi[alive] = params.p_opt * energies[alive] / scaling
+
+    # Eq. (12) thresholds with the inverse distance penalty
+    threshold = epoch_thresholds(Pi, round_num)
+    if deployment is not None:
+        d_to_sink = deployment.d_sink
+    else:
+        d_to_sink = np.linalg.norm(positions - np.array(params.SINK_POS), axis=1)
+    threshold /= np.where(d_to_sink > 0, d_to_sink, 1)  # Avoid div by 0
+
+    return threshold
@@ -1,7 +1,8 @@
 import numpy as np
-from config import *
+from network_state import NetworkState
+from params import resolve
 
-def initialize_nodes():
+def initialize_nodes(params=None, rng=None, as_state=False, dtype=np.float64, positions=None):
     """
     Initializes sensor nodes with heterogeneous energy levels:
     - Normal nodes: energy = Eo
@@ -12,17 +13,29 @@ def initialize_nodes():
     - Eq. (3): total energy calculation with 3 node types
     - Eq. (4): simplified total energy expression
 
+    Parameters:
+    - params: SimParams (defaults to a config.py snapshot)
+    - rng: RandomState-like generator for the type permutation (default: global np.random)
+    - as_state: return a NetworkState (int8 types) instead of the two float64 arrays
+    - dtype: energy / position dtype of the state (float64 or float32)
+    - positions: node coordinates stored in the state (as_state only)
+
     Returns:
     - energies: array of initial energies
     - types: array of node types (0 = normal, 1 = high, 2 = super)
+    - or, with as_state=True, a NetworkState holding both
     """
-    energies = np.zeros(NUM_NODES)
-    types = np.zeros(NUM_NODES)  # 0 = normal, 1 = high, 2 = super
+    params = resolve(params)
+    NUM_NODES, Eo, alpha, beta = params.NUM_NODES, params.Eo, params.alpha, params.beta
+    h, S = params.h, params.S
+
+    state = NetworkState.allocate(NUM_NODES, dtype, positions)
+    energies, types = state.energies, state.types  # types: 0 = normal, 1 = high, 2 = super
 
     Nh = int(h * NUM_NODES)        # High + super nodes (h fraction)
     Ns = int(S * Nh)               # Super nodes (S fraction of Nh)
 
-    node_indices = np.random.permutation(NUM_NODES)  # Random assignment
+    node_indices = (np.random if rng is None else rng).permutation(NUM_NODES)  # Random assignment
 
     super_ids = node_indices[:Ns]              # First S*Nh nodes → super
     high_ids = node_indices[Ns:Nh]             # Next (h - S)*N nodes → high
@@ -38,4 +51,16 @@ def initialize_nodes():
     energies[normal_ids] = Eo
     types[normal_ids] = 0
 
-    return energies, types
+    if as_state:
+        return state
+    return energies, types.astype(float)
+
+def total_energy(params=None):
+    """
+    Eq. (4): initial total energy of the three-level heterogeneous network
+    """
+    params = resolve(params)
+    NUM_NODES, Eo, alpha, beta = params.NUM_NODES, params.Eo, params.alpha, params.beta
+    Nh = int(params.h * NUM_NODES)
+    Ns = int(params.S * Nh)
+    return Eo * ((NUM_NODES - Nh) + Nh * (1 + alpha) + Ns * (beta - alpha))
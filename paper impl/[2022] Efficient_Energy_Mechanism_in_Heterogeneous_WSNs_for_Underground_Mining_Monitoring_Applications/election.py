@@ -0,0 +1,99 @@
+import numpy as np
+from counter_rng import RoundRNG
+
+def epoch_thresholds(Pi, round_num):
+    """
+    Vectorized DEECP candidacy threshold for all nodes at once.
+
+    Based on:
+        Eq. (6) / Eq. (12) T = Pi / (1 - Pi * (r mod round(1 / Pi)))
+
+    Mirrors the scalar per-node code:
+    - Pi == 0 → threshold 0
+    - round(1 / Pi) == 0 (ZeroDivisionError in the scalar code) → threshold 0
+    - zero denominator → threshold 0
+
+    Parameters:
+    - Pi: array of per-node CH probabilities (0 for dead nodes)
+    - round_num: current round number
+
+    Returns:
+    - threshold: array of per-node thresholds
+    """
+    threshold = np.zeros(len(Pi))
+    active = Pi > 0
+    if not np.any(active):
+        return threshold
+
+    P = Pi[active]
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        period = np.rint(1 / P)  # round(1 / Pi), half to even like Python's round
+        valid = period != 0
+        denominator = 1 - P * np.mod(round_num, np.where(valid, period, 1))
+        valid &= denominator != 0
+        threshold[active] = np.where(valid, P / np.where(valid, denominator, 1), 0)
+
+    return threshold
+
+
+def rng_blocks(rng, num_nodes):
+    """
+    Normalizes an rng argument to (generators, block size).
+
+    rng is None (global np.random), one RandomState-like generator, or a list of
+    generators, one per contiguous block of num_nodes / len(rng) node slots
+    (the replicas of a lockstep ensemble). Node i draws from generators[i // block].
+    A counter_rng.RoundRNG is handled by the callers (draws keyed by node ID).
+    """
+    if rng is None:
+        rng = np.random
+    if isinstance(rng, (list, tuple)):
+        return list(rng), num_nodes // len(rng)
+    return [rng], max(num_nodes, 1)
+
+
+def uniform_draws(ids, num_nodes, rng=None):
+    """
+    One uniform per node in ids (ascending), drawn from each node's generator
+    in node order, i.e. exactly the draws a per-node rand() loop would make.
+    With a counter_rng.RoundRNG each node gets its own keyed draw instead.
+    """
+    if isinstance(rng, RoundRNG):
+        return rng.uniforms(ids)
+    generators, block = rng_blocks(rng, num_nodes)
+    if len(generators) == 1:
+        return generators[0].rand(len(ids))
+    counts = np.bincount(ids // block, minlength=len(generators))
+    return np.concatenate([g.rand(c) for g, c in zip(generators, counts)])
+
+
+def draw_CHs(alive, threshold, rng=None):
+    """
+    Elects CHs with one batched random draw over the alive nodes.
+
+    One uniform is drawn per alive node in ascending node order, which consumes
+    the global np.random stream exactly like the per-node np.random.rand() loop,
+    so seeded runs reproduce the published lifetimes.
+
+    Parameters:
+    - alive: boolean array for alive status
+    - threshold: array of per-node thresholds
+    - rng: generator(s) to draw from, see rng_blocks (default: global np.random)
+
+    Returns:
+    - is_CH: boolean array (True if selected as CH)
+    """
+    is_CH = np.zeros(len(alive), dtype=bool)
+    alive_ids = np.flatnonzero(alive)
+    is_CH[alive_ids] = uniform_draws(alive_ids, len(alive), rng) < threshold[alive_ids]
+    return is_CH
+
+
+def node_draw(rng, node):
+    """
+    Uniform of one node in a per-node loop: its keyed draw with a
+    counter_rng.RoundRNG, else the next global np.random.rand().
+    """
+    if isinstance(rng, RoundRNG):
+        return rng.uniform(node)
+    return np.random.rand()
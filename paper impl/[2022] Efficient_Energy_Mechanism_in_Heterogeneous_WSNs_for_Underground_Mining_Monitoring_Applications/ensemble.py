@@ -0,0 +1,166 @@
+import numpy as np
+
+from analytics import milestone_rounds
+from clustering import form_clusters_replicas
+from communication import transmit
+from deployment import PAIRWISE_MAX_NODES, Deployment
+from params import resolve
+from utils import stop_dead_count
+
+from e_deecp.init_nodes import initialize_nodes as init_proposed_nodes, total_energy as total_energy_proposed
+from deecp.init_nodes import initialize_nodes as init_baseline_nodes, total_energy as total_energy_baseline
+from e_deecp.ch_selection import select_CHs as select_CHs_proposed
+from deecp.ch_selection import select_CHs as select_CHs_baseline
+
+from q_learn_deecp.q_learning_agent import QLearningPopulation
+from q_learn_deecp.q_learning_ch_selection import select_CHs_population, update_population
+
+PERCENTILES = (5, 50, 95)
+
+def simulate_ensemble(method="baseline", seeds=range(100), params=None, rng_order="legacy", epsilon_decay=1.0,
+                      stop_when=None):
+    """
+    Monte Carlo ensemble of index.simulate: one replica per seed, advanced in lockstep.
+
+    The S replicas are laid out as one (S * N)-node network, so CH election,
+    transmit and the Q-learning update run once per round for all of them.
+    Each replica owns a RandomState(seed) over its block of nodes and draws in
+    the same order as simulate(seed=...), so replica s reproduces that run.
+    Cluster formation is batched too, with each CM searching its own replica's
+    CHs only (clustering.form_clusters_replicas).
+
+    The loop ends as soon as every replica is fully dead (remaining rounds are
+    filled analytically), or once every replica reached stop_when (series are
+    then truncated, as in index.simulate).
+
+    Parameters:
+    - method: "baseline", "proposed" or "q_learning"
+    - seeds: RNG seeds, one replica each
+    - params: SimParams (defaults to a config.py snapshot)
+    - rng_order, epsilon_decay, stop_when: as in index.simulate
+
+    Returns:
+    - runs: dict with "seeds", (S, ROUNDS) arrays "dead", "alive", "throughput"
+      and (S, N) int32 per-node "death_round" (-1 = never died)
+    """
+    params = resolve(params)
+    seeds = list(seeds)
+    S, N, ROUNDS = len(seeds), params.NUM_NODES, params.ROUNDS
+    rngs = [np.random.RandomState(seed) for seed in seeds]
+
+    # Per-replica layout and initial energies, drawn exactly like simulate(seed=...)
+    init_nodes = init_baseline_nodes if method == "baseline" else init_proposed_nodes
+    positions = np.empty((S, N, 2))
+    energies = np.empty((S, N))
+    for s, g in enumerate(rngs):
+        positions[s] = g.rand(N, 2) * params.AREA
+        energies[s], _ = init_nodes(params, rng=g)
+
+    # Per-replica pairwise distances for clustering, while they fit the single-run budget
+    d_pair = None
+    if S * N * N <= PAIRWISE_MAX_NODES ** 2:
+        d_pair = np.stack([Deployment(p, params).d_pair for p in positions])
+    flat_positions = positions.reshape(S * N, 2)
+    flat = Deployment(flat_positions, params, pairwise=False)
+    energies = energies.reshape(S * N)
+
+    if method == "baseline":
+        E_total = total_energy_baseline(params)
+        select_CHs_func = select_CHs_baseline
+    elif method == "q_learning":
+        E_total = total_energy_proposed(params)
+        population = QLearningPopulation(S * N, epsilon_decay=epsilon_decay)
+    else:  # proposed
+        E_total = total_energy_proposed(params)
+        select_CHs_func = select_CHs_proposed
+
+    # Tracking
+    dead_nodes = np.zeros((S, ROUNDS), dtype=np.int32)
+    throughput_packets = np.zeros((S, ROUNDS), dtype=np.int64)
+    death_round = np.full(S * N, -1, dtype=np.int32)
+    stop_dead = stop_dead_count(stop_when, N)
+
+    for r in range(ROUNDS):
+        alive = energies > 0
+
+        # CH Selection (all replicas, one generator per replica block)
+        if method == "q_learning":
+            is_CH = select_CHs_population(
+                flat_positions, energies, alive, E_total, r, population,
+                deployment=flat, rng_order=rng_order, params=params, rng=rngs
+            )
+        else:
+            is_CH = select_CHs_func(
+                flat_positions, energies, alive, E_total, r, deployment=flat, params=params, rng=rngs
+            )
+
+        # Clustering (all replicas, CMs stay within their own replica)
+        CH_indices, CM_indices, cluster_assignments = form_clusters_replicas(flat_positions, is_CH, alive, S, d_pair)
+
+        # Communication (all replicas)
+        energies, _ = transmit(
+            flat_positions, energies, CH_indices, CM_indices, cluster_assignments,
+            deployment=flat, params=params
+        )
+
+        death_round[alive & (energies <= 0)] = r
+        alive_after = np.sum((energies > 0).reshape(S, N), axis=1)
+
+        # Q-Learning reward and update, alive ratio taken per replica
+        if method == "q_learning":
+            alive_ratio = np.repeat(alive_after / N, N)
+            update_population(population, alive, energies, flat.d_sink_norm, alive_ratio, r, params)
+
+        # Tracking stats
+        dead_nodes[:, r] = N - alive_after
+        packets = np.bincount(CM_indices // N, minlength=S) + np.bincount(CH_indices // N, minlength=S)
+        if method in ["proposed", "q_learning"]:
+            packets *= 2
+        throughput_packets[:, r] = 2 * packets
+
+        if stop_dead is not None and np.all(dead_nodes[:, r] >= stop_dead):
+            dead_nodes = dead_nodes[:, :r + 1]
+            throughput_packets = throughput_packets[:, :r + 1]
+            break
+
+        if not np.any(alive_after):
+            # Terminal state: fast-forward, packets stay zero
+            dead_nodes[:, r + 1:] = N
+            break
+
+    return {
+        "seeds": np.array(seeds),
+        "dead": dead_nodes,
+        "alive": N - dead_nodes,
+        "throughput": np.cumsum(throughput_packets * params.packet_size, axis=1),
+        "death_round": death_round.reshape(S, N),
+    }
+
+
+def summarize_ensemble(runs, num_nodes, percentiles=PERCENTILES):
+    """
+    Mean and percentile bands across seeds.
+
+    Returns:
+    - summary: {"dead" / "alive" / "throughput": {"mean", "p5", ...} per-round curves,
+                "milestones": {name: {"mean", "p5", ..., "reached"}}} where
+      milestones follow utils.print_node_death_comparison (1st / 50% / 90% / Last);
+      runs that never reach a milestone are left out of its statistics.
+    """
+    summary = {}
+    for key in ("dead", "alive", "throughput"):
+        curves = np.asarray(runs[key], dtype=float)
+        summary[key] = {"mean": curves.mean(axis=0)}
+        for q, band in zip(percentiles, np.percentile(curves, percentiles, axis=0)):
+            summary[key][f"p{q}"] = band
+
+    summary["milestones"] = {}
+    for name, rounds in milestone_rounds(runs["dead"], num_nodes).items():
+        reached = rounds[rounds >= 0].astype(float)
+        stats = {"reached": reached.size / rounds.size}
+        stats["mean"] = reached.mean() if reached.size else np.nan
+        for q in percentiles:
+            stats[f"p{q}"] = np.percentile(reached, q) if reached.size else np.nan
+        summary["milestones"][name] = stats
+
+    return summary
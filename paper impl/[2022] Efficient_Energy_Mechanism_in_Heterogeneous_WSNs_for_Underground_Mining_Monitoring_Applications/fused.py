@@ -0,0 +1,231 @@
+import numpy as np
+
+from params import resolve
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, simulate falls back to the NumPy kernels
+    njit = None
+
+BACKENDS = ("numpy", "numba", "python", "auto")
+GRID_MIN_CHS = 32  # CH count from which nearest-CH search uses a uniform grid instead of a scan
+
+
+def _fused_round(positions, energies, alive, threshold, draws, d_sink, radio, rx_cost, bounds, is_CH, assignments):
+    """
+    One round of election, nearest-CH assignment and energy deduction over the node arrays.
+
+    Same arithmetic as draw_CHs → form_clusters → transmit:
+    - alive node i (k-th alive) becomes CH when draws[k] < threshold[i]
+    - every alive CM joins its nearest CH (ties → lowest index) or sends to the sink
+    - Eq. (8)-(10) costs, CH receive costs applied in ascending CM order
+
+    CM → CH distances are evaluated and compared in the positions' dtype
+    (float32 layouts as in form_clusters), then widened to float64 for Eq. (8)
+    like tx_energy; rx_cost is the receive + aggregation cost in the
+    energies' dtype, as NumPy subtracts a Python float scalar.
+
+    radio = (do, packet_size, Eelec, EDA, Efs, Emp, sink_x, sink_y) and bounds =
+    (x_min, y_min, extent, slack) of the layout, slack < 1 keeping the grid
+    stop rule safe from rounding of the distances. With GRID_MIN_CHS or more
+    CHs the nearest CH is found by ring search over a uniform grid of ~1 CH
+    per cell (exact, same tie-breaking as the scan).
+    is_CH / assignments are filled in; energies are updated in place.
+
+    Returns:
+    - (number of CHs, number of CMs)
+    """
+    do, packet_size, Eelec, EDA, Efs, Emp, sink_x, sink_y = (
+        radio[0], radio[1], radio[2], radio[3], radio[4], radio[5], radio[6], radio[7]
+    )
+    n = energies.shape[0]
+    CHs = np.empty(n, dtype=np.int64)
+
+    # Election
+    num_CH = 0
+    k = 0
+    for i in range(n):
+        is_CH[i] = False
+        assignments[i] = -1
+        if alive[i]:
+            if draws[k] < threshold[i]:
+                is_CH[i] = True
+                CHs[num_CH] = i
+                num_CH += 1
+            k += 1
+
+    # Uniform grid of CHs (counting sort by cell)
+    use_grid = num_CH >= GRID_MIN_CHS
+    G = max(1, int(np.sqrt(num_CH)))
+    x_min, y_min = bounds[0], bounds[1]
+    cell = bounds[2] / G * (1 + 1e-12) + 1e-12
+    cell_start = np.zeros(G * G + 1, dtype=np.int64)
+    cell_items = np.empty(max(num_CH, 1), dtype=np.int64)
+    if use_grid:
+        for j in range(num_CH):
+            c = CHs[j]
+            gx = min(int((positions[c, 0] - x_min) / cell), G - 1)
+            gy = min(int((positions[c, 1] - y_min) / cell), G - 1)
+            cell_start[gy * G + gx + 1] += 1
+        for g in range(G * G):
+            cell_start[g + 1] += cell_start[g]
+        fill = cell_start[:G * G].copy()
+        for j in range(num_CH):  # ascending CH order within every cell
+            c = CHs[j]
+            gx = min(int((positions[c, 0] - x_min) / cell), G - 1)
+            gy = min(int((positions[c, 1] - y_min) / cell), G - 1)
+            cell_items[fill[gy * G + gx]] = c
+            fill[gy * G + gx] += 1
+
+    # Assignment + CM → CH / sink and CH receive costs
+    num_CM = 0
+    for i in range(n):
+        if not alive[i] or is_CH[i]:
+            continue
+        num_CM += 1
+        x, y = positions[i, 0], positions[i, 1]
+        if num_CH == 0:
+            dx, dy = sink_x - x, sink_y - y
+            d = np.sqrt(dx * dx + dy * dy)
+            best = -1
+        elif not use_grid:
+            best = CHs[0]
+            d_best = np.inf
+            for j in range(num_CH):
+                c = CHs[j]
+                dx, dy = positions[c, 0] - x, positions[c, 1] - y
+                d_c = np.sqrt(dx * dx + dy * dy)
+                if d_c < d_best:
+                    d_best = d_c
+                    best = c
+            d = float(d_best)
+        else:
+            best = -1
+            d_best = np.inf
+            gx0 = min(int((x - x_min) / cell), G - 1)
+            gy0 = min(int((y - y_min) / cell), G - 1)
+            ring = 0
+            while ring <= G:
+                for gy in range(max(gy0 - ring, 0), min(gy0 + ring, G - 1) + 1):
+                    for gx in range(max(gx0 - ring, 0), min(gx0 + ring, G - 1) + 1):
+                        if max(abs(gx - gx0), abs(gy - gy0)) != ring:
+                            continue
+                        for t in range(cell_start[gy * G + gx], cell_start[gy * G + gx + 1]):
+                            c = cell_items[t]
+                            dx, dy = positions[c, 0] - x, positions[c, 1] - y
+                            d_c = np.sqrt(dx * dx + dy * dy)
+                            if d_c < d_best or (d_c == d_best and c < best):
+                                d_best = d_c
+                                best = c
+                # CHs in farther rings are at least ring * cell away
+                if best >= 0 and d_best < ring * cell * bounds[3]:
+                    break
+                ring += 1
+            d = float(d_best)
+        energies[i] -= packet_size * (Eelec + (Efs * d**2 if d < do else Emp * d**4))
+        if best >= 0:
+            assignments[i] = best
+            energies[best] -= rx_cost[0]
+
+    # CH → sink
+    for j in range(num_CH):
+        c = CHs[j]
+        d = d_sink[c]
+        energies[c] -= packet_size * (Eelec + (Efs * d**2 if d < do else Emp * d**4))
+
+    return num_CH, num_CM
+
+
+_compiled = None
+
+
+def available():
+    return njit is not None
+
+
+def kernel(backend="auto"):
+    """
+    Resolves a backend name to a fused round kernel, or None for the NumPy path.
+
+    - "numpy": None (select_CHs / form_clusters / transmit)
+    - "numba": compiled kernel, ImportError when numba is missing
+    - "python": the same kernel interpreted (slow; for checking logic without numba)
+    - "auto": "numba" if installed, else "numpy"
+    """
+    global _compiled
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    if backend == "numpy" or (backend == "auto" and njit is None):
+        return None
+    if backend == "python":
+        return _fused_round
+    if njit is None:
+        raise ImportError("backend='numba' requires numba")
+    if _compiled is None:
+        _compiled = njit(cache=True, nogil=True)(_fused_round)
+    return _compiled
+
+
+class FusedRound:
+    """
+    Per-run wrapper holding the layout, radio constants and output buffers of a fused kernel.
+    """
+    def __init__(self, kernel_func, deployment, params=None):
+        params = resolve(params)
+        self.kernel = kernel_func
+        self.positions = np.ascontiguousarray(deployment.positions)  # float32 layouts stay float32
+        self.d_sink = deployment.d_sink
+        lo, hi = self.positions.min(axis=0), self.positions.max(axis=0)
+        slack = 1 - 4 * np.finfo(self.positions.dtype).eps
+        self.bounds = np.array([lo[0], lo[1], max(hi[0] - lo[0], hi[1] - lo[1]), slack], dtype=float)
+        self.radio = np.array([
+            np.sqrt(params.Efs / params.Emp), params.packet_size, params.Eelec, params.EDA,
+            params.Efs, params.Emp, params.SINK_POS[0], params.SINK_POS[1],
+        ], dtype=float)
+        self.rx = params.packet_size * params.Eelec + params.packet_size * params.EDA
+        self.rx_cost = None
+        self.is_CH = np.zeros(deployment.num_nodes, dtype=bool)
+        self.assignments = np.zeros(deployment.num_nodes, dtype=np.int64)
+
+    def __call__(self, energies, alive, threshold, draws):
+        """
+        Runs one round in place on energies.
+
+        Returns:
+        - is_CH, cluster_assignments (views of reused buffers), packet count
+        """
+        if self.rx_cost is None or self.rx_cost.dtype != energies.dtype:
+            self.rx_cost = np.array([self.rx], dtype=energies.dtype)
+        num_CH, num_CM = self.kernel(
+            self.positions, energies, alive, threshold, draws, self.d_sink, self.radio, self.rx_cost, self.bounds,
+            self.is_CH, self.assignments
+        )
+        return self.is_CH, self.assignments, int(num_CH + num_CM)
+
+
+def check_backend(method="baseline", params=None, seed=48, backend="auto", dtype=np.float64, **simulate_kwargs):
+    """
+    Runs simulate with a fused backend and with the NumPy reference and compares them.
+
+    Both runs use the same node-state dtype (dtype=np.float32 checks the
+    single-precision layout and energies end to end). Energies may differ in
+    the last bit (d**4 is evaluated by a different pow), so the check is on
+    what the simulator reports: dead/alive series, per-node death rounds and
+    throughput (to rtol 1e-12).
+
+    Returns:
+    - dict of mismatching outputs (empty when the backends agree)
+    """
+    from index import simulate
+
+    if backend == "auto":
+        backend = "numba" if available() else "python"
+    ref = simulate(method, params, seed, return_deaths=True, dtype=dtype, **simulate_kwargs)
+    out = simulate(method, params, seed, return_deaths=True, backend=backend, dtype=dtype, **simulate_kwargs)
+
+    mismatches = {}
+    for name, a, b in zip(("dead", "alive", "throughput", "death_round"), ref, out):
+        same = np.allclose(a, b, rtol=1e-12) if name == "throughput" else np.array_equal(a, b)
+        if not same:
+            mismatches[name] = (a, b)
+    return mismatches
@@ -1,111 +1,496 @@
+from dataclasses import dataclass
+
 import numpy as np
-import matplotlib.pyplot as plt
-from config import *
-from clustering import form_clusters
-from communication import transmit
+from clustering import CLUSTERING_MODES, IncrementalClusters, form_clusters
+from compaction import AliveView
+from counter_rng import RNG_MODES, CounterRNG
+from communication import link_counts, transmit
+from deployment import Deployment
+from election import uniform_draws
+from fused import FusedRound, kernel as fused_kernel
+from params import resolve
+from routing import ROUTING_MODES, MultiHopRouter
+from recorder import RoundRecorder, clear_checkpoint, load_checkpoint, run_identity, save_checkpoint
+from utils import stop_dead_count
 
-from e_deecp.init_nodes import initialize_nodes as init_proposed_nodes
-from deecp.init_nodes import initialize_nodes as init_baseline_nodes
-from e_deecp.ch_selection import select_CHs as select_CHs_proposed
-from deecp.ch_selection import select_CHs as select_CHs_baseline
+from e_deecp.init_nodes import initialize_nodes as init_proposed_nodes, total_energy as total_energy_proposed
+from deecp.init_nodes import initialize_nodes as init_baseline_nodes, total_energy as total_energy_baseline
+from e_deecp.ch_selection import select_CHs as select_CHs_proposed, ch_thresholds as ch_thresholds_proposed
+from deecp.ch_selection import select_CHs as select_CHs_baseline, ch_thresholds as ch_thresholds_baseline
 
-from q_learn_deecp.q_learning_agent import QLearningNodeAgent
-from q_learn_deecp.q_learning_ch_selection import normalize, select_CHs_q_learning
+from q_learn_deecp.q_learning_agent import (
+    QLearningNodeAgent, QLearningPopulation, load_q_tables, save_q_tables, warm_start
+)
+from q_learn_deecp.q_learning_ch_selection import (
+    normalize, select_CHs_population, select_CHs_q_learning, update_population
+)
 
 np.random.seed(48)  # Ensures reproducibility
 
-def simulate(method="baseline"):
-    np.random.seed(48)
+
+@dataclass
+class RoundSnapshot:
+    """
+    State after one round, yielded by iter_simulate.
+
+    Attributes:
+    - round: round index
+    - alive, dead: node counts
+    - packets: packets delivered this round
+    - death_round: (N,) int32 per-node death log (-1 = alive), shared and updated in place
+    - energies: read-only view of the residual energies (energy_view=True), else None;
+      valid until the run resumes
+    - ids: node ID of every energies slot when compact=True, else None
     """
-    Simulates the WSN clustering and communication process for baseline, proposed, or Q-learning methods.
+    round: int
+    alive: int
+    dead: int
+    packets: int
+    death_round: np.ndarray
+    energies: np.ndarray = None
+    ids: np.ndarray = None
+
+
+def iter_simulate(method="baseline", params=None, seed=48, deployment=None, vectorized=True, rng_order="legacy",
+                  epsilon_decay=1.0, record_dir=None, checkpoint_every=None, resume=False, probe=None,
+                  backend="numpy", routing="single_hop", clustering="full", compact=False, dtype=np.float64,
+                  q_dtype=np.float64, rng="global", max_rounds=None, energy_view=False, scenario=None,
+                  q_init=None, q_save=None, q_frozen=False):
+    np.random.seed(seed)
     """
-    positions = np.random.rand(NUM_NODES, 2) * AREA
+    Simulates the WSN clustering and communication process for baseline, proposed, or Q-learning methods,
+    yielding a RoundSnapshot after every round.
+
+    The consumer drives the run: breaking out of the loop (or close()) abandons
+    it after the current round, at constant memory. Once every node is dead
+    nothing can be elected or transmitted again, so the generator ends after
+    that round (simulate fills the remaining rounds analytically); its return
+    value (StopIteration.value) is the per-node death log. energy_view=True
+    adds a read-only view of the residual energies to every snapshot.
+
+    All parameters come from params (an immutable SimParams, defaulting to a
+    config.py snapshot), so runs never depend on module globals.
+
+    A Deployment built once (e.g. Deployment.random(48)) can be shared across methods;
+    positions are still drawn so the RNG stream matches an unshared run.
+
+    vectorized=False runs the original per-node loops (reference path). For
+    q_learning, rng_order="legacy" reproduces the per-agent draw order and
+    epsilon_decay < 1 decays exploration every round.
+
+    record_dir streams per-round dead/alive/packet counts to .npy files there
+    (see recorder.RoundRecorder). With checkpoint_every=k the full state
+    (energies, RNG state, Q-tables, ε, round) is also saved every k rounds, and
+    resume=True continues from the last checkpoint in record_dir: the recorded
+    rounds are replayed as snapshots (energies=None), then the run goes on
+    exactly as an uninterrupted one. Without a checkpoint it starts over from
+    round 0. Recordings and checkpoints carry the method, seed and a SimParams
+    hash; resuming one made for a different configuration raises ValueError.
+
+    Each node's death round is logged in an int32 array (-1 = still alive) the
+    round its energy crosses zero (see analytics.py for FND/HND/LND and
+    percentiles).
+
+    probe (an instrumentation.Probe) times election / clustering / transmit /
+    Q-update / tracking and counts CHs, orphaned CMs and multipath vs
+    free-space links on its sampled rounds; None (default) adds no work.
+
+    backend="numba" (or "auto" when numba is installed) runs election,
+    nearest-CH assignment and energy deduction as one compiled pass per round
+    (fused.py), with the same random draws; "numpy" (default) keeps the
+    separate kernels. fused.check_backend compares the two.
+
+    routing="multi_hop" lets CHs relay to the sink through other CHs along
+    minimum-energy paths (routing.MultiHopRouter, solved per round) instead
+    of the single-hop CH → sink link of the paper.
+
+    clustering="incremental" keeps the CM → CH assignment across rounds and
+    only re-searches the members affected by CH changes and deaths
+    (clustering.IncrementalClusters); the assignment is identical to "full".
+
+    compact=True runs every round on a compacted view of the live nodes
+    (compaction.AliveView: positions, energies, sink distances, Q-state),
+    repacked as nodes die, so per-round cost follows the surviving
+    population; results are identical.
+
+    Node state lives in a network_state.NetworkState built by initialize_nodes:
+    dtype=np.float32 stores energies and positions in single precision and
+    q_dtype=np.float16 / np.float32 shrinks the Q-tables (node types are int8,
+    Q-states and actions uint8), for million-node runs. Results then differ
+    from the float64 defaults by rounding.
+
+    rng="philox" draws every per-round random number (CH election, Q-learning
+    exploration and exploratory action) from counter_rng.CounterRNG, keyed by
+    (seed, method, round, node): results no longer depend on draw order and
+    are identical across vectorized=True/False, compact and fused runs. The
+    layout and node types still come from the seeded global stream.
+
+    max_rounds runs only the first max_rounds rounds of a ROUNDS-round
+    experiment: Eq. (7)'s E_avg still decays over params.ROUNDS, so they equal
+    the prefix of the full run (tuner.py uses this for cheap early evaluations).
+
+    scenario (a scenario.Scenario, e.g. memory-mapped by load_scenario) supplies
+    the node positions and, when stored, types and initial energies in place
+    of the random layout and permutation (which are still drawn, keeping the
+    RNG stream); E_total is then the sum of the initial energies.
+    params.NUM_NODES must match (see Scenario.sim_params).
+
+    q_init (a path or load_q_tables dict) warm-starts the Q-tables from a
+    previous run, mapped node by node or, when N differs, by node type
+    (q_learning_agent.warm_start); q_save writes them (with node types) to an
+    .npz when the run completes or is closed by the consumer (a run that
+    fails with an exception leaves the file untouched). q_frozen=True evaluates the greedy policy of the
+    initial tables: actions come from a precomputed lookup table and the
+    reward / TD-update step is skipped, so a round costs about as much as the
+    baseline's. These require q_learning with vectorized=True.
+    """
+    params = resolve(params)
+    if rng not in RNG_MODES:
+        raise ValueError(f"Unknown rng mode: {rng}")
+    streams = CounterRNG(seed, method) if rng == "philox" else None
+    NUM_NODES, ROUNDS = params.NUM_NODES, params.ROUNDS
+    Eo, beta = params.Eo, params.beta
+
+    positions = np.random.rand(NUM_NODES, 2) * params.AREA
+    if scenario is not None and deployment is None:
+        deployment = Deployment(scenario.positions.astype(dtype, copy=False), params)
+    if deployment is None:
+        deployment = Deployment(positions.astype(dtype, copy=False), params)
+    positions = deployment.positions
+    population = None
+
+    fused = fused_kernel(backend)
+    if fused is not None:
+        if not vectorized:
+            raise ValueError(f"backend={backend!r} requires vectorized=True")
+        fused = FusedRound(fused, deployment, params)
+
+    if routing not in ROUTING_MODES:
+        raise ValueError(f"Unknown routing mode: {routing}")
+    router = MultiHopRouter(deployment, params) if routing == "multi_hop" else None
+    if router is not None and fused is not None:
+        raise ValueError("routing='multi_hop' requires backend='numpy'")
+
+    if clustering not in CLUSTERING_MODES:
+        raise ValueError(f"Unknown clustering mode: {clustering}")
+    clusterer = None
+    if clustering == "incremental":
+        if fused is not None or not vectorized:
+            raise ValueError("clustering='incremental' requires backend='numpy' and vectorized=True")
+        clusterer = IncrementalClusters(positions, deployment)
 
     # Initialize based on method
     if method == "q_learning":
-        agents = [QLearningNodeAgent() for _ in range(NUM_NODES)]
-        last_actions = [0 for _ in range(NUM_NODES)]
-        last_states = [0 for _ in range(NUM_NODES)]
-        
-        energies, types = init_proposed_nodes()
-        Nh = int(h * NUM_NODES)
-        Ns = int(S * Nh)
-        E_total = Eo * ((NUM_NODES - Nh) + Nh * (1 + alpha) + Ns * (beta - alpha))
-
-        def select_CHs_func(positions, energies, alive, E_total, round_num):
+        state = init_proposed_nodes(params, as_state=True, dtype=dtype, positions=positions)
+        if vectorized:
+            population = QLearningPopulation(NUM_NODES, epsilon_decay=epsilon_decay, dtype=q_dtype, state=state)
+        else:
+            agents = [QLearningNodeAgent(epsilon_decay=epsilon_decay) for _ in range(NUM_NODES)]
+            last_actions = [0 for _ in range(NUM_NODES)]
+            last_states = [0 for _ in range(NUM_NODES)]
+
+        energies = state.energies
+        E_total = total_energy_proposed(params)
+
+        def select_CHs_func(positions, energies, alive, E_total, round_num, deployment=None, vectorized=True,
+                            params=None, rng=None):
+            if vectorized:
+                return select_CHs_population(
+                    positions, energies, alive, E_total, round_num,
+                    population, deployment=deployment, rng_order=rng_order, params=params, rng=rng
+                )
             return select_CHs_q_learning(
                 positions, energies, alive, E_total, round_num,
-                agents, last_states, last_actions
+                agents, last_states, last_actions, deployment=deployment, params=params, rng=rng
             )
 
     elif method == "baseline":
-        energies, types = init_baseline_nodes()
-        E_total = NUM_NODES * Eo * (1 + alpha * h)
+        state = init_baseline_nodes(params, as_state=True, dtype=dtype, positions=positions)
+        energies = state.energies
+        E_total = total_energy_baseline(params)
         select_CHs_func = select_CHs_baseline
+        ch_thresholds_func = ch_thresholds_baseline
 
     else:  # proposed
-        energies, types = init_proposed_nodes()
-        Nh = int(h * NUM_NODES)
-        Ns = int(S * Nh)
-        E_total = Eo * ((NUM_NODES - Nh) + Nh * (1 + alpha) + Ns * (beta - alpha))
+        state = init_proposed_nodes(params, as_state=True, dtype=dtype, positions=positions)
+        energies = state.energies
+        E_total = total_energy_proposed(params)
         select_CHs_func = select_CHs_proposed
+        ch_thresholds_func = ch_thresholds_proposed
+
+    if scenario is not None:
+        scenario_total = scenario.apply(state, params, levels=2 if method == "baseline" else 3)
+        if scenario_total is not None:
+            E_total = scenario_total
+
+    # Q-table warm start / frozen policy
+    if q_init is not None or q_save is not None or q_frozen:
+        if population is None:
+            raise ValueError("q_init, q_save and q_frozen require method='q_learning' and vectorized=True")
+        if q_init is not None:
+            warm_start(population, q_init if isinstance(q_init, dict) else load_q_tables(q_init), state.types)
+        if q_frozen:
+            population.freeze()
 
     # Tracking
-    dead_nodes, alive_nodes, throughput_packets = [], [], []
+    if max_rounds is not None and max_rounds < 1:
+        raise ValueError(f"max_rounds must be positive, got {max_rounds}")
+    num_rounds = ROUNDS if max_rounds is None else min(max_rounds, ROUNDS)
+    death_round = np.full(NUM_NODES, -1, dtype=np.int32)
 
-    for r in range(ROUNDS):
-        alive = energies > 0
+    # Streaming recorder and checkpoint / resume
+    recorder = None
+    start_round = 0
+    replay = None
+    if record_dir is not None:
+        if method == "q_learning" and not vectorized:
+            raise ValueError("record_dir with q_learning requires vectorized=True")
+        run = run_identity(method, seed, params)
+        recorder = RoundRecorder(record_dir, num_rounds, resume=resume, run=run)
+        if not resume:
+            clear_checkpoint(record_dir)
+        checkpoint = load_checkpoint(record_dir, population, run) if resume else None
+        if checkpoint is None:
+            recorder.seek(0)  # Nothing to continue from: record again from the first round
+        else:
+            last_round, energies, saved_deaths = checkpoint
+            if saved_deaths is not None:
+                death_round = saved_deaths
+            start_round = last_round + 1
+            recorder.seek(start_round)
+            replay = recorder.history(start_round)
 
-        # CH Selection
-        is_CH = select_CHs_func(positions, energies, alive, E_total, r)
+    # Compacted live-node view (per-round arrays shrink as nodes die)
+    view = None
+    if compact:
+        if not vectorized:
+            raise ValueError("compact=True requires vectorized=True")
+        view = AliveView(deployment, energies, population)
 
-        # Clustering
-        CH_indices, CM_indices, cluster_assignments = form_clusters(positions, is_CH, alive)
+    completed = False
+    try:
+        if replay is not None:
+            for r, (dead, alive, packets) in enumerate(zip(*replay)):
+                yield RoundSnapshot(r, int(alive), int(dead), int(packets), death_round)
 
-        # Communication
-        energies, packets = transmit(positions, energies, CH_indices, CM_indices, cluster_assignments)
+        for r in range(start_round, num_rounds):
+            if view is not None and view.repacked:
+                # Rebind the round arrays and view-sized helpers to the new view
+                positions, energies, deployment = view.positions, view.energies, view.deployment
+                population = view.population
+                if clusterer is not None:
+                    clusterer = IncrementalClusters(positions, deployment)
+                if router is not None:
+                    router = MultiHopRouter(deployment, params)
+                if fused is not None:
+                    fused = FusedRound(fused.kernel, deployment, params)
+                view.repacked = False
 
-        # Q-Learning reward and update
-        if method == "q_learning":
-            for i in range(NUM_NODES):
-                if not alive[i]:
-                    continue
+            stats = {} if probe is not None and probe.start_round(r) else None
+            alive = energies > 0
+            round_rng = None
+            if streams is not None:
+                round_rng = streams.round(r, None if view is None else view.ids)
 
-                is_ch = last_actions[i] == 1
-                survived = energies[i] > 0
-                
-                energy_norm = normalize(energies[i], 0, Eo * (1 + beta))
-                alive_ratio = np.sum(energies > 0) / NUM_NODES
-                dist_to_sink = np.linalg.norm(positions[i] - np.array(SINK_POS))
-                dist_norm = normalize(dist_to_sink, 0, np.sqrt(AREA**2 + AREA**2))
-
-                if is_ch and survived:
-                    reward = (
-                        0.8 + 0.2 * energy_norm +     # High energy CH gets more reward
-                        0.1 * (1 - dist_norm) +       # Prefer CHs close to sink
-                        0.2 * alive_ratio             # Favor when more nodes are alive
+            if fused is None:
+                # CH Selection
+                is_CH = select_CHs_func(
+                    positions, energies, alive, E_total, r, deployment=deployment, vectorized=vectorized, params=params,
+                    rng=round_rng
+                )
+                if probe is not None:
+                    probe.lap("election")
+
+                # Clustering
+                if clusterer is not None:
+                    CH_indices, CM_indices, cluster_assignments = clusterer(is_CH, alive)
+                else:
+                    CH_indices, CM_indices, cluster_assignments = form_clusters(
+                        positions, is_CH, alive, method="auto" if vectorized else "loop", deployment=deployment
                     )
-                elif is_ch and not survived:
-                    reward = -1.0                    # Strong penalty for dying CH
-                elif not is_ch and survived:
-                    reward = 0.1 * energy_norm + 0.1 * alive_ratio
+                if probe is not None:
+                    probe.lap("clustering")
+
+                # Communication
+                energies, packets = transmit(
+                    positions, energies, CH_indices, CM_indices, cluster_assignments,
+                    vectorized=vectorized, deployment=deployment, params=params, stats=stats, router=router
+                )
+                if probe is not None:
+                    probe.lap("transmit")
+
+            else:
+                # Thresholds and pre-drawn uniforms (Q-learning: chosen actions as 1 / 0 thresholds)
+                if method == "q_learning":
+                    threshold = select_CHs_func(
+                        positions, energies, alive, E_total, r, deployment=deployment, params=params, rng=round_rng
+                    ).astype(float)
+                    draws = np.zeros(np.count_nonzero(alive))
                 else:
-                    reward = 0.0
+                    threshold = ch_thresholds_func(positions, energies, alive, E_total, r, deployment, params)
+                    draws = uniform_draws(np.flatnonzero(alive), NUM_NODES, round_rng)
+                if probe is not None:
+                    probe.lap("election")
+
+                # Fused election + clustering + communication
+                is_CH, cluster_assignments, packets = fused(energies, alive, threshold, draws)
+                if probe is not None:
+                    probe.lap("transmit")
+                if stats is not None:
+                    CH_indices, CM_indices = np.flatnonzero(is_CH), np.flatnonzero(alive & ~is_CH)
+                    stats.update(link_counts(positions, CH_indices, CM_indices, cluster_assignments, deployment, params))
+
+            # Q-Learning reward and update
+            if method == "q_learning" and vectorized:
+                if not q_frozen:
+                    alive_ratio = np.sum(energies > 0) / NUM_NODES
+                    update_population(population, alive, energies, deployment.d_sink_norm, alive_ratio, r, params)
+
+            elif method == "q_learning":
+                for i in range(NUM_NODES):
+                    if not alive[i]:
+                        continue
+
+                    is_ch = last_actions[i] == 1
+                    survived = energies[i] > 0
+                
+                    energy_norm = normalize(energies[i], 0, Eo * (1 + beta))
+                    alive_ratio = np.sum(energies > 0) / NUM_NODES
+                    dist_norm = deployment.d_sink_norm[i]
+
+                    if is_ch and survived:
+                        reward = (
+                            0.8 + 0.2 * energy_norm +     # High energy CH gets more reward
+                            0.1 * (1 - dist_norm) +       # Prefer CHs close to sink
+                            0.2 * alive_ratio             # Favor when more nodes are alive
+                        )
+                    elif is_ch and not survived:
+                        reward = -1.0                    # Strong penalty for dying CH
+                    elif not is_ch and survived:
+                        reward = 0.1 * energy_norm + 0.1 * alive_ratio
+                    else:
+                        reward = 0.0
+
+                    # Q-learning update
+                    next_state = agents[i].get_state_index(energy_norm, dist_norm, r + 1)
+                    agents[i].update_q(last_states[i], last_actions[i], reward, next_state)
+
+                for agent in agents:
+                    agent.decay_epsilon()
 
-                # Q-learning update
-                next_state = agents[i].get_state_index(energy_norm, dist_norm, r + 1)
-                agents[i].update_q(last_states[i], last_actions[i], reward, next_state)
+            if probe is not None:
+                probe.lap("q_update")
+
+            # Tracking stats
+            died = alive & (energies <= 0)
+            death_round[died if view is None else view.ids[died]] = r
+            num_alive = np.count_nonzero(energies > 0)
+            dead = NUM_NODES - num_alive
+
+            if method in ["proposed", "q_learning"]:
+                packets *= 2
+
+            if recorder is not None:
+                recorder.append(dead, NUM_NODES - dead, 2 * packets)
+                if checkpoint_every and (r + 1) % checkpoint_every == 0:
+                    recorder.flush()
+                    if view is not None:
+                        save_checkpoint(record_dir, r, *view.sync(energies), death_round, run)
+                    else:
+                        save_checkpoint(record_dir, r, energies, population, death_round, run)
+
+            if probe is not None:
+                probe.lap("tracking")
+                if stats is not None:
+                    probe.count(CHs=len(CH_indices), CMs=len(CM_indices), packets=2 * packets, **stats)
+                probe.end_round()
+
+            snapshot = RoundSnapshot(r, num_alive, dead, int(2 * packets), death_round)
+            if energy_view:
+                snapshot.energies = energies.view()
+                snapshot.energies.flags.writeable = False
+                snapshot.ids = None if view is None else view.ids
+            yield snapshot
+
+            if dead == NUM_NODES:
+                # Terminal state: fast-forward the remaining rounds, packets stay zero
+                if recorder is not None:
+                    recorder.fill(num_rounds - r - 1, dead, 0, 0)
+                break
+
+            if view is not None:
+                view.maybe_repack(energies, num_alive)
+        completed = True
+        return death_round
+    except GeneratorExit:
+        completed = True  # Closed by the consumer (e.g. simulate's stop_when), not failed
+        raise
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if q_save is not None and completed:
+            save_q_tables(q_save, view.sync(energies)[1] if view is not None else population, state.types)
+
+
+
+def simulate(method="baseline", params=None, seed=48, deployment=None, vectorized=True, rng_order="legacy",
+             epsilon_decay=1.0, stop_when=None, record_dir=None, checkpoint_every=None, resume=False,
+             return_deaths=False, probe=None, backend="numpy", routing="single_hop",
+             clustering="full", compact=False, dtype=np.float64, q_dtype=np.float64,
+             rng="global", max_rounds=None, scenario=None, q_init=None, q_save=None, q_frozen=False):
+    """
+    Runs iter_simulate to the end and returns the per-round series (see
+    iter_simulate for the options).
+
+    Once every node is dead the remaining rounds are filled analytically (all
+    dead, zero packets), so the output keeps its full ROUNDS (or max_rounds)
+    length. stop_when ("first_death", "all_dead" or a death fraction such as
+    0.9) instead ends the run at that milestone and returns series truncated
+    after its round, for lifetime-only sweeps.
+
+    Returns:
+    - dead, alive: (rounds,) int32 dead / alive node counts
+    - throughput: (rounds,) cumulative delivered bits
+    - death_round: (N,) int32 per-node death log, only with return_deaths=True
+    """
+    params = resolve(params)
+    NUM_NODES, ROUNDS = params.NUM_NODES, params.ROUNDS
+    num_rounds = ROUNDS if max_rounds is None else min(max(max_rounds, 0), ROUNDS)
+    dead_nodes = np.zeros(num_rounds, dtype=np.int32)
+    throughput_packets = np.zeros(num_rounds, dtype=np.int64)
+    stop_round = num_rounds
+    stop_dead = stop_dead_count(stop_when, NUM_NODES)
 
-        # Tracking stats
-        dead = np.sum(energies <= 0)
-        alive_nodes.append(NUM_NODES - dead)
-        dead_nodes.append(dead)
+    rounds = iter_simulate(
+        method, params, seed, deployment=deployment, vectorized=vectorized, rng_order=rng_order,
+        epsilon_decay=epsilon_decay, record_dir=record_dir, checkpoint_every=checkpoint_every, resume=resume,
+        probe=probe, backend=backend, routing=routing, clustering=clustering, compact=compact, dtype=dtype,
+        q_dtype=q_dtype, rng=rng, max_rounds=max_rounds, scenario=scenario,
+        q_init=q_init, q_save=q_save, q_frozen=q_frozen,
+    )
+    snapshot = None
+    while True:
+        try:
+            snapshot = next(rounds)
+        except StopIteration as done:
+            death_round = done.value
+            break
+        dead_nodes[snapshot.round] = snapshot.dead
+        throughput_packets[snapshot.round] = snapshot.packets
+        if stop_dead is not None and snapshot.dead >= stop_dead:
+            stop_round = snapshot.round + 1
+            death_round = snapshot.death_round
+            rounds.close()
+            break
 
-        if method in ["proposed", "q_learning"]:
-            packets *= 2
-        throughput_packets.append(2 * packets)
+    if snapshot is not None and stop_round == num_rounds:
+        dead_nodes[snapshot.round + 1:] = snapshot.dead  # All dead before the last round
 
-    cumulative_throughput_bits = np.cumsum(np.array(throughput_packets) * packet_size)
+    dead_nodes = dead_nodes[:stop_round]
+    alive_nodes = NUM_NODES - dead_nodes
+    cumulative_throughput_bits = np.cumsum(throughput_packets[:stop_round] * params.packet_size)
+    if return_deaths:
+        return dead_nodes, alive_nodes, cumulative_throughput_bits, death_round
     return dead_nodes, alive_nodes, cumulative_throughput_bits
 
 
@@ -0,0 +1,128 @@
+import json
+import time
+
+PHASES = ("election", "clustering", "transmit", "q_update", "tracking")
+COUNTERS = ("CHs", "CMs", "orphans", "multipath", "free_space", "packets")
+
+
+class Probe:
+    """
+    Opt-in per-phase timers and per-round counters for index.simulate.
+
+    simulate(..., probe=Probe()) times every phase of every sample_every-th
+    round and accumulates the counters of those rounds; without a probe the
+    simulator only pays a few `is not None` checks per round.
+
+    Phases:
+    - election: CH selection (incl. Q-learning ε-greedy actions)
+    - clustering: form_clusters
+    - transmit: energy accounting of the communication phase
+    - q_update: Q-learning reward and TD update (≈0 for other methods)
+    - tracking: per-round stats, recorder and checkpoints
+
+    Counters: CHs elected, CMs, orphans (CMs sent direct to sink), multipath
+    and free-space transmissions (Eq. (8) model used), packets.
+    """
+    def __init__(self, sample_every=1, trace=False):
+        self.sample_every = sample_every
+        self.trace = trace                     # Keep per-round events for export_trace
+        self.totals = {phase: 0.0 for phase in PHASES}
+        self.counters = {name: 0 for name in COUNTERS}
+        self.rounds = 0                        # Sampled rounds
+        self.events = []                       # (round, phase, start, duration) when tracing
+        self.samples = []                      # (round, time, counters) when tracing
+        self.sampled = False
+        self._origin = time.perf_counter()
+        self._last = self._origin
+
+    def start_round(self, round_num):
+        """
+        Starts timing round_num if it is sampled; returns whether it is.
+        """
+        self.sampled = round_num % self.sample_every == 0
+        if self.sampled:
+            self.round_num = round_num
+            self._last = time.perf_counter()
+        return self.sampled
+
+    def lap(self, phase):
+        """
+        Charges the time since the previous lap (or round start) to phase.
+        """
+        if not self.sampled:
+            return
+        now = time.perf_counter()
+        self.totals[phase] += now - self._last
+        if self.trace:
+            self.events.append((self.round_num, phase, self._last - self._origin, now - self._last))
+        self._last = now
+
+    def count(self, **counts):
+        """
+        Adds this round's counters (sampled rounds only).
+        """
+        if not self.sampled:
+            return
+        for name, value in counts.items():
+            self.counters[name] = self.counters.get(name, 0) + int(value)
+        if self.trace:
+            self.samples.append((self.round_num, self._last - self._origin, counts))
+
+    def end_round(self):
+        if self.sampled:
+            self.rounds += 1
+            self.sampled = False
+
+    def report(self):
+        """
+        Aggregated report over the sampled rounds.
+
+        Returns:
+        - dict with "rounds", "phases" {phase: {"total_s", "per_round_ms", "share"}}
+          and "counters" {name: {"total", "per_round"}}
+        """
+        elapsed = sum(self.totals.values())
+        rounds = max(self.rounds, 1)
+        return {
+            "rounds": self.rounds,
+            "phases": {
+                phase: {
+                    "total_s": total,
+                    "per_round_ms": total / rounds * 1e3,
+                    "share": total / elapsed if elapsed else 0.0,
+                }
+                for phase, total in self.totals.items()
+            },
+            "counters": {
+                name: {"total": total, "per_round": total / rounds}
+                for name, total in self.counters.items()
+            },
+        }
+
+    def format_report(self):
+        report = self.report()
+        lines = [f"Sampled rounds: {report['rounds']}", f"{'Phase':<14} {'Total (s)':>12} {'ms/round':>12} {'Share':>8}"]
+        for phase, p in report["phases"].items():
+            lines.append(f"{phase:<14} {p['total_s']:>12.4f} {p['per_round_ms']:>12.4f} {p['share']:>8.1%}")
+        lines.append(f"{'Counter':<14} {'Total':>12} {'Per round':>12}")
+        for name, c in report["counters"].items():
+            lines.append(f"{name:<14} {c['total']:>12} {c['per_round']:>12.2f}")
+        return "\n".join(lines)
+
+    def export_trace(self, path):
+        """
+        Writes the traced rounds (trace=True) in Chrome trace-event JSON
+        (chrome://tracing, Perfetto): one complete event per phase, one counter
+        event per round.
+        """
+        events = [
+            {"name": phase, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6, "pid": 0, "tid": 0,
+             "args": {"round": round_num}}
+            for round_num, phase, start, duration in self.events
+        ]
+        events += [
+            {"name": "counters", "ph": "C", "ts": ts * 1e6, "pid": 0, "args": dict(counts, round=round_num)}
+            for round_num, ts, counts in self.samples
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
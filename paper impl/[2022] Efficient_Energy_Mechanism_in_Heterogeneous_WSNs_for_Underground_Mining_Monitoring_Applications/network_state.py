@@ -0,0 +1,78 @@
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+ENERGY_DTYPES = (np.float32, np.float64)
+Q_DTYPES = (np.float16, np.float32, np.float64)
+NUM_STATES = 27
+NUM_ACTIONS = 2
+
+
+@dataclass
+class NetworkState:
+    """
+    Per-node state of one network in typed arrays.
+
+    Replaces the loose float64 energies / types arrays and the per-agent Python
+    objects and lists: at float32 energies and positions and float16 Q-tables a
+    node takes ~125 bytes, so 1M nodes fit in ~125 MB.
+
+    Attributes:
+    - energies: (N,) float32 / float64 residual energy
+    - types: (N,) int8 node type (0 = normal, 1 = high, 2 = super)
+    - positions: (N, 2) float32 / float64 coordinates, or None
+    - q_tables: (N, states, actions) float16 / float32 / float64, or None without Q-learning
+    - last_states, last_actions: (N,) uint8 last Q-state / action, or None
+    """
+    energies: np.ndarray
+    types: np.ndarray
+    positions: np.ndarray = None
+    q_tables: np.ndarray = None
+    last_states: np.ndarray = None
+    last_actions: np.ndarray = None
+
+    @classmethod
+    def allocate(cls, num_nodes, dtype=np.float64, positions=None):
+        """
+        Zeroed energies and types; positions (any float array) are cast to dtype.
+        """
+        if np.dtype(dtype) not in [np.dtype(t) for t in ENERGY_DTYPES]:
+            raise ValueError(f"Unsupported energy dtype: {dtype}")
+        if positions is not None:
+            positions = np.asarray(positions, dtype=dtype)
+        return cls(np.zeros(num_nodes, dtype=dtype), np.zeros(num_nodes, dtype=np.int8), positions)
+
+    @property
+    def num_nodes(self):
+        return len(self.energies)
+
+    def add_q_learning(self, q_dtype=np.float64, num_states=NUM_STATES, num_actions=NUM_ACTIONS):
+        """
+        Allocates zeroed Q-tables and uint8 last state / action arrays.
+        """
+        if np.dtype(q_dtype) not in [np.dtype(t) for t in Q_DTYPES]:
+            raise ValueError(f"Unsupported Q-table dtype: {q_dtype}")
+        self.q_tables = np.zeros((self.num_nodes, num_states, num_actions), dtype=q_dtype)
+        self.last_states = np.zeros(self.num_nodes, dtype=np.uint8)
+        self.last_actions = np.zeros(self.num_nodes, dtype=np.uint8)
+        return self
+
+    def memory(self):
+        """
+        Bytes held per field (None fields omitted).
+        """
+        return {f.name: getattr(self, f.name).nbytes for f in fields(self) if getattr(self, f.name) is not None}
+
+    @property
+    def nbytes(self):
+        return sum(self.memory().values())
+
+
+def state_nbytes(num_nodes, dtype=np.float64, q_dtype=None, num_states=NUM_STATES, num_actions=NUM_ACTIONS):
+    """
+    Size of a NetworkState with positions (and Q-learning arrays when q_dtype is given), in bytes.
+    """
+    per_node = 3 * np.dtype(dtype).itemsize + 1
+    if q_dtype is not None:
+        per_node += num_states * num_actions * np.dtype(q_dtype).itemsize + 2
+    return num_nodes * per_node
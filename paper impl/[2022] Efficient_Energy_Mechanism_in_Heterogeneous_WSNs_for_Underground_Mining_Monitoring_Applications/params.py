@@ -0,0 +1,57 @@
+from dataclasses import asdict, dataclass, fields, replace
+
+import config
+
+@dataclass(frozen=True)
+class SimParams:
+    """
+    Immutable set of simulation parameters, passed explicitly into simulate
+    and every protocol phase instead of reading module globals from config.py.
+
+    Field names mirror config.py; see there for units and equation references.
+    """
+    AREA: float
+    NUM_NODES: int
+    ROUNDS: int
+    SINK_POS: tuple
+
+    Eo: float
+    alpha: float
+    h: float
+    beta: float
+    S: float
+
+    Eelec: float
+    EDA: float
+    Efs: float
+    Emp: float
+
+    packet_size: int
+    p_opt: float
+
+    @classmethod
+    def from_config(cls, **overrides):
+        """
+        Snapshot of the current config.py values, with optional overrides.
+
+        SINK_POS is re-centred on AREA when AREA is overridden without SINK_POS.
+        """
+        values = {f.name: getattr(config, f.name) for f in fields(cls)}
+        if "AREA" in overrides and "SINK_POS" not in overrides:
+            overrides["SINK_POS"] = (overrides["AREA"] / 2, overrides["AREA"] / 2)
+        values.update(overrides)
+        values["SINK_POS"] = tuple(values["SINK_POS"])
+        return cls(**values)
+
+    def replace(self, **changes):
+        return replace(self, **changes)
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def resolve(params):
+    """
+    Returns params, or a snapshot of config.py when None (legacy callers).
+    """
+    return SimParams.from_config() if params is None else params
@@ -1,12 +1,19 @@
 import numpy as np
+from counter_rng import RoundRNG
+from election import rng_blocks
+
+WARM_START_MAPPINGS = ("auto", "node", "type")
 
 class QLearningNodeAgent:
-    def __init__(self, num_states=27, num_actions=2, alpha=0.5, gamma=0.9, epsilon=0.1):
+    def __init__(self, num_states=27, num_actions=2, alpha=0.5, gamma=0.9, epsilon=0.1,
+                 epsilon_decay=1.0, epsilon_min=0.0):
         self.num_states = num_states
         self.num_actions = num_actions
         self.alpha = alpha      # Learning rate
         self.gamma = gamma      # Discount factor
         self.epsilon = epsilon  # Exploration rate
+        self.epsilon_decay = epsilon_decay  # Per-round multiplicative decay (1.0 = off)
+        self.epsilon_min = epsilon_min
 
         self.q_table = np.zeros((num_states, num_actions))
 
@@ -20,10 +27,17 @@ class QLearningNodeAgent:
 
         return energy_idx * 9 + dist_idx * 3 + round_idx
 
-    def choose_action(self, state_idx):
+    def choose_action(self, state_idx, rng=None, node=None):
         """
         ε-greedy policy to choose an action (0: not CH, 1: become CH)
+
+        With a counter_rng.RoundRNG, node's keyed "explore" / "action" draws
+        replace the global np.random ones.
         """
+        if isinstance(rng, RoundRNG):
+            if rng.uniform(node, "explore") < self.epsilon:
+                return int(rng.uniform(node, "action") * self.num_actions)
+            return np.argmax(self.q_table[state_idx])
         if np.random.rand() < self.epsilon:
             return np.random.randint(self.num_actions)
         return np.argmax(self.q_table[state_idx])
@@ -37,3 +51,193 @@ class QLearningNodeAgent:
         td_error = td_target - self.q_table[state_idx][action]
 
         self.q_table[state_idx][action] += self.alpha * td_error
+
+    def decay_epsilon(self):
+        """
+        Shifts from exploration to exploitation as rounds progress
+        """
+        self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
+
+
+class QLearningPopulation:
+    """
+    All node agents of a network in one contiguous (N, states, actions) Q-table array.
+
+    Same hyperparameters and update rule as QLearningNodeAgent, applied to
+    many nodes per call instead of one agent object per node.
+
+    Q-tables are dtype (float64, or float32 / float16 to save memory); last
+    states and actions are uint8. With a NetworkState the population works on
+    (and, if missing, allocates) the state's Q arrays.
+
+    After freeze() the population plays the greedy policy of its current
+    Q-tables from a precomputed (N, states) action table, without exploration
+    or random draws.
+    """
+    def __init__(self, num_nodes, num_states=27, num_actions=2, alpha=0.5, gamma=0.9, epsilon=0.1,
+                 epsilon_decay=1.0, epsilon_min=0.0, dtype=np.float64, state=None):
+        self.num_nodes = num_nodes
+        self.num_states = num_states
+        self.num_actions = num_actions
+        self.alpha = alpha      # Learning rate
+        self.gamma = gamma      # Discount factor
+        self.epsilon = epsilon  # Exploration rate
+        self.epsilon_decay = epsilon_decay  # Per-round multiplicative decay (1.0 = off)
+        self.epsilon_min = epsilon_min
+
+        if state is None:
+            self.q_tables = np.zeros((num_nodes, num_states, num_actions), dtype=dtype)
+            self.last_states = np.zeros(num_nodes, dtype=np.uint8)
+            self.last_actions = np.zeros(num_nodes, dtype=np.uint8)
+        else:
+            if state.q_tables is None:
+                state.add_q_learning(dtype, num_states, num_actions)
+            self.q_tables, self.last_states, self.last_actions = state.q_tables, state.last_states, state.last_actions
+        self.greedy = None  # (N, states) uint8 frozen policy, see freeze()
+
+    def get_state_indices(self, energy_level, dist_to_sink, round_phase):
+        """
+        Vectorized get_state_index: discretized features → state indices [0–26]
+        """
+        energy_idx = np.minimum((np.asarray(energy_level) * 3).astype(int), 2)  # 0=low, 1=med, 2=high
+        dist_idx = np.minimum((np.asarray(dist_to_sink) * 3).astype(int), 2)    # 0=near, 1=med, 2=far
+        round_idx = round_phase % 3                                             # 0=early, 1=mid, 2=late
+
+        return energy_idx * 9 + dist_idx * 3 + round_idx
+
+    def choose_actions(self, nodes, state_idx, rng_order="legacy", rng=None):
+        """
+        ε-greedy actions for the given nodes (0: not CH, 1: become CH)
+
+        rng_order="legacy" draws rand() (and randint() when exploring) node by node,
+        consuming the RNG stream exactly like QLearningNodeAgent.choose_action;
+        "batched" draws all uniforms and exploratory actions in two calls per generator.
+        rng follows election.rng_blocks (default: global np.random); with a
+        counter_rng.RoundRNG every node uses its own keyed draws (rng_order is ignored).
+        A frozen population looks its greedy actions up and draws nothing.
+        """
+        if self.greedy is not None:
+            return self.greedy[nodes, state_idx]
+
+        actions = np.argmax(self.q_tables[nodes, state_idx], axis=1)
+        if isinstance(rng, RoundRNG):
+            explore = np.flatnonzero(rng.uniforms(nodes, "explore") < self.epsilon)
+            actions[explore] = rng.integers(nodes[explore], self.num_actions)
+            return actions
+
+        generators, block = rng_blocks(rng, self.num_nodes)
+        owner = nodes // block
+
+        if rng_order == "legacy":
+            for k in range(len(nodes)):
+                g = generators[owner[k]]
+                if g.rand() < self.epsilon:
+                    actions[k] = g.randint(self.num_actions)
+        else:
+            for b, g in enumerate(generators):
+                sel = np.flatnonzero(owner == b) if len(generators) > 1 else np.arange(len(nodes))
+                explore = sel[g.rand(len(sel)) < self.epsilon]
+                actions[explore] = g.randint(self.num_actions, size=len(explore))
+
+        return actions
+
+    def update_q(self, nodes, state_idx, actions, rewards, next_state_idx):
+        """
+        Q-learning update rule for many nodes at once
+        """
+        best_next = np.max(self.q_tables[nodes, next_state_idx], axis=1)
+        td_target = rewards + self.gamma * best_next
+        td_error = td_target - self.q_tables[nodes, state_idx, actions]
+
+        self.q_tables[nodes, state_idx, actions] += self.alpha * td_error
+
+    def decay_epsilon(self):
+        """
+        Shifts from exploration to exploitation as rounds progress
+        """
+        self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
+
+    def freeze(self):
+        """
+        Switches to inference: precomputes the greedy action of every (node, state).
+        """
+        self.greedy = np.argmax(self.q_tables, axis=2).astype(np.uint8)
+        return self
+
+    def subset(self, nodes):
+        """
+        Population of the given nodes only (copies of their Q-tables and last state / action).
+        """
+        sub = QLearningPopulation(len(nodes), self.num_states, self.num_actions, self.alpha, self.gamma,
+                                  self.epsilon, self.epsilon_decay, self.epsilon_min, self.q_tables.dtype)
+        sub.q_tables = self.q_tables[nodes]
+        sub.last_states = self.last_states[nodes]
+        sub.last_actions = self.last_actions[nodes]
+        sub.greedy = None if self.greedy is None else self.greedy[nodes]
+        return sub
+
+    def assign(self, nodes, sub):
+        """
+        Writes a subset population back into the given nodes (inverse of subset).
+        """
+        self.q_tables[nodes] = sub.q_tables
+        self.last_states[nodes] = sub.last_states
+        self.last_actions[nodes] = sub.last_actions
+        self.epsilon = sub.epsilon
+
+
+def save_q_tables(path, population, types=None):
+    """
+    Writes a population's Q-tables (and the node types, for warm starts at a
+    different N) to an .npz file.
+    """
+    arrays = {"q_tables": population.q_tables}
+    if types is not None:
+        arrays["types"] = np.asarray(types, dtype=np.int8)
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+    return path
+
+
+def load_q_tables(path):
+    """
+    Returns:
+    - dict with "q_tables" (N, states, actions) and, when saved, "types" (N,)
+    """
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def warm_start(population, saved, types=None, mapping="auto"):
+    """
+    Initializes a population's Q-tables from saved ones (load_q_tables output).
+
+    mapping="node" copies node i's table to node i (same N, same layout);
+    "type" gives every node the state-wise mean table of the saved nodes of
+    its type (the mean over all saved nodes when types are unknown or a type
+    is missing); "auto" uses "node" when N matches and "type" otherwise.
+    """
+    if mapping not in WARM_START_MAPPINGS:
+        raise ValueError(f"Unknown warm-start mapping: {mapping}")
+    q_tables = np.asarray(saved["q_tables"])
+    if q_tables.shape[1:] != population.q_tables.shape[1:]:
+        raise ValueError(f"Saved Q-tables have shape {q_tables.shape[1:]}, expected {population.q_tables.shape[1:]}")
+    if mapping == "auto":
+        mapping = "node" if len(q_tables) == population.num_nodes else "type"
+
+    if mapping == "node":
+        if len(q_tables) != population.num_nodes:
+            raise ValueError(f"mapping='node' needs {population.num_nodes} saved tables, got {len(q_tables)}")
+        population.q_tables[...] = q_tables
+        return population
+
+    mean = q_tables.mean(axis=0, dtype=np.float64)
+    saved_types = saved.get("types")
+    if types is None or saved_types is None:
+        population.q_tables[...] = mean
+        return population
+    types = np.asarray(types)
+    for t in np.unique(types):
+        of_type = saved_types == t
+        population.q_tables[types == t] = q_tables[of_type].mean(axis=0, dtype=np.float64) if of_type.any() else mean
+    return population
@@ -1,6 +1,6 @@
 import numpy as np
 from q_learn_deecp.q_learning_agent import QLearningNodeAgent
-from config import *
+from params import resolve
 
 # Initialize one Q-agent per node
 agents = []
@@ -16,7 +16,10 @@ def init_agents(num_nodes):
 def normalize(value, min_val, max_val):
     return (value - min_val) / (max_val - min_val + 1e-9)
 
-def select_CHs_q_learning(positions, energies, alive, E_total, round_num, agents, last_states, last_actions):
+def select_CHs_q_learning(positions, energies, alive, E_total, round_num, agents, last_states, last_actions,
+                          deployment=None, params=None, rng=None):
+    params = resolve(params)
+    Eo, beta, AREA, SINK_POS = params.Eo, params.beta, params.AREA, params.SINK_POS
     num_nodes = len(energies)
     is_CH = np.zeros(num_nodes, dtype=bool)
     for i in range(num_nodes):
@@ -24,11 +27,14 @@ def select_CHs_q_learning(positions, energies, alive, E_total, round_num, agents
             continue
 
         energy_norm = normalize(energies[i], 0, Eo * (1 + beta))  # Normalize energy
-        dist_to_sink = np.linalg.norm(positions[i] - np.array(SINK_POS))
-        dist_norm = normalize(dist_to_sink, 0, np.sqrt(AREA**2 + AREA**2))  # Normalize
+        if deployment is not None:
+            dist_norm = deployment.d_sink_norm[i]
+        else:
+            dist_to_sink = np.linalg.norm(positions[i] - np.array(SINK_POS))
+            dist_norm = normalize(dist_to_sink, 0, np.sqrt(AREA**2 + AREA**2))  # Normalize
 
         state_idx = agents[i].get_state_index(energy_norm, dist_norm, round_num)
-        action = agents[i].choose_action(state_idx)
+        action = agents[i].choose_action(state_idx, rng=rng, node=i)
 
         # Store for later reward update
         last_states[i] = state_idx
@@ -38,3 +44,76 @@ def select_CHs_q_learning(positions, energies, alive, E_total, round_num, agents
             is_CH[i] = True
 
     return is_CH
+
+def select_CHs_population(positions, energies, alive, E_total, round_num, population,
+                          deployment=None, rng_order="legacy", params=None, rng=None):
+    """
+    Batched select_CHs_q_learning over a QLearningPopulation: state indices and
+    ε-greedy actions for all alive nodes in a few array operations.
+    """
+    params = resolve(params)
+    Eo, beta, AREA, SINK_POS = params.Eo, params.beta, params.AREA, params.SINK_POS
+    nodes = np.flatnonzero(alive)
+    is_CH = np.zeros(len(energies), dtype=bool)
+
+    energy_norm = normalize(energies[nodes], 0, Eo * (1 + beta))  # Normalize energy
+    if deployment is not None:
+        dist_norm = deployment.d_sink_norm[nodes]
+    else:
+        dist_to_sink = np.linalg.norm(positions[nodes] - np.array(SINK_POS), axis=1)
+        dist_norm = normalize(dist_to_sink, 0, np.sqrt(AREA**2 + AREA**2))  # Normalize
+
+    state_idx = population.get_state_indices(energy_norm, dist_norm, round_num)
+    actions = population.choose_actions(nodes, state_idx, rng_order=rng_order, rng=rng)
+
+    # Store for later reward update
+    population.last_states[nodes] = state_idx
+    population.last_actions[nodes] = actions
+
+    is_CH[nodes] = actions == 1
+    return is_CH
+
+def update_population(population, alive, energies, dist_norm_all, alive_ratio, round_num, params=None):
+    """
+    Reward and TD update of every node that was alive at the start of the round.
+
+    Parameters:
+    - population: QLearningPopulation that chose this round's actions
+    - alive: boolean alive mask from the start of the round
+    - energies: energies after the communication phase
+    - dist_norm_all: normalized distance to sink of every node
+    - alive_ratio: fraction of nodes still alive (scalar, or per node)
+    - round_num: current round number
+    """
+    params = resolve(params)
+    nodes = np.flatnonzero(alive)
+    is_ch = population.last_actions[nodes] == 1
+    survived = energies[nodes] > 0
+
+    energy_norm = normalize(energies[nodes], 0, params.Eo * (1 + params.beta))
+    dist_norm = dist_norm_all[nodes]
+    if np.ndim(alive_ratio):
+        alive_ratio = alive_ratio[nodes]
+
+    reward = q_learning_rewards(is_ch, survived, energy_norm, dist_norm, alive_ratio)
+
+    # Q-learning update
+    next_state = population.get_state_indices(energy_norm, dist_norm, round_num + 1)
+    population.update_q(nodes, population.last_states[nodes], population.last_actions[nodes], reward, next_state)
+    population.decay_epsilon()
+
+def q_learning_rewards(is_ch, survived, energy_norm, dist_norm, alive_ratio):
+    """
+    Vectorized reward shaping of the Q-learning update (see index.simulate)
+    """
+    return np.select(
+        [is_ch & survived, is_ch & ~survived, ~is_ch & survived],
+        [
+            0.8 + 0.2 * energy_norm +     # High energy CH gets more reward
+            0.1 * (1 - dist_norm) +       # Prefer CHs close to sink
+            0.2 * alive_ratio,            # Favor when more nodes are alive
+            -1.0,                         # Strong penalty for dying CH
+            0.1 * energy_norm + 0.1 * alive_ratio,
+        ],
+        default=0.0,
+    )
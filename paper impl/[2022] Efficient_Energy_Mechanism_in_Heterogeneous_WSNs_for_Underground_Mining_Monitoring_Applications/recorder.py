@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+METRICS = {"dead": np.int32, "alive": np.int32, "packets": np.int64}
+
+
+def run_identity(method, seed, params):
+    """
+    What a recording belongs to: method, seed and a SHA-256 of every SimParams field.
+    """
+    params_hash = hashlib.sha256(json.dumps(params.as_dict(), sort_keys=True, default=str).encode()).hexdigest()
+    return {"method": method, "seed": int(seed), "params": params_hash}
+
+
+def check_identity(saved, run, what):
+    """
+    Rejects resuming a recording made by a different configuration.
+    """
+    if run is not None and saved is not None and saved != run:
+        raise ValueError(f"Cannot resume: {what} was recorded for {saved}, not {run}")
+
+class RoundRecorder:
+    """
+    Streams per-round metrics into memory-mappable .npy files in a run directory.
+
+    Rounds are buffered and written in chunks of chunk_size to
+    <directory>/{dead,alive,packets}.npy (each of length ROUNDS), and
+    <directory>/meta.json records how many leading rounds are on disk, so a
+    crashed or interrupted run keeps everything up to its last flush.
+
+    run (see run_identity) is stored in meta.json; resuming a recording made
+    for another run identity or round count raises ValueError.
+    """
+    def __init__(self, directory, rounds, chunk_size=1000, resume=False, run=None):
+        self.directory = directory
+        self.rounds = rounds
+        self.chunk_size = chunk_size
+        self.run = run
+        os.makedirs(directory, exist_ok=True)
+
+        mode = "r+" if resume and os.path.exists(self._path("dead")) else "w+"
+        if mode == "r+":
+            meta = self._read_meta()
+            check_identity(meta.get("run"), run, directory)
+            if meta.get("rounds", rounds) != rounds:
+                raise ValueError(f"Cannot resume: {directory} holds {meta['rounds']} rounds, not {rounds}")
+        self.arrays = {
+            name: open_memmap(self._path(name), mode=mode, dtype=dtype, shape=(rounds,))
+            for name, dtype in METRICS.items()
+        }
+        self.recorded = self._read_meta().get("recorded", 0) if mode == "r+" else 0
+        self.buffer = {name: np.zeros(chunk_size, dtype=dtype) for name, dtype in METRICS.items()}
+        self.start = self.recorded  # first round held in the buffer
+        self.count = 0
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def _read_meta(self):
+        try:
+            with open(os.path.join(self.directory, "meta.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def seek(self, round_num):
+        """
+        Drops buffered rounds and continues recording at round_num (used on resume).
+        """
+        self.recorded = min(self.recorded, round_num)
+        self.start = round_num
+        self.count = 0
+
+    def append(self, dead, alive, packets):
+        self.buffer["dead"][self.count] = dead
+        self.buffer["alive"][self.count] = alive
+        self.buffer["packets"][self.count] = packets
+        self.count += 1
+        if self.count == self.chunk_size:
+            self.flush()
+
+    def fill(self, num_rounds, dead, alive, packets):
+        """
+        Records num_rounds identical rounds (fast-forwarded terminal state).
+        """
+        self.flush()
+        stop = self.start + num_rounds
+        self.arrays["dead"][self.start:stop] = dead
+        self.arrays["alive"][self.start:stop] = alive
+        self.arrays["packets"][self.start:stop] = packets
+        self.start = stop
+        self.flush()
+
+    def flush(self):
+        stop = self.start + self.count
+        for name, array in self.arrays.items():
+            array[self.start:stop] = self.buffer[name][:self.count]
+            array.flush()
+        self.start = stop
+        self.count = 0
+        self.recorded = stop
+
+        meta_path = os.path.join(self.directory, "meta.json")
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump({"rounds": self.rounds, "recorded": self.recorded, "run": self.run}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def history(self, stop):
+        """
+        Recorded (dead, alive, packets) series for rounds [0, stop).
+        """
+        return tuple(np.array(self.arrays[name][:stop]) for name in METRICS)
+
+    def close(self):
+        self.flush()
+        self.arrays = {}
+
+
+def save_checkpoint(directory, round_num, energies, population=None, death_round=None, run=None):
+    """
+    Atomically writes the full simulator state after round_num to <directory>/checkpoint.npz:
+    energies, the global np.random state, the per-node death log, the run
+    identity and, for q_learning, Q-tables, last states/actions and ε.
+    """
+    name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    state = {
+        "round": round_num,
+        "energies": energies,
+        "rng_keys": keys,
+        "rng_pos": pos,
+        "rng_has_gauss": has_gauss,
+        "rng_cached_gaussian": cached_gaussian,
+    }
+    if death_round is not None:
+        state["death_round"] = death_round
+    if run is not None:
+        state["run"] = json.dumps(run, sort_keys=True)
+    if population is not None:
+        state.update(
+            q_tables=population.q_tables,
+            last_states=population.last_states,
+            last_actions=population.last_actions,
+            epsilon=population.epsilon,
+        )
+
+    path = os.path.join(directory, "checkpoint.npz")
+    with open(path + ".tmp", "wb") as f:
+        np.savez(f, **state)
+    os.replace(path + ".tmp", path)
+
+
+def clear_checkpoint(directory):
+    """
+    Removes <directory>/checkpoint.npz, so a fresh recording is never resumed from an older run's state.
+    """
+    try:
+        os.remove(os.path.join(directory, "checkpoint.npz"))
+    except FileNotFoundError:
+        pass
+
+
+def load_checkpoint(directory, population=None, run=None):
+    """
+    Restores the np.random state (and population, when given) from
+    <directory>/checkpoint.npz, after checking it was saved for run.
+
+    Returns:
+    - (round_num, energies, death_round), or None when there is no checkpoint
+    """
+    path = os.path.join(directory, "checkpoint.npz")
+    if not os.path.exists(path):
+        return None
+
+    with np.load(path) as state:
+        saved = json.loads(str(state["run"])) if "run" in state else None
+        check_identity(saved, run, path)
+        np.random.set_state((
+            "MT19937", state["rng_keys"], int(state["rng_pos"]),
+            int(state["rng_has_gauss"]), float(state["rng_cached_gaussian"]),
+        ))
+        if population is not None:
+            population.q_tables[...] = state["q_tables"]
+            population.last_states[...] = state["last_states"]
+            population.last_actions[...] = state["last_actions"]
+            population.epsilon = float(state["epsilon"])
+        death_round = state["death_round"].copy() if "death_round" in state else None
+        return int(state["round"]), state["energies"].copy(), death_round
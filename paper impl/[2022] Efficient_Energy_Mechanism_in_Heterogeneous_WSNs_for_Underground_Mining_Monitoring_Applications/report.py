@@ -0,0 +1,221 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from analytics import lifetime_metrics
+
+# matplotlib is imported lazily by load_pyplot (non-interactive Agg backend),
+# so simulation workers and the compute path never load it.
+
+MAX_POINTS = 2000        # Points kept per series after downsampling
+DPI = 120
+LABELS = {"baseline": "Baseline DEECP", "proposed": "Enhanced DEECP", "q_learning": "Q-Learning DEECP"}
+COLORS = {
+    "dead": {"baseline": "blue", "proposed": "red", "q_learning": "green"},
+    "throughput": {"baseline": "purple", "proposed": "orange", "q_learning": "teal"},
+}
+CONFIG_STYLES = {"baseline": "--", "proposed": "-", "q_learning": "-."}
+
+
+def downsample_minmax(y, max_points=MAX_POINTS):
+    """
+    Shape-preserving downsampling: the min and the max of each bucket, in round order.
+
+    Returns:
+    - (x, y) round indices and values (the input when it already fits)
+    """
+    y = np.asarray(y)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n), y
+
+    buckets = max(max_points // 2, 1)
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+    starts = edges[:-1]
+    lo = np.array([start + np.argmin(y[start:stop]) for start, stop in zip(starts, edges[1:])])
+    hi = np.array([start + np.argmax(y[start:stop]) for start, stop in zip(starts, edges[1:])])
+    x = np.sort(np.unique(np.concatenate([lo, hi, [0, n - 1]])))
+    return x, y[x]
+
+
+def downsample_lttb(y, max_points=MAX_POINTS):
+    """
+    Largest-Triangle-Three-Buckets downsampling (keeps first and last point).
+
+    Returns:
+    - (x, y) round indices and values (the input when it already fits)
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_points or max_points < 3:
+        return np.arange(n), y
+
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    x_out = np.empty(max_points, dtype=int)
+    x_out[0], x_out[-1] = 0, n - 1
+    a = 0
+    for b in range(max_points - 2):
+        start, stop = edges[b], edges[b + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        nxt_start, nxt_stop = stop, edges[b + 2] if b + 2 < len(edges) else n
+        avg_x = (nxt_start + nxt_stop - 1) / 2
+        avg_y = y[nxt_start:nxt_stop].mean()
+
+        xs = np.arange(start, stop)
+        area = np.abs((a - avg_x) * (y[xs] - y[a]) - (a - xs) * (avg_y - y[a]))
+        a = xs[np.argmax(area)]
+        x_out[b + 1] = a
+
+    return x_out, y[x_out]
+
+
+DOWNSAMPLERS = {"minmax": downsample_minmax, "lttb": downsample_lttb}
+
+
+def line_spec(filename, title, xlabel, ylabel, series, max_points=MAX_POINTS, downsample="minmax", figsize=(8, 5)):
+    """
+    Figure spec (plain data, cheap to send to a worker) of downsampled line series.
+
+    Parameters:
+    - series: list of (label, y, style dict for plt.plot)
+    """
+    reduce = DOWNSAMPLERS[downsample]
+    lines = []
+    for label, y, style in series:
+        x, y = reduce(y, max_points)
+        lines.append((label, x, y, style))
+    return {"kind": "line", "filename": filename, "title": title, "xlabel": xlabel, "ylabel": ylabel,
+            "lines": lines, "figsize": figsize}
+
+
+def figure_specs(results, configs, detail_nodes=50, max_points=MAX_POINTS, downsample="minmax"):
+    """
+    All simulate_network.py figures as specs.
+
+    Parameters:
+    - results: results[NUM_NODES][method] = {"dead", "alive", "throughput", "death_round"}
+    - configs: (NUM_NODES, p_opt) pairs in plotting order
+    - detail_nodes: configuration whose per-method curves are plotted
+    """
+    specs = []
+    kw = {"max_points": max_points, "downsample": downsample}
+
+    if detail_nodes in results:
+        res = results[detail_nodes]
+        for key, ylabel, title in [
+            ("dead", "Number of Dead Nodes", "Dead Nodes During Network Operation Time"),
+            ("alive", "Number of Alive Nodes", "Alive Nodes During Network Operation Time"),
+            ("throughput", "Network Throughput (bits)", "Throughput During Network Operation Time"),
+        ]:
+            colors = COLORS["throughput" if key == "throughput" else "dead"]
+            series = [(LABELS[m], res[m][key], {"linestyle": "--", "color": colors[m]}) for m in LABELS]
+            specs.append(line_spec(f"{key}_N{detail_nodes}", title, "Simulation Duration (sec)", ylabel, series,
+                                   **kw))
+
+    for key, ylabel, title in [
+        ("dead", "Number of Dead Nodes", "Dead Nodes During Network Operation"),
+        ("alive", "Number of Alive Nodes", "Alive Nodes During Network Operation"),
+    ]:
+        series = [
+            (f"{LABELS[m]} N={N}", results[N][m][key], {"linestyle": CONFIG_STYLES[m]})
+            for N, _ in configs
+            for m in LABELS
+        ]
+        specs.append(line_spec(f"{key}_by_config", title, "Simulation Duration (sec)", ylabel, series,
+                               figsize=(11, 5), **kw))
+
+    specs.append({
+        "kind": "bar",
+        "filename": "lifetime_by_config",
+        "title": "Network Lifetime vs Number of Nodes",
+        "xlabel": "Number of Nodes",
+        "ylabel": "Last Node Dead Round",
+        "labels": [str(N) for N, _ in configs],
+        "bars": [
+            (LABELS[m], [lifetime_metrics(results[N][m]["death_round"])["LND"] for N, _ in configs], color)
+            for m, color in zip(LABELS, ("steelblue", "orange", "green"))
+        ],
+        "figsize": (10, 6),
+    })
+    return specs
+
+
+def load_pyplot():
+    """
+    Imports pyplot on the non-interactive Agg backend (no display needed).
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def render_figure(spec, out_dir, fmt="png", dpi=DPI):
+    """
+    Renders one spec to <out_dir>/<filename>.<fmt> with the Agg backend.
+
+    Returns:
+    - path of the written file
+    """
+    plt = load_pyplot()
+
+    fig, ax = plt.subplots(figsize=spec["figsize"])
+    if spec["kind"] == "line":
+        for label, x, y, style in spec["lines"]:
+            ax.plot(x, y, label=label, **style)
+        ax.grid(True)
+    else:
+        x = np.arange(len(spec["labels"]))
+        width = 0.8 / len(spec["bars"])
+        for k, (label, values, color) in enumerate(spec["bars"]):
+            ax.bar(x + (k - (len(spec["bars"]) - 1) / 2) * width, values, width, label=label, color=color)
+        ax.set_xticks(x, spec["labels"])
+        ax.grid(axis="y", linestyle="--", alpha=0.6)
+
+    ax.set_title(spec["title"])
+    ax.set_xlabel(spec["xlabel"])
+    ax.set_ylabel(spec["ylabel"])
+    ax.legend()
+    fig.tight_layout()
+
+    path = os.path.join(out_dir, f"{spec['filename']}.{fmt}")
+    fig.savefig(path, dpi=dpi)
+    plt.close(fig)
+    return path
+
+
+def _render(args):
+    return render_figure(*args)
+
+
+def render_report(results, configs, out_dir="results/report", processes=None, fmt="png", dpi=DPI,
+                  detail_nodes=50, max_points=MAX_POINTS, downsample="minmax"):
+    """
+    Renders every figure to files, in parallel across figures.
+
+    Series are downsampled in this process, so workers only receive a few
+    thousand points per figure and import nothing but matplotlib.
+
+    Parameters:
+    - results, configs, detail_nodes: see figure_specs
+    - out_dir: output directory (created if missing)
+    - processes: worker count (None = one per figure up to the core count, 1 = serial)
+    - fmt, dpi: output format and resolution
+    - max_points, downsample: points per series and "minmax" / "lttb"
+
+    Returns:
+    - paths: written files, in figure order
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    specs = figure_specs(results, configs, detail_nodes, max_points, downsample)
+    jobs = [(spec, out_dir, fmt, dpi) for spec in specs]
+
+    if processes == 1:
+        return [_render(job) for job in jobs]
+
+    # Import once here so forked workers start with matplotlib already loaded
+    load_pyplot()
+    workers = min(len(jobs), processes or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render, jobs))
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import uuid
+from functools import lru_cache
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(ROOT, "results", "cache")
+DEFAULT_MAX_BYTES = 512 * 2**20      # Total size kept on disk before LRU eviction
+CACHE_FORMAT = 1                     # Bump when the stored layout changes
+
+# Source files whose code determines simulate's output
+PROTOCOL_FILES = (
+    "index.py", "params.py", "deployment.py", "election.py", "clustering.py", "communication.py",
+    "routing.py", "fused.py", "compaction.py", "counter_rng.py", "network_state.py", "utils.py", "analytics.py",
+    "deecp/ch_selection.py", "deecp/init_nodes.py", "e_deecp/ch_selection.py", "e_deecp/init_nodes.py",
+    "q_learn_deecp/q_learning_agent.py", "q_learn_deecp/q_learning_ch_selection.py",
+)
+# simulate arguments with side effects or unhashable state: runs using them bypass the cache
+UNCACHEABLE = ("deployment", "scenario", "probe", "record_dir", "checkpoint_every", "resume", "q_init", "q_save")
+RESULT_FIELDS = ("dead", "alive", "throughput", "death_round")
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """
+    SHA-256 over the protocol source files (computed once per process).
+    """
+    digest = hashlib.sha256(str(CACHE_FORMAT).encode())
+    for name in PROTOCOL_FILES:
+        digest.update(name.encode())
+        with open(os.path.join(ROOT, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def cacheable(simulate_kwargs):
+    """
+    True unless an UNCACHEABLE argument is switched on (left at its default,
+    None / False / 0, it does not change the run).
+    """
+    return not any(simulate_kwargs.get(name) for name in UNCACHEABLE)
+
+
+def cache_key(params, method, seed, **simulate_kwargs):
+    """
+    Content address of one simulate run: every SimParams field, method, seed,
+    the remaining simulate arguments and the protocol code version.
+    """
+    payload = {
+        "params": params.as_dict(),
+        "method": method,
+        "seed": seed,
+        "kwargs": {k: v for k, v in sorted(simulate_kwargs.items()) if k not in UNCACHEABLE},
+        "code": code_version(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk store of simulate results, one compressed .npz per key.
+
+    Safe to share between worker processes: entries are written to a unique
+    temporary file and published with an atomic os.replace, readers only ever
+    open complete files, and a file evicted while being read stays readable
+    through its open handle. Reads refresh the entry's mtime; once the
+    directory grows beyond max_bytes the least recently used entries are
+    removed.
+    """
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key):
+        """
+        Returns the stored arrays as a dict, or None on a miss.
+        """
+        path = self.path(key)
+        try:
+            with np.load(path) as data:
+                result = {name: data[name] for name in data.files}
+            os.utime(path)  # LRU recency
+        except (FileNotFoundError, OSError, ValueError):
+            return None  # Missing, evicted meanwhile, or unreadable
+        return result
+
+    def put(self, key, arrays):
+        tmp = os.path.join(self.directory, f".{key}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp, self.path(key))
+        self.evict()
+
+    def evict(self):
+        """
+        Deletes least recently used entries until the cache fits in max_bytes.
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Evicted by another process
+            total -= size
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+
+def cached_simulate(cache, method, params, seed=48, **simulate_kwargs):
+    """
+    simulate(..., return_deaths=True) through the cache.
+
+    Returns:
+    - dict with "dead", "alive", "throughput", "death_round" arrays
+    """
+    from index import simulate
+
+    key = cache_key(params, method, seed, **simulate_kwargs) if cacheable(simulate_kwargs) else None
+    if key is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+
+    result = dict(zip(RESULT_FIELDS, simulate(method, params, seed, return_deaths=True, **simulate_kwargs)))
+    if key is not None:
+        cache.put(key, result)
+    return result
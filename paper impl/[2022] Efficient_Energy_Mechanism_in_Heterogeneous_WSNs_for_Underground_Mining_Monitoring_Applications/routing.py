@@ -0,0 +1,168 @@
+import numpy as np
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra
+except ImportError:  # scipy is optional, route() falls back to dense min-plus relaxation
+    dijkstra = None
+
+from communication import tx_energy
+from params import resolve
+
+ROUTING_MODES = ("single_hop", "multi_hop")
+DIJKSTRA_MIN_CHS = 256  # CH count from which scipy's Dijkstra beats dense relaxation
+
+
+class MultiHopRouter:
+    """
+    Minimum-energy inter-cluster routing: each CH sends its aggregated packet to
+    the sink either directly or relayed through other CHs of the round.
+
+    Link cost u → v is ETx(d(u, v)) (Eq. (8)) plus the relay's receive cost
+    k * Eelec; u → sink is ETx(d(u, sink)) as in single-hop. Shortest paths to
+    the sink over the round's CH graph give every CH a next hop, and every
+    relay forwards each packet it receives, so a CH whose routing subtree holds
+    L packets (its own included) pays L * ETx(next hop) + (L - 1) * k * Eelec.
+
+    The tree is solved from scratch every round: DEECP redraws almost the
+    whole CH set each round, so there is no earlier tree worth repairing.
+    Link costs come from the deployment's cached ETx tables and only links
+    that can beat the sender's direct cost are considered.
+    """
+    def __init__(self, deployment, params=None):
+        params = resolve(params)
+        self.deployment = deployment
+        self.params = params
+        self.rx_cost = params.packet_size * params.Eelec
+
+    def relay_radius(self, budget):
+        """
+        Longest hop whose ETx plus the relay's receive cost stays within budget
+        (Eq. (8) inverted; it is continuous and increasing in d).
+        """
+        p = self.params
+        amp = np.maximum((budget - self.rx_cost) / p.packet_size - p.Eelec, 0)  # Amplifier energy per bit
+        d_fs = np.sqrt(amp / p.Efs)
+        return np.where(d_fs < np.sqrt(p.Efs / p.Emp), d_fs, (amp / p.Emp) ** 0.25)
+
+    def candidate_links(self, CH_indices, direct):
+        """
+        CH → CH links cheaper than the sender's direct sink cost (no other link can
+        be the first hop of a shortest path), found by relay radius before any ETx
+        is evaluated.
+
+        Returns:
+        - senders, relays: positions in CH_indices
+        - cost: ETx + relay receive cost of each link
+        """
+        pos = self.deployment.positions[CH_indices]
+        dx = pos[:, 0][:, None] - pos[:, 0][None, :]
+        dy = pos[:, 1][:, None] - pos[:, 1][None, :]
+        d2 = dx * dx + dy * dy
+        radius = self.relay_radius(direct) * (1 + 1e-9)
+        senders, relays = np.nonzero(d2 <= (radius * radius)[:, None])
+        keep = senders != relays
+        senders, relays = senders[keep], relays[keep]
+
+        if self.deployment.etx_pair is not None:
+            etx = self.deployment.etx_pair[CH_indices[senders], CH_indices[relays]]
+        else:
+            etx = tx_energy(np.sqrt(d2[senders, relays]), self.params)
+        cost = etx + self.rx_cost
+        keep = cost < direct[senders]
+        return senders[keep], relays[keep], cost[keep]
+
+    def route(self, CH_indices):
+        """
+        Shortest-path tree to the sink over the CH graph.
+
+        With DIJKSTRA_MIN_CHS or more CHs the candidate links go to scipy's
+        Dijkstra (from the sink, over reversed links) when scipy is installed;
+        otherwise Bellman-Ford relaxes all links
+        at once as a (K, K) min-plus step, converging after (longest relay
+        chain + 1) steps.
+
+        Returns:
+        - next_hop: (K,) position in CH_indices of each CH's next hop, -1 = sink
+        - etx_next: (K,) ETx of the hop to next_hop
+        - d_next: (K,) length of the hop to next_hop
+        """
+        K = len(CH_indices)
+        direct = self.deployment.etx_sink[CH_indices]
+        senders, relays, cost = self.candidate_links(CH_indices, direct)
+        next_hop = -np.ones(K, dtype=int)
+        etx_next = direct.copy()
+        d_next = self.deployment.d_sink[CH_indices]
+        if senders.size == 0:
+            return next_hop, etx_next, d_next
+
+        W = np.full((K, K), np.inf)
+        W[senders, relays] = cost
+
+        if dijkstra is not None and K >= DIJKSTRA_MIN_CHS:
+            # Node K is the sink; reversed links relay → sender, sink → every CH
+            graph = csr_matrix(
+                (np.concatenate([cost, direct]),
+                 (np.concatenate([relays, np.full(K, K)]), np.concatenate([senders, np.arange(K)]))),
+                shape=(K + 1, K + 1),
+            )
+            _, predecessors = dijkstra(graph, directed=True, indices=K, return_predecessors=True)
+            next_hop = np.where(predecessors[:K] == K, -1, predecessors[:K])
+        else:
+            dist = direct.copy()
+            rows = np.arange(K)
+            for _ in range(K):
+                via = W + dist[None, :]
+                v = np.argmin(via, axis=1)
+                best = via[rows, v]
+                better = best < dist
+                if not np.any(better):
+                    break
+                dist[better] = best[better]
+                next_hop[better] = v[better]
+
+        relayed = next_hop >= 0
+        etx_next[relayed] = W[relayed, next_hop[relayed]] - self.rx_cost
+        senders, relays = CH_indices[relayed], CH_indices[next_hop[relayed]]
+        if self.deployment.d_pair is not None:
+            d_next[relayed] = self.deployment.d_pair[senders, relays]
+        else:
+            pos = self.deployment.positions
+            d_next[relayed] = np.linalg.norm(pos[senders] - pos[relays], axis=1)
+        return next_hop, etx_next, d_next
+
+    def subtree_loads(self, next_hop):
+        """
+        Packets each CH transmits (its own plus everything relayed through it),
+        accumulated level by level with scatter-adds from the deepest CHs up.
+        """
+        K = len(next_hop)
+        relayed = next_hop >= 0
+        if not np.any(relayed):
+            return np.ones(K, dtype=int)
+        depth = np.zeros(K, dtype=int)
+        for _ in range(K):
+            new_depth = np.where(relayed, depth[np.maximum(next_hop, 0)] + 1, 0)
+            if np.array_equal(new_depth, depth):
+                break
+            depth = new_depth
+
+        load = np.ones(K, dtype=int)
+        for level in range(depth.max(initial=0), 0, -1):
+            nodes = np.flatnonzero(depth == level)
+            np.add.at(load, next_hop[nodes], load[nodes])
+        return load
+
+    def costs(self, CH_indices):
+        """
+        Per-CH energy spent on CH → sink delivery this round (aligned with CH_indices).
+
+        Returns:
+        - cost: (K,) energy per CH
+        - relays: number of relay hops (packets forwarded by another CH)
+        - d_next: (K,) distance from each CH to its next hop (CH or sink)
+        """
+        next_hop, etx_next, d_next = self.route(CH_indices)
+        load = self.subtree_loads(next_hop)
+        cost = load * etx_next + (load - 1) * self.rx_cost
+        return cost, int(load.sum() - len(load)), d_next
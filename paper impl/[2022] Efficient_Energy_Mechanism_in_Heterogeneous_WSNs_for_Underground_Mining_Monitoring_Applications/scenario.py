@@ -0,0 +1,269 @@
+import os
+import struct
+import zipfile
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.lib.format import open_memmap, read_array_header_1_0, read_array_header_2_0, read_magic
+
+from params import resolve
+
+FIELDS = ("positions", "types", "energies")
+CHUNK_SIZE = 1 << 18   # Nodes generated / written per step by mine_scenario
+ZIP_LOCAL_HEADER = 30  # Fixed part of a zip local file header
+
+
+@dataclass
+class Scenario:
+    """
+    A node layout with optional heterogeneity, loaded from or saved to disk.
+
+    Arrays may be read-only memory maps: simulate(..., scenario=...) reads
+    positions and types in place and only copies the initial energies into
+    its (mutable) state.
+
+    Attributes:
+    - positions: (N, 2) node coordinates
+    - types: (N,) node types (0 = normal, 1 = high, 2 = super), or None to draw them like initialize_nodes
+    - energies: (N,) initial energies, or None to derive them from types and params
+    - area: field side for SimParams.AREA, or None
+    - sink_pos: (2,) sink coordinates for SimParams.SINK_POS, or None
+    """
+    positions: np.ndarray
+    types: np.ndarray = None
+    energies: np.ndarray = None
+    area: float = None
+    sink_pos: tuple = None
+
+    @property
+    def num_nodes(self):
+        return len(self.positions)
+
+    def sim_params(self, params=None):
+        """
+        params with NUM_NODES (and AREA / SINK_POS, when set) taken from this scenario.
+        """
+        changes = {"NUM_NODES": self.num_nodes}
+        if self.area is not None:
+            changes["AREA"] = float(self.area)
+        if self.sink_pos is not None:
+            changes["SINK_POS"] = tuple(float(x) for x in self.sink_pos)
+        return resolve(params).replace(**changes)
+
+    def initial_energies(self, params=None, levels=3):
+        """
+        Initial energies: the stored ones, or Eo / Eo(1 + alpha) / Eo(1 + beta)
+        by type (levels=2, the baseline's model, treats super nodes as high).
+        """
+        if self.energies is not None:
+            return self.energies
+        params = resolve(params)
+        table = np.array([params.Eo, params.Eo * (1 + params.alpha), params.Eo * (1 + params.beta)])
+        if levels == 2:
+            table[2] = table[1]
+        return table[self.types]
+
+    def apply(self, state, params=None, levels=3):
+        """
+        Overwrites a NetworkState's types and energies (in place) with this
+        scenario's.
+
+        Returns:
+        - E_total: total initial energy, replacing Eq. (2) / (4) (None when the
+          scenario has neither types nor energies and the drawn state is kept)
+        """
+        if self.num_nodes != state.num_nodes:
+            raise ValueError(
+                f"Scenario has {self.num_nodes} nodes, params.NUM_NODES is {state.num_nodes} "
+                "(see Scenario.sim_params)"
+            )
+        if self.types is None and self.energies is None:
+            return None
+        if self.types is not None:
+            state.types[...] = self.types
+        state.energies[...] = self.initial_energies(params, levels)
+        return float(np.sum(state.energies, dtype=np.float64))
+
+
+def save_scenario(path, scenario):
+    """
+    Writes a scenario as a directory of .npy files (positions, types,
+    energies, meta) or, for a path ending in .npz, one uncompressed archive;
+    both can be memory-mapped by load_scenario.
+    """
+    arrays = {name: getattr(scenario, name) for name in FIELDS if getattr(scenario, name) is not None}
+    arrays["meta"] = _meta(scenario)
+    if path.endswith(".npz"):
+        np.savez(path, **arrays)
+        return path
+
+    os.makedirs(path, exist_ok=True)
+    for name in FIELDS:
+        if os.path.exists(os.path.join(path, f"{name}.npy")) and name not in arrays:
+            os.remove(os.path.join(path, f"{name}.npy"))  # Stale field from an earlier save
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array)
+    return path
+
+
+def load_scenario(path, mmap_mode="r"):
+    """
+    Loads a scenario saved by save_scenario (or mine_scenario).
+
+    With mmap_mode ("r", "c", ...) every array is a memory map of the file,
+    also inside an .npz as long as it was not compressed, so large layouts
+    load without reading or copying them; mmap_mode=None reads them into memory.
+    """
+    if path.endswith(".npz"):
+        arrays = _load_npz(path, mmap_mode)
+    else:
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in FIELDS + ("meta",)
+            if os.path.exists(os.path.join(path, f"{name}.npy"))
+        }
+    meta = arrays.pop("meta", None)
+    area, sink_pos = None, None
+    if meta is not None:
+        meta = np.asarray(meta)
+        area = None if np.isnan(meta[0]) else float(meta[0])
+        sink_pos = None if np.isnan(meta[1]) else (float(meta[1]), float(meta[2]))
+    return Scenario(area=area, sink_pos=sink_pos, **arrays)
+
+
+def _meta(scenario):
+    """
+    [area, sink_x, sink_y] with NaN for unset values.
+    """
+    sink = (np.nan, np.nan) if scenario.sink_pos is None else scenario.sink_pos
+    return np.array([np.nan if scenario.area is None else scenario.area, *sink], dtype=np.float64)
+
+
+def _load_npz(path, mmap_mode):
+    """
+    Members of an .npz; uncompressed ones are memory-mapped at their offset in the archive.
+    """
+    if mmap_mode is None:
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            name = info.filename[:-len(".npy")]
+            if info.compress_type != zipfile.ZIP_STORED:
+                with np.load(path) as data:
+                    arrays[name] = data[name]  # Compressed: has to be inflated
+                continue
+
+            f.seek(info.header_offset)
+            name_len, extra_len = struct.unpack("<HH", f.read(ZIP_LOCAL_HEADER)[26:30])
+            f.seek(info.header_offset + ZIP_LOCAL_HEADER + name_len + extra_len)
+            version = read_magic(f)
+            read_header = read_array_header_1_0 if version == (1, 0) else read_array_header_2_0
+            shape, fortran_order, dtype = read_header(f)
+            if np.prod(shape) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+            arrays[name] = np.memmap(
+                path, dtype=dtype, mode=mmap_mode, offset=f.tell(), shape=shape,
+                order="F" if fortran_order else "C",
+            )
+    return arrays
+
+
+# ------------------------------
+# Mine topology generator
+# ------------------------------
+def mine_segments(levels=3, drifts=4, drift_length=1000.0, drift_spacing=60.0, level_spacing=400.0, crosscuts=8):
+    """
+    Corridor centre lines of a multi-level mine, in a vertical section.
+
+    Each level is drifts parallel horizontal galleries drift_spacing apart,
+    joined by crosscuts evenly spaced vertical crosscuts; levels are stacked
+    level_spacing apart and joined by a central shaft.
+
+    Returns:
+    - segments: (M, 4) x0, y0, x1, y1 per corridor
+    """
+    segments = []
+    level_height = (drifts - 1) * drift_spacing
+    for level in range(levels):
+        y0 = level * level_spacing
+        for d in range(drifts):
+            segments.append((0.0, y0 + d * drift_spacing, drift_length, y0 + d * drift_spacing))
+        if drifts > 1:
+            for k in range(crosscuts):
+                x = (k + 0.5) * drift_length / crosscuts
+                segments.append((x, y0, x, y0 + level_height))
+    if levels > 1:
+        segments.append((drift_length / 2, 0.0, drift_length / 2, (levels - 1) * level_spacing))
+    return np.array(segments, dtype=np.float64)
+
+
+def mine_scenario(path, num_nodes, params=None, seed=48, width=5.0, dtype=np.float64, chunk_size=CHUNK_SIZE,
+                  **geometry):
+    """
+    Generates a mine-like layout of num_nodes sensors straight into .npy files
+    (open_memmap), chunk_size nodes at a time, so 10^5-10^6 node scenarios
+    are written at constant memory and later memory-mapped by load_scenario.
+
+    Nodes are spread along the corridors of mine_segments(**geometry) in
+    proportion to their length, uniformly across the corridor width. Types
+    follow the paper's fractions exactly (int(h * N) high + super, int(S * Nh)
+    super) but are scattered at random by sampling each chunk's counts from a
+    multivariate hypergeometric. The sink sits at the middle of the shaft and
+    AREA is the larger extent of the mine.
+
+    Parameters:
+    - path: output directory
+    - num_nodes: sensor count
+    - params: SimParams for h and S (energies are derived from types at run time)
+    - seed: layout / type RNG seed
+    - width: corridor width
+    - dtype: position dtype (float32 halves the file)
+    - chunk_size: nodes per generation step
+    - geometry: levels, drifts, drift_length, drift_spacing, level_spacing, crosscuts
+
+    Returns:
+    - Scenario memory-mapped from path
+    """
+    params = resolve(params)
+    rng = np.random.default_rng(seed)
+    segments = mine_segments(**geometry)
+    start, end = segments[:, :2], segments[:, 2:]
+    lengths = np.linalg.norm(end - start, axis=1)
+    direction = (end - start) / lengths[:, None]
+    normal = np.stack([-direction[:, 1], direction[:, 0]], axis=1)
+    weights = lengths / lengths.sum()
+
+    area = float(max(segments[:, [0, 2]].max(), segments[:, [1, 3]].max()) + width)
+    sink_pos = (float(segments[:, [0, 2]].max() / 2), float(segments[:, [1, 3]].max() / 2))
+
+    os.makedirs(path, exist_ok=True)
+    positions = open_memmap(os.path.join(path, "positions.npy"), mode="w+", dtype=dtype, shape=(num_nodes, 2))
+    types = open_memmap(os.path.join(path, "types.npy"), mode="w+", dtype=np.int8, shape=(num_nodes,))
+
+    Nh = int(params.h * num_nodes)
+    Ns = int(params.S * Nh)
+    remaining = np.array([num_nodes - Nh, Nh - Ns, Ns], dtype=np.int64)  # normal, high, super
+    for lo in range(0, num_nodes, chunk_size):
+        n = min(chunk_size, num_nodes - lo)
+        seg = rng.choice(len(segments), size=n, p=weights)
+        along = rng.random(n) * lengths[seg]
+        across = (rng.random(n) - 0.5) * width
+        xy = start[seg] + direction[seg] * along[:, None] + normal[seg] * across[:, None]
+        positions[lo:lo + n] = np.clip(xy, 0.0, area)
+
+        counts = rng.multivariate_hypergeometric(remaining, n)
+        remaining -= counts
+        types[lo:lo + n] = rng.permutation(np.repeat(np.arange(3, dtype=np.int8), counts))
+
+    positions.flush()
+    types.flush()
+    del positions, types
+    scenario = Scenario(None, area=area, sink_pos=sink_pos)
+    np.save(os.path.join(path, "meta.npy"), _meta(scenario))
+    if os.path.exists(os.path.join(path, "energies.npy")):
+        os.remove(os.path.join(path, "energies.npy"))
+    return load_scenario(path)
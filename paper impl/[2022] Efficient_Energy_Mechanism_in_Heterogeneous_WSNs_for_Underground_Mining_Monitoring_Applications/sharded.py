@@ -0,0 +1,372 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from clustering import choose_method, nearest_CH
+from communication import tx_energy
+from counter_rng import CounterRNG, RoundRNG
+from deployment import Deployment
+from election import draw_CHs
+from params import resolve
+from utils import stop_dead_count
+
+from e_deecp.init_nodes import initialize_nodes as init_proposed_nodes, total_energy as total_energy_proposed
+from deecp.init_nodes import initialize_nodes as init_baseline_nodes, total_energy as total_energy_baseline
+from e_deecp.ch_selection import ch_thresholds as ch_thresholds_proposed
+from deecp.ch_selection import ch_thresholds as ch_thresholds_baseline
+
+from q_learn_deecp.q_learning_agent import QLearningPopulation
+from q_learn_deecp.q_learning_ch_selection import select_CHs_population, update_population
+from network_state import NUM_ACTIONS, NUM_STATES, NetworkState
+
+ROLE_DEAD, ROLE_CM, ROLE_CH = range(3)  # Per-node role codes published each round
+REACH_SLACK = 1e-9                      # Relative margin on distance bounds (rounding of sqrt)
+
+
+class SharedArrays:
+    """
+    Named numpy arrays backed by multiprocessing.shared_memory blocks.
+
+    The creating process owns the blocks (close + unlink); workers attach to
+    them by the spec (name → (block name, shape, dtype)) and only close.
+    """
+    def __init__(self, spec=None):
+        self.blocks = {}
+        self.arrays = {}
+        self.owner = spec is None
+        for name, (block, shape, dtype) in (spec or {}).items():
+            self._attach(name, shared_memory.SharedMemory(name=block), shape, dtype)
+
+    def _attach(self, name, shm, shape, dtype):
+        self.blocks[name] = shm
+        self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        return self.arrays[name]
+
+    def create(self, name, shape, dtype, fill=0):
+        nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        array = self._attach(name, shared_memory.SharedMemory(create=True, size=nbytes), shape, dtype)
+        array[...] = fill
+        return array
+
+    def spec(self):
+        return {name: (self.blocks[name].name, a.shape, a.dtype.str) for name, a in self.arrays.items()}
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def close(self):
+        self.arrays = {}
+        for shm in self.blocks.values():
+            shm.close()
+            if self.owner:
+                shm.unlink()
+        self.blocks = {}
+
+
+def shard_bounds(num_nodes, shards):
+    """
+    Slot ranges [bounds[s], bounds[s + 1]) of equal-count strips.
+    """
+    return np.linspace(0, num_nodes, shards + 1).astype(np.int64)
+
+
+def simulate_sharded(method="baseline", params=None, seed=48, shards=None, epsilon_decay=1.0, stop_when=None,
+                     return_deaths=False, max_rounds=None, timeout=None):
+    """
+    index.simulate(method, params, seed, rng="philox") split across worker
+    processes, with identical results.
+
+    Nodes are sorted by x into shards contiguous, equal-count strips, one per
+    process, and every per-node array (positions, node IDs, energies, death
+    rounds, Q-state) lives in shared memory in that slot order, so each
+    worker's strip is a zero-copy slice. Each round ends with one barrier,
+    after which every shard sees the round's published roles, member counts
+    (one (shards, N) row per shard) and energy snapshot. Those are
+    preallocated and double-buffered by round parity, so a shard may start
+    round r + 1 while others still read round r. A round of a shard:
+
+    1. settle the previous round: its CHs pay receive / aggregation once per
+       member (bit-identical to np.subtract.at) and the sink link. Any node's
+       energy after a round is a pure function of the published buffers, so
+       every shard recounts the network's alive nodes itself (one pass over
+       the snapshot), books dead / packet totals and applies stop_when with
+       no further exchange;
+    2. elect the CHs of the strip and of a window around it (last round's
+       largest member-CH distance). Keyed Philox draws depend on node ID only
+       and a neighbour's energies are settled from the buffers, so re-running
+       its election yields its exact CH flags without exchanging them;
+    3. match the strip's members to the window's CHs, ties to the lowest node
+       ID, doubling the window (and electing the nodes it adds) until every
+       member's CH is provably inside it. Members pay their transmission and
+       count themselves into their CH's column; roles, counts and energies
+       are published before the barrier.
+
+    q_learning cannot re-run foreign elections (they read Q-tables other
+    workers are updating), so it publishes its roles behind a second barrier.
+
+    Parameters:
+    - method, params, seed, epsilon_decay, stop_when, return_deaths, max_rounds: as in index.simulate
+    - shards: worker processes (default: CPU count)
+    - timeout: seconds a worker waits at a barrier before the run is aborted
+
+    Returns:
+    - dead, alive, throughput[, death_round] like index.simulate
+    """
+    params = resolve(params)
+    shards = shards or mp.cpu_count()
+    NUM_NODES, ROUNDS = params.NUM_NODES, params.ROUNDS
+    if shards < 1 or shards > NUM_NODES:
+        raise ValueError(f"shards must be in [1, NUM_NODES], got {shards}")
+    num_rounds = ROUNDS if max_rounds is None else min(max_rounds, ROUNDS)
+
+    # Same layout and node types as index.simulate
+    np.random.seed(seed)
+    positions = np.random.rand(NUM_NODES, 2) * params.AREA
+    init_nodes = init_baseline_nodes if method == "baseline" else init_proposed_nodes
+    state = init_nodes(params, as_state=True)
+
+    order = np.argsort(positions[:, 0], kind="stable")
+    shared = SharedArrays()
+    try:
+        shared.create("ids", (NUM_NODES,), np.int64)[...] = order
+        shared.create("positions", (NUM_NODES, 2), np.float64)[...] = positions[order]
+        shared.create("energies", (NUM_NODES,), np.float64)[...] = state.energies[order]
+        shared.create("death_round", (NUM_NODES,), np.int32, fill=-1)
+        shared.create("roles", (2, NUM_NODES), np.int8)
+        shared.create("joins", (2, shards, NUM_NODES), np.int32)
+        shared.create("snapshot", (2, NUM_NODES), np.float64)[1] = state.energies[order]  # "Round -1"
+        shared.create("packets_by_shard", (2, shards), np.int64)
+        shared.create("dead", (num_rounds,), np.int32)
+        shared.create("packets", (num_rounds,), np.int64)
+        shared.create("rounds_run", (1,), np.int64)
+        if method == "q_learning":
+            shared.create("q_tables", (NUM_NODES, NUM_STATES, NUM_ACTIONS), np.float64)
+            shared.create("last_states", (NUM_NODES,), np.uint8)
+            shared.create("last_actions", (NUM_NODES,), np.uint8)
+
+        ctx = mp.get_context()
+        barrier = ctx.Barrier(shards, timeout=timeout)
+        config = {
+            "method": method, "params": params, "seed": seed, "num_rounds": num_rounds,
+            "epsilon_decay": epsilon_decay, "stop_dead": stop_dead_count(stop_when, NUM_NODES),
+            "bounds": shard_bounds(NUM_NODES, shards),
+            "layout": Deployment(positions[order], params, pairwise=False),  # Slot order, shared by every worker
+        }
+        workers = [
+            ctx.Process(target=_worker, args=(s, config, shared.spec(), barrier), daemon=True)
+            for s in range(shards)
+        ]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        failed = [s for s, w in enumerate(workers) if w.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"Shard worker(s) {failed} failed")
+
+        stop_round = int(shared["rounds_run"][0])
+        dead_nodes = shared["dead"][:stop_round].copy()
+        throughput_packets = shared["packets"][:stop_round].copy()
+        death_round = np.empty(NUM_NODES, dtype=np.int32)
+        death_round[order] = shared["death_round"]
+    finally:
+        shared.close()
+
+    alive_nodes = NUM_NODES - dead_nodes
+    cumulative_throughput_bits = np.cumsum(throughput_packets * params.packet_size)
+    if return_deaths:
+        return dead_nodes, alive_nodes, cumulative_throughput_bits, death_round
+    return dead_nodes, alive_nodes, cumulative_throughput_bits
+
+
+def _worker(shard, config, spec, barrier):
+    shared = SharedArrays(spec)
+    try:
+        _run_shard(shard, config, shared, barrier)
+    except BaseException:
+        barrier.abort()  # Release the other shards instead of leaving them at the barrier
+        raise
+    finally:
+        shared.close()
+
+
+def _run_shard(shard, config, shared, barrier):
+    method, params = config["method"], config["params"]
+    NUM_NODES, packet_size = params.NUM_NODES, params.packet_size
+    num_rounds, stop_dead = config["num_rounds"], config["stop_dead"]
+    bounds = config["bounds"]
+    lo, hi = int(bounds[shard]), int(bounds[shard + 1])
+
+    ids = shared["ids"]
+    all_positions = shared["positions"]
+    roles, joins, snapshot = shared["roles"], shared["joins"], shared["snapshot"]
+    packets_by_shard = shared["packets_by_shard"]
+    xs = all_positions[:, 0]  # Ascending: slots are in x order
+
+    # The strip: zero-copy slices of the shared arrays
+    local_ids = ids[lo:hi]
+    positions = all_positions[lo:hi]
+    energies = shared["energies"][lo:hi]
+    death_round = shared["death_round"][lo:hi]
+    layout = config["layout"]
+    deployment = layout.subset(slice(lo, hi))
+    streams = CounterRNG(config["seed"], method)
+    x_lo, x_hi = xs[lo], xs[hi - 1]
+    start_window = max(x_hi - x_lo, (xs[-1] - xs[0]) / len(bounds), 1e-9)
+    receive_cost = packet_size * params.Eelec + packet_size * params.EDA
+
+    population = None
+    if method == "q_learning":
+        state = NetworkState(energies, np.zeros(hi - lo, dtype=np.int8), positions, shared["q_tables"][lo:hi],
+                             shared["last_states"][lo:hi], shared["last_actions"][lo:hi])
+        population = QLearningPopulation(hi - lo, epsilon_decay=config["epsilon_decay"], state=state)
+        E_total = total_energy_proposed(params)
+    elif method == "baseline":
+        E_total = total_energy_baseline(params)
+        ch_thresholds = ch_thresholds_baseline
+    else:
+        E_total = total_energy_proposed(params)
+        ch_thresholds = ch_thresholds_proposed
+
+    def settled(a, b, r):
+        """
+        Energies of the slots [a, b) after round r (its CHs pay their members).
+        """
+        E = snapshot[r % 2, a:b].copy()
+        was_CH = np.flatnonzero(roles[r % 2, a:b] == ROLE_CH)
+        if len(was_CH):
+            count = joins[r % 2][:, a + was_CH].sum(axis=0)
+            np.subtract.at(E, np.repeat(was_CH, count), receive_cost)
+            E[was_CH] -= layout.etx_sink[a + was_CH]
+        return E
+
+    def span(window):
+        """
+        Slot range [a, b) of the nodes within window of the strip along x.
+        """
+        return int(np.searchsorted(xs, x_lo - window, "left")), int(np.searchsorted(xs, x_hi + window, "right"))
+
+    def elect(a, b, r):
+        """
+        CH flags of round r for the slots [a, b), whichever strips own them.
+        """
+        if population is not None:
+            return roles[r % 2, a:b] == ROLE_CH  # Published behind the extra barrier
+        E = settled(a, b, r - 1)
+        alive = E > 0
+        threshold = ch_thresholds(all_positions[a:b], E, alive, E_total, r, layout.subset(slice(a, b)), params)
+        return draw_CHs(alive, threshold, RoundRNG(streams, r, ids[a:b]))  # One Philox pass for the window
+
+    is_CH_all = np.zeros(NUM_NODES, dtype=bool)  # Round scratch, valid over [known_lo, known_hi)
+    touched = [np.empty(0, dtype=np.int64)] * 2  # Count columns this shard wrote, per parity
+    CH_local, alive, reach = np.empty(0, dtype=np.int64), None, 0.0
+    rounds_run = num_rounds
+    for r in range(num_rounds + 1):
+        p = r % 2
+
+        # 1. Settle round r - 1 and book it; every shard reaches the same stop decision
+        if r > 0:
+            energies[CH_local] = settled(lo, hi, r - 1)[CH_local]
+            death_round[CH_local[energies[CH_local] <= 0]] = r - 1
+            num_alive = np.count_nonzero(settled(0, NUM_NODES, r - 1) > 0)
+            dead = NUM_NODES - num_alive
+            if shard == 0:
+                shared["dead"][r - 1] = dead
+                shared["packets"][r - 1] = packets_by_shard[1 - p].sum()
+            if population is not None:
+                update_population(population, alive, energies, deployment.d_sink_norm, num_alive / NUM_NODES,
+                                  r - 1, params)
+            if stop_dead is not None and dead >= stop_dead:
+                rounds_run = r
+                break
+            if dead == NUM_NODES:
+                if shard == 0:
+                    shared["dead"][r:] = dead  # Terminal state, packets stay zero
+                break
+        if r == num_rounds:
+            break
+
+        # 2. Election: the strip's own (q_learning), or the strip and last round's CH window at once
+        alive = energies > 0
+        window = reach * (1 + REACH_SLACK) if 0 < reach < np.inf else start_window
+        w_lo, w_hi = span(window)
+        if population is not None:
+            is_CH = select_CHs_population(positions, energies, alive, E_total, r, population, deployment=deployment,
+                                          params=params, rng=RoundRNG(streams, r, local_ids))
+            roles[p, lo:hi] = np.where(is_CH, ROLE_CH, np.where(alive, ROLE_CM, ROLE_DEAD))
+            barrier.wait()
+            w_lo, w_hi = lo, hi
+            is_CH_all[lo:hi] = is_CH
+        else:
+            is_CH_all[w_lo:w_hi] = elect(w_lo, w_hi, r)
+            is_CH = is_CH_all[lo:hi].copy()
+            roles[p, lo:hi] = np.where(is_CH, ROLE_CH, np.where(alive, ROLE_CM, ROLE_DEAD))
+        known_lo, known_hi = w_lo, w_hi
+        CH_local = np.flatnonzero(is_CH)
+        CM_local = np.flatnonzero(alive & ~is_CH)
+
+        # 3. Members against the CHs of a window that grows until no outside CH can be closer
+        cm_pos, cm_x = positions[CM_local], positions[CM_local, 0]
+        ch_slot = np.full(len(CM_local), -1, dtype=np.int64)
+        best = np.zeros(len(CM_local))
+        pending = np.arange(len(CM_local))
+        while len(pending):
+            w_lo, w_hi = span(window)
+            if w_lo < known_lo:
+                is_CH_all[w_lo:known_lo] = elect(w_lo, known_lo, r)
+            if w_hi > known_hi:
+                is_CH_all[known_hi:w_hi] = elect(known_hi, w_hi, r)
+            known_lo, known_hi = min(known_lo, w_lo), max(known_hi, w_hi)
+
+            slot, d = _nearest_slots(cm_pos[pending], w_lo + np.flatnonzero(is_CH_all[w_lo:w_hi]), ids, all_positions)
+            edge_lo = x_lo - window if w_lo > 0 else -np.inf  # Nodes outside lie beyond the edges
+            edge_hi = x_hi + window if w_hi < NUM_NODES else np.inf
+            x = cm_x[pending]
+            done = d * (1 + REACH_SLACK) < np.minimum(x - edge_lo, edge_hi - x)
+            if w_lo == 0 and w_hi == NUM_NODES:
+                done[:] = True
+            ch_slot[pending[done]], best[pending[done]] = slot[done], d[done]
+            pending = pending[~done]
+            window *= 2
+        linked = ch_slot >= 0
+        reach = best[linked].max() if np.any(linked) else 0.0
+
+        cm_cost = np.empty(len(CM_local))
+        cm_cost[~linked] = deployment.etx_sink[CM_local[~linked]]
+        cm_cost[linked] = tx_energy(
+            np.linalg.norm(positions[CM_local[linked]] - all_positions[ch_slot[linked]], axis=1), params
+        )
+        energies[CM_local] -= cm_cost
+        death_round[CM_local[energies[CM_local] <= 0]] = r
+
+        # Publish for the CH owners and the other shards' settling
+        joins[p, shard, touched[p]] = 0
+        touched[p] = ch_slot[linked]
+        np.add.at(joins[p, shard], touched[p], 1)
+        snapshot[p, lo:hi] = energies
+        packets = len(CM_local) + len(CH_local)
+        if method in ["proposed", "q_learning"]:
+            packets *= 2
+        packets_by_shard[p, shard] = 2 * packets
+        barrier.wait()
+
+    if shard == 0:
+        shared["rounds_run"][0] = rounds_run
+
+
+def _nearest_slots(cm_pos, ch_slots, ids, all_positions):
+    """
+    Nearest CH slot of every member among ch_slots, ties to the lowest node ID.
+
+    Returns:
+    - slots: (M,) CH slot per member (-1 without candidates)
+    - distances: (M,) distance to it (inf without candidates)
+    """
+    if len(ch_slots) == 0:
+        return np.full(len(cm_pos), -1, dtype=np.int64), np.full(len(cm_pos), np.inf)
+    ch_slots = ch_slots[np.argsort(ids[ch_slots], kind="stable")]
+    ch_pos = all_positions[ch_slots]
+    nearest = nearest_CH(cm_pos, ch_pos, choose_method(len(cm_pos), len(ch_slots)))
+    diff = ch_pos[nearest] - cm_pos
+    return ch_slots[nearest], np.sqrt(np.add.reduce(diff * diff, axis=-1))
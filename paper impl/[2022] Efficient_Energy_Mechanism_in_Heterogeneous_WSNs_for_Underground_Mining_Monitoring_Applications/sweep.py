@@ -0,0 +1,109 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from params import resolve
+
+METHODS = ("baseline", "proposed", "q_learning")
+
+def sweep_grid(configs, methods=METHODS, seeds=(48,), base_params=None):
+    """
+    Expands (NUM_NODES, p_opt) pairs into one task per (N, p_opt, method, seed).
+
+    Returns:
+    - tasks: list of (SimParams, method, seed) tuples
+    """
+    base_params = resolve(base_params)
+    return [
+        (base_params.replace(NUM_NODES=N, p_opt=p), method, seed)
+        for N, p in configs
+        for seed in seeds
+        for method in methods
+    ]
+
+
+def run_task(task, cache_dir=None, **simulate_kwargs):
+    """
+    Runs one grid point in the current process and returns its table row.
+
+    With cache_dir the run goes through a result_cache.ResultCache there.
+    """
+    from result_cache import ResultCache, cached_simulate
+
+    params, method, seed = task
+    cache = ResultCache(cache_dir) if cache_dir is not None else None
+    if cache is not None:
+        result = cached_simulate(cache, method, params, seed, **simulate_kwargs)
+    else:
+        from index import simulate
+
+        dead, alive, throughput, death_round = simulate(
+            method=method, params=params, seed=seed, return_deaths=True, **simulate_kwargs
+        )
+        result = {"dead": dead, "alive": alive, "throughput": throughput, "death_round": death_round}
+    return {
+        "NUM_NODES": params.NUM_NODES,
+        "p_opt": params.p_opt,
+        "method": method,
+        "seed": seed,
+        "dead": np.asarray(result["dead"]),
+        "alive": np.asarray(result["alive"]),
+        "throughput": np.asarray(result["throughput"]),
+        "death_round": result["death_round"],
+    }
+
+
+def run_sweep(configs, methods=METHODS, seeds=(48,), base_params=None, processes=None, cache_dir=None,
+              **simulate_kwargs):
+    """
+    Runs the (N, p_opt, method, seed) grid over a process pool.
+
+    Every task receives its own immutable SimParams and seed, so results do not
+    depend on config.py globals or on which worker ran them, and match the
+    serial path (processes=1) exactly.
+
+    Parameters:
+    - configs: iterable of (NUM_NODES, p_opt) pairs
+    - methods: protocols to run for every pair
+    - seeds: RNG seeds to run for every pair
+    - base_params: SimParams for everything that is not swept
+    - processes: worker count (None = all cores, 1 = serial in this process)
+    - cache_dir: result_cache directory shared by the workers (None = no cache)
+    - simulate_kwargs: forwarded to index.simulate
+
+    Returns:
+    - rows: list of dicts (NUM_NODES, p_opt, method, seed, dead, alive, throughput,
+      death_round), in grid order
+    """
+    tasks = sweep_grid(configs, methods, seeds, base_params)
+    return run_tasks(tasks, processes, cache_dir, **simulate_kwargs)
+
+
+def run_tasks(tasks, processes=None, cache_dir=None, **simulate_kwargs):
+    """
+    Runs (SimParams, method, seed) tasks over a process pool (serial when
+    processes=1) and returns their rows in task order.
+    """
+    worker = partial(run_task, cache_dir=cache_dir, **simulate_kwargs)
+
+    if processes == 1:
+        return [worker(task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(worker, tasks))
+
+
+def results_by_config(rows, seed=None):
+    """
+    Nests sweep rows as results[NUM_NODES][method] = {"dead", "alive", "throughput", "death_round"}.
+    """
+    results = {}
+    for row in rows:
+        if seed is not None and row["seed"] != seed:
+            continue
+        results.setdefault(row["NUM_NODES"], {})[row["method"]] = {
+            "dead": row["dead"], "alive": row["alive"], "throughput": row["throughput"],
+            "death_round": row["death_round"],
+        }
+    return results
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from analytics import NEVER, dead_counts, lifetime_metrics, milestone_rounds, milestone_table
+
+
+def death_log(num_nodes, rounds, seed, survivors=0):
+    rng = np.random.default_rng(seed)
+    death_round = rng.integers(0, rounds, size=num_nodes).astype(np.int32)
+    death_round[rng.choice(num_nodes, survivors, replace=False)] = NEVER
+    return death_round
+
+
+@pytest.mark.parametrize("num_nodes", [1, 2, 5, 50, 51])
+@pytest.mark.parametrize("survivors", [0, 1])
+def test_milestone_rounds_match_death_log(num_nodes, survivors):
+    rounds = 300
+    logs = [death_log(num_nodes, rounds, seed, min(survivors, num_nodes)) for seed in range(4)]
+    series = np.stack([dead_counts(log, rounds) for log in logs])
+
+    from_series = milestone_rounds(series, num_nodes)
+    for i, log in enumerate(logs):
+        assert {name: int(r[i]) for name, r in from_series.items()} == milestone_table(log)
+
+
+@pytest.mark.parametrize("num_nodes", [4, 5, 50, 51])
+def test_lifetime_metrics_use_the_milestone_convention(num_nodes):
+    log = death_log(num_nodes, 300, 0)
+    table, metrics = milestone_table(log), lifetime_metrics(log)
+    assert (metrics["FND"], metrics["HND"], metrics["LND"]) == (table["1st"], table["50%"], table["Last"])
+    assert metrics["HND"] == np.sort(log)[num_nodes // 2]  # The (int(N / 2) + 1)-th death
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+import clustering
+from clustering import BRUTE_FORCE_MAX_PAIRS, KDTREE_K, choose_method, form_clusters, nearest_CH
+
+BACKENDS = ("brute", "kdtree", "grid")
+
+
+def lattice(num_nodes, seed):
+    """
+    Nodes on an integer lattice, so many CMs are equidistant from several CHs.
+    """
+    rng = np.random.default_rng(seed)
+    positions = rng.integers(0, 12, size=(num_nodes, 2)).astype(float)
+    is_CH = rng.random(num_nodes) < 0.15
+    alive = rng.random(num_nodes) < 0.9
+    return positions, is_CH, alive
+
+
+def test_choose_method_small_rounds_use_brute_force():
+    assert choose_method(50, 5) == "brute"
+    assert choose_method(190, 10) == "brute"  # N = 200 at the paper's densities
+    assert choose_method(BRUTE_FORCE_MAX_PAIRS // 100, 100) == "brute"
+
+
+def test_choose_method_large_rounds_use_an_index():
+    expected = "kdtree" if clustering.cKDTree is not None else "grid"
+    assert choose_method(BRUTE_FORCE_MAX_PAIRS // 100 + 1, 100) == expected
+    assert choose_method(950, 50) == expected
+    assert choose_method(2400, 600) == expected
+
+
+def test_choose_method_few_CHs_stay_brute_force():
+    assert choose_method(10**6, KDTREE_K) == "brute"
+
+
+@pytest.mark.parametrize("method", BACKENDS + ("auto",))
+@pytest.mark.parametrize("seed", range(5))
+def test_backends_match_loop_with_ties(method, seed):
+    positions, is_CH, alive = lattice(400, seed)
+    expected = form_clusters(positions, is_CH, alive, method="loop")
+    result = form_clusters(positions, is_CH, alive, method=method)
+    for a, b in zip(expected, result):
+        np.testing.assert_array_equal(a, b)
+
+
+@pytest.mark.parametrize("method", BACKENDS)
+def test_nearest_CH_empty_members(method):
+    ch_pos = np.random.default_rng(0).random((5, 2))
+    assert nearest_CH(np.empty((0, 2)), ch_pos, method).shape == (0,)
+
+
+def test_no_CH_leaves_members_unassigned():
+    positions, _, alive = lattice(100, 0)
+    CH_indices, CM_indices, assignments = form_clusters(positions, np.zeros(100, dtype=bool), alive)
+    assert CH_indices.size == 0
+    np.testing.assert_array_equal(CM_indices, np.flatnonzero(alive))
+    assert np.all(assignments == -1)
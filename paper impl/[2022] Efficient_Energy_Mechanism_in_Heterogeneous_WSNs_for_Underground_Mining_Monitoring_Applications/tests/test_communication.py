@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from communication import transmit
+from deployment import Deployment
+from params import SimParams
+
+PARAMS = SimParams.from_config(NUM_NODES=80)
+
+
+def clusters(seed, lattice):
+    """
+    Random CH/CM split with several CMs per CH and a few orphans sent straight to the sink.
+
+    On a lattice all squared distances are exact, so the loop's per-link
+    np.linalg.norm (a dot product) and the batched row norms round alike.
+    """
+    rng = np.random.default_rng(seed)
+    if lattice:
+        positions = rng.integers(0, int(PARAMS.AREA) + 1, size=(PARAMS.NUM_NODES, 2)).astype(float)
+    else:
+        positions = rng.uniform(0, PARAMS.AREA, size=(PARAMS.NUM_NODES, 2))
+    nodes = rng.permutation(PARAMS.NUM_NODES)
+    CH_indices, CM_indices = np.sort(nodes[:8]), nodes[8:70]
+    assignments = np.full(PARAMS.NUM_NODES, -1)
+    assignments[CM_indices] = rng.choice(CH_indices, size=len(CM_indices))
+    assignments[CM_indices[rng.random(len(CM_indices)) < 0.1]] = -1
+    energies = rng.uniform(0.1, PARAMS.Eo, size=PARAMS.NUM_NODES)
+    return positions, energies, CH_indices, CM_indices, assignments
+
+
+def both_paths(pairwise, seed, lattice):
+    positions, energies, CH_indices, CM_indices, assignments = clusters(seed, lattice)
+    deployment = None if pairwise is None else Deployment(positions, PARAMS, pairwise=pairwise)
+    return [transmit(positions, energies.copy(), CH_indices, CM_indices, assignments, vectorized, deployment, PARAMS)
+            for vectorized in (False, True)]
+
+
+@pytest.mark.parametrize("pairwise", [None, False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_vectorized_transmit_matches_loop_on_lattice(pairwise, seed):
+    loop, batched = both_paths(pairwise, seed, lattice=True)
+    np.testing.assert_array_equal(loop[0], batched[0])
+    assert loop[1] == batched[1]
+
+
+@pytest.mark.parametrize("pairwise", [None, False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_vectorized_transmit_matches_loop_to_rounding(pairwise, seed):
+    # Off the lattice a link length may differ in the last bit (dot product vs summed squares)
+    loop, batched = both_paths(pairwise, seed, lattice=False)
+    np.testing.assert_allclose(loop[0], batched[0], rtol=1e-15, atol=0)
+    assert loop[1] == batched[1]
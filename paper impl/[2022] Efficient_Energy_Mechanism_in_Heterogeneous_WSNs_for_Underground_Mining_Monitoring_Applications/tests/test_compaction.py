@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from index import simulate
+from params import SimParams
+
+METHODS = ("baseline", "proposed", "q_learning")
+PARAMS = SimParams.from_config(NUM_NODES=300, p_opt=0.05, ROUNDS=500, Eo=0.03)  # All nodes die, many repacks
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("rng", ["global", "philox"])
+@pytest.mark.parametrize("clustering", ["full", "incremental"])
+def test_compact_run_matches_full_arrays(method, rng, clustering):
+    full = simulate(method, PARAMS, 8, return_deaths=True, rng=rng, clustering=clustering)
+    compact = simulate(method, PARAMS, 8, return_deaths=True, rng=rng, clustering=clustering, compact=True)
+    for a, b in zip(full, compact):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_compact_requires_vectorized():
+    with pytest.raises(ValueError):
+        simulate("baseline", PARAMS, 8, vectorized=False, compact=True)
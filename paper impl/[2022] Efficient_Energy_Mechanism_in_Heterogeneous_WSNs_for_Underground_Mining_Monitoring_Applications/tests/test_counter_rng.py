@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import counter_rng
+from counter_rng import STREAMS, WORDS_PER_BLOCK, CounterRNG
+
+
+def reference(rng, round_num, ids, stream):
+    """
+    One np.random.Generator(Philox) per node, straight from the counter layout.
+    """
+    out = []
+    for n in ids:
+        counter = [n // WORDS_PER_BLOCK, round_num, STREAMS.index(stream), 0]
+        block = np.random.Generator(np.random.Philox(key=rng.key, counter=counter)).random(WORDS_PER_BLOCK)
+        out.append(block[n % WORDS_PER_BLOCK])
+    return np.array(out)
+
+
+ID_SETS = {
+    "dense": np.arange(3, 200),
+    "shuffled": np.random.default_rng(0).permutation(300)[:120],
+    "sparse": np.array([5, 4_000_003, 17, 999_999_998, 4_000_000]),
+    "repeated": np.array([9, 9, 1_000_000, 8, 1_000_000]),
+}
+
+
+@pytest.mark.parametrize("ids", ID_SETS.values(), ids=ID_SETS.keys())
+@pytest.mark.parametrize("stream", STREAMS)
+def test_uniforms_match_per_node_philox(ids, stream):
+    rng = CounterRNG(48, "proposed")
+    np.testing.assert_array_equal(rng.uniforms(123, ids, stream), reference(rng, 123, ids, stream))
+
+
+@pytest.mark.parametrize("ids", ID_SETS.values(), ids=ID_SETS.keys())
+def test_sparse_and_dense_paths_agree(ids, monkeypatch):
+    rng = CounterRNG(7, "q_learning")
+    dense = rng.uniforms(5, ids, "explore")
+    monkeypatch.setattr(counter_rng, "SPARSE_SPAN", 0)  # Always evaluate the requested blocks only
+    np.testing.assert_array_equal(rng.uniforms(5, ids, "explore"), dense)
+
+
+def test_empty_ids():
+    assert CounterRNG(0, "baseline").uniforms(0, [], "election").shape == (0,)
@@ -0,0 +1,16 @@
+import numpy as np
+import pytest
+
+from deployment import Deployment
+
+
+@pytest.mark.parametrize("pairwise", [False, True])
+def test_subset_slice_matches_index_subset(pairwise):
+    layout = Deployment.random(3, pairwise=pairwise)
+    view, copy = layout.subset(slice(20, 70)), layout.subset(np.arange(20, 70))
+    assert view.num_nodes == copy.num_nodes == 50
+    for name in ("positions", "d_sink", "d_sink_norm", "etx_sink", "d_pair", "etx_pair"):
+        if getattr(copy, name) is None:
+            assert getattr(view, name) is None
+        else:
+            np.testing.assert_array_equal(getattr(view, name), getattr(copy, name))
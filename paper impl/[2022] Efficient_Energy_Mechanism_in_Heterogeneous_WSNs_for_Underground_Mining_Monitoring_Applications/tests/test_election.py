@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from counter_rng import CounterRNG, RoundRNG
+from deecp.ch_selection import select_CHs as select_CHs_deecp
+from e_deecp.ch_selection import select_CHs as select_CHs_e_deecp
+from index import simulate
+from params import SimParams
+
+PARAMS = SimParams.from_config(NUM_NODES=60, p_opt=0.1, ROUNDS=300, Eo=0.05)
+
+
+def network(seed):
+    """
+    Random energies with some dead nodes, placed close to the sink so the
+    distance-aware threshold still elects a few CHs.
+    """
+    rng = np.random.default_rng(seed)
+    positions = np.array(PARAMS.SINK_POS) + rng.uniform(-3, 3, size=(PARAMS.NUM_NODES, 2))
+    energies = rng.uniform(0, PARAMS.Eo, size=PARAMS.NUM_NODES)
+    alive = rng.random(PARAMS.NUM_NODES) < 0.8
+    energies[~alive] = 0
+    return positions, energies, alive
+
+
+@pytest.mark.parametrize("select_CHs", [select_CHs_deecp, select_CHs_e_deecp], ids=["deecp", "e_deecp"])
+@pytest.mark.parametrize("round_num", [0, 7, 42])
+def test_batched_election_matches_loop_on_global_rng(select_CHs, round_num):
+    positions, energies, alive = network(round_num)
+    E_total = PARAMS.NUM_NODES * PARAMS.Eo
+    picked = []
+    for vectorized in (False, True):
+        np.random.seed(11)
+        picked.append(select_CHs(positions, energies, alive, E_total, round_num, vectorized, params=PARAMS))
+        picked.append(np.random.rand())  # Both paths leave the stream at the same place
+    np.testing.assert_array_equal(picked[0], picked[2])
+    assert picked[1] == picked[3]
+
+
+@pytest.mark.parametrize("select_CHs", [select_CHs_deecp, select_CHs_e_deecp], ids=["deecp", "e_deecp"])
+def test_batched_election_matches_loop_on_counter_rng(select_CHs):
+    positions, energies, alive = network(3)
+    rng = RoundRNG(CounterRNG(5, "proposed"), 3)
+    loop = select_CHs(positions, energies, alive, PARAMS.NUM_NODES * PARAMS.Eo, 3, False, params=PARAMS, rng=rng)
+    batched = select_CHs(positions, energies, alive, PARAMS.NUM_NODES * PARAMS.Eo, 3, True, params=PARAMS, rng=rng)
+    np.testing.assert_array_equal(loop, batched)
+
+
+@pytest.mark.parametrize("method", ["baseline", "proposed", "q_learning"])
+@pytest.mark.parametrize("rng", ["global", "philox"])
+def test_vectorized_run_matches_loop(method, rng):
+    kwargs = {"rng_order": "legacy"} if method == "q_learning" else {}
+    loop = simulate(method, PARAMS, 4, return_deaths=True, vectorized=False, rng=rng, **kwargs)
+    batched = simulate(method, PARAMS, 4, return_deaths=True, vectorized=True, rng=rng, **kwargs)
+    for a, b in zip(loop, batched):
+        np.testing.assert_array_equal(a, b)
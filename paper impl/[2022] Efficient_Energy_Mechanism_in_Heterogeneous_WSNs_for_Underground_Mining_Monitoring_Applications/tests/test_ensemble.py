@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from clustering import form_clusters, form_clusters_replicas
+from deployment import Deployment
+from ensemble import simulate_ensemble
+from index import simulate
+from params import SimParams
+
+METHODS = ("baseline", "proposed", "q_learning")
+
+
+def replica_layout(num_replicas, num_nodes, seed):
+    """
+    Lattice replicas (many equidistant CHs); replica 1 has no CH at all.
+    """
+    rng = np.random.default_rng(seed)
+    positions = rng.integers(0, 10, size=(num_replicas * num_nodes, 2)).astype(float)
+    is_CH = rng.random(num_replicas * num_nodes) < 0.2
+    is_CH[num_nodes:2 * num_nodes] = False
+    alive = rng.random(num_replicas * num_nodes) < 0.9
+    return positions, is_CH, alive
+
+
+def per_replica(positions, is_CH, alive, num_replicas):
+    N = len(positions) // num_replicas
+    assignments = -np.ones(len(positions), dtype=int)
+    for s in range(num_replicas):
+        lo = s * N
+        _, _, assign = form_clusters(positions[lo:lo + N], is_CH[lo:lo + N], alive[lo:lo + N], method="loop")
+        assignments[lo:lo + N] = np.where(assign >= 0, assign + lo, -1)
+    return assignments
+
+
+@pytest.mark.parametrize("max_pairs", [0, 10**9])  # per-block index search / single pass
+@pytest.mark.parametrize("pairwise", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_form_clusters_replicas_matches_each_replica(max_pairs, pairwise, seed):
+    S, N = 6, 150
+    positions, is_CH, alive = replica_layout(S, N, seed)
+    d_pair = None
+    if pairwise:
+        d_pair = np.stack([Deployment(positions[s * N:(s + 1) * N]).d_pair for s in range(S)])
+
+    CH_indices, CM_indices, assignments = form_clusters_replicas(positions, is_CH, alive, S, d_pair, max_pairs)
+    np.testing.assert_array_equal(CH_indices, np.flatnonzero(is_CH & alive))
+    np.testing.assert_array_equal(CM_indices, np.flatnonzero(~is_CH & alive))
+    np.testing.assert_array_equal(assignments, per_replica(positions, is_CH, alive, S))
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_ensemble_replicas_reproduce_simulate(method):
+    params = SimParams.from_config(NUM_NODES=60, p_opt=0.1, ROUNDS=400, Eo=0.02)  # Most nodes die
+    seeds = [3, 48, 7]
+    runs = simulate_ensemble(method, seeds, params)
+    for s, seed in enumerate(seeds):
+        dead, alive, throughput, death_round = simulate(method, params, seed, return_deaths=True)
+        np.testing.assert_array_equal(runs["dead"][s], dead)
+        np.testing.assert_array_equal(runs["alive"][s], alive)
+        np.testing.assert_allclose(runs["throughput"][s], throughput, rtol=1e-12)
+        np.testing.assert_array_equal(runs["death_round"][s], death_round)
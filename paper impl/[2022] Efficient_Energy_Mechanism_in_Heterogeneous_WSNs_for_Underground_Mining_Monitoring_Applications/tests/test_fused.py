@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+import fused
+from fused import check_backend
+from index import iter_simulate
+from params import SimParams
+
+BACKENDS = [
+    "python",
+    pytest.param("numba", marks=pytest.mark.skipif(not fused.available(), reason="numba not installed")),
+]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("method", ["baseline", "proposed", "q_learning"])
+def test_backend_matches_numpy(backend, dtype, method):
+    params = SimParams.from_config(NUM_NODES=80, p_opt=0.1, ROUNDS=300, Eo=0.05)
+    assert check_backend(method, params, 48, backend, dtype=dtype) == {}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("num_nodes, p_opt", [(100, 0.05), (1200, 0.05)])  # scan / grid search, with / without d_pair
+def test_backend_energies_follow_numpy_arithmetic(backend, dtype, num_nodes, p_opt):
+    if backend == "python" and num_nodes > 100:
+        pytest.skip("interpreted kernel is too slow for the large layout")
+    params = SimParams.from_config(NUM_NODES=num_nodes, p_opt=p_opt, ROUNDS=40)
+    runs = [
+        [s.energies.copy() for s in iter_simulate("proposed", params, 48, dtype=dtype, energy_view=True, backend=b)]
+        for b in ("numpy", backend)
+    ]
+    for ref, out in zip(*runs):
+        assert out.dtype == ref.dtype == dtype
+        np.testing.assert_allclose(out, ref, rtol=1e-12, atol=0)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from clustering import IncrementalClusters, form_clusters
+from index import simulate
+from params import SimParams
+
+METHODS = ("baseline", "proposed", "q_learning")
+
+
+def rounds(num_nodes, num_rounds, seed):
+    """
+    Lattice nodes (many equidistant CHs) whose CH set drifts by a few nodes per
+    round while nodes die, so most rounds take the incremental path.
+    """
+    rng = np.random.default_rng(seed)
+    positions = rng.integers(0, 30, size=(num_nodes, 2)).astype(float)
+    is_CH = rng.random(num_nodes) < 0.1
+    alive = np.ones(num_nodes, dtype=bool)
+    for _ in range(num_rounds):
+        flip = rng.choice(num_nodes, size=3, replace=False)
+        is_CH[flip] = ~is_CH[flip]
+        alive[rng.choice(num_nodes, size=2, replace=False)] = False
+        yield positions, is_CH.copy(), alive.copy()
+
+
+@pytest.mark.parametrize("churn_threshold", [0.5, np.inf])
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_matches_full_with_ties(churn_threshold, seed):
+    clusterer = None
+    for positions, is_CH, alive in rounds(400, 60, seed):
+        if clusterer is None:
+            clusterer = IncrementalClusters(positions, churn_threshold=churn_threshold)
+        full = form_clusters(positions, is_CH, alive, method="loop")
+        incremental = clusterer(is_CH, alive)
+        for a, b in zip(full, incremental):
+            np.testing.assert_array_equal(a, b)
+    assert clusterer.updates > 0
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("rng", ["global", "philox"])
+def test_incremental_run_matches_full(method, rng):
+    params = SimParams.from_config(NUM_NODES=300, p_opt=0.05, ROUNDS=500, Eo=0.03)
+    full = simulate(method, params, 6, return_deaths=True, rng=rng)
+    incremental = simulate(method, params, 6, return_deaths=True, rng=rng, clustering="incremental")
+    for a, b in zip(full, incremental):
+        np.testing.assert_array_equal(a, b)
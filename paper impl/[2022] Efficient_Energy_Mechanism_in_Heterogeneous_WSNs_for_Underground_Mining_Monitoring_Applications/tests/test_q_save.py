@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from index import iter_simulate, simulate
+from params import SimParams
+from q_learn_deecp.q_learning_agent import load_q_tables
+
+PARAMS = SimParams.from_config(NUM_NODES=40, p_opt=0.1, ROUNDS=200, Eo=0.05)
+
+
+def test_completed_run_saves_tables(tmp_path):
+    path = tmp_path / "q.npz"
+    simulate("q_learning", PARAMS, 3, q_save=str(path))
+    assert load_q_tables(str(path))["q_tables"].shape[0] == PARAMS.NUM_NODES
+
+
+def test_stopped_run_saves_tables(tmp_path):
+    path = tmp_path / "q.npz"
+    simulate("q_learning", PARAMS, 3, q_save=str(path), stop_when="first_death")
+    assert path.exists()
+
+
+def test_failed_run_keeps_previous_tables(tmp_path):
+    path = tmp_path / "q.npz"
+    simulate("q_learning", PARAMS, 3, q_save=str(path))
+    before = load_q_tables(str(path))["q_tables"]
+
+    rounds = iter_simulate("q_learning", PARAMS, 4, q_save=str(path))
+    next(rounds)
+    with pytest.raises(RuntimeError):
+        rounds.throw(RuntimeError("interrupted"))
+    np.testing.assert_array_equal(load_q_tables(str(path))["q_tables"], before)
@@ -0,0 +1,36 @@
+import os
+
+import numpy as np
+import pytest
+
+from params import SimParams
+from result_cache import ResultCache, cacheable, cache_key, cached_simulate
+
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"resume": False, "checkpoint_every": None, "record_dir": None, "q_init": None},
+    {"checkpoint_every": 0, "probe": None, "q_frozen": False},
+])
+def test_default_arguments_stay_cacheable(kwargs):
+    assert cacheable(kwargs)
+
+
+@pytest.mark.parametrize("kwargs", [{"resume": True}, {"checkpoint_every": 50}, {"record_dir": "runs"}])
+def test_active_side_effects_bypass_the_cache(kwargs):
+    assert not cacheable(kwargs)
+
+
+def test_explicit_defaults_share_the_key():
+    params = SimParams.from_config(NUM_NODES=30, ROUNDS=50)
+    assert cache_key(params, "proposed", 1) == cache_key(params, "proposed", 1, resume=False, record_dir=None)
+
+
+def test_cached_simulate_hits_with_resume_off(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    params = SimParams.from_config(NUM_NODES=30, ROUNDS=50)
+    first = cached_simulate(cache, "proposed", params, 1, resume=False)
+    assert len([f for f in os.listdir(tmp_path) if f.endswith(".npz")]) == 1
+    second = cached_simulate(cache, "proposed", params, 1, resume=False)
+    for name in first:
+        np.testing.assert_array_equal(first[name], second[name])
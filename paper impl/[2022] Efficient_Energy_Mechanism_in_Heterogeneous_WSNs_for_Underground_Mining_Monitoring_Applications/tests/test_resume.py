@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from index import iter_simulate, simulate
+from params import SimParams
+
+METHODS = ("baseline", "proposed", "q_learning")
+PARAMS = SimParams.from_config(NUM_NODES=120, p_opt=0.05, ROUNDS=400, Eo=0.03)
+
+
+def assert_same_run(ref, out):
+    for a, b in zip(ref, out):
+        np.testing.assert_array_equal(a, b)
+
+
+def interrupt(method, record_dir, stop_round, **kwargs):
+    """
+    Runs with checkpoints and abandons the run after stop_round rounds.
+    """
+    for snapshot in iter_simulate(method, PARAMS, 2, record_dir=str(record_dir), checkpoint_every=25, **kwargs):
+        if snapshot.round >= stop_round:
+            break
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("rng", ["global", "philox"])
+@pytest.mark.parametrize("stop_round", [10, 60, 137])
+def test_resumed_run_matches_uninterrupted(tmp_path, method, rng, stop_round):
+    ref = simulate(method, PARAMS, 2, return_deaths=True, rng=rng)
+    interrupt(method, tmp_path, stop_round, rng=rng)
+    assert (tmp_path / "checkpoint.npz").exists() == (stop_round >= 25)
+    resumed = simulate(method, PARAMS, 2, return_deaths=True, rng=rng, record_dir=str(tmp_path), checkpoint_every=25,
+                       resume=True)
+    assert_same_run(ref, resumed)
+
+
+def test_resume_without_checkpoint_starts_over(tmp_path):
+    ref = simulate("proposed", PARAMS, 2, return_deaths=True)
+    assert_same_run(ref, simulate("proposed", PARAMS, 2, return_deaths=True, record_dir=str(tmp_path), resume=True))
+
+
+def test_resume_rejects_other_configuration(tmp_path):
+    interrupt("proposed", tmp_path, 60)
+    with pytest.raises(ValueError):
+        simulate("proposed", PARAMS, 3, record_dir=str(tmp_path), checkpoint_every=25, resume=True)
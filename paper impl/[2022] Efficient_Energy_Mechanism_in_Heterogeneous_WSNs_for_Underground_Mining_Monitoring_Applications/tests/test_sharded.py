@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from index import simulate
+from params import SimParams
+from sharded import simulate_sharded
+
+METHODS = ("baseline", "proposed", "q_learning")
+
+
+def assert_same_run(ref, out):
+    for a, b in zip(ref, out):
+        np.testing.assert_array_equal(a, b)
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("num_nodes, shards", [(150, 1), (300, 3), (400, 7)])
+def test_sharded_matches_single_process(method, num_nodes, shards):
+    params = SimParams.from_config(NUM_NODES=num_nodes, p_opt=0.05, ROUNDS=500, Eo=0.03)  # All nodes die
+    ref = simulate(method, params, 5, rng="philox", return_deaths=True)
+    assert_same_run(ref, simulate_sharded(method, params, 5, shards=shards, return_deaths=True))
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("kwargs", [{"stop_when": "first_death"}, {"stop_when": 0.5}, {"max_rounds": 37}])
+def test_sharded_stops_like_single_process(method, kwargs):
+    params = SimParams.from_config(NUM_NODES=300, p_opt=0.05, ROUNDS=500, Eo=0.03)
+    ref = simulate(method, params, 9, rng="philox", return_deaths=True, **kwargs)
+    assert_same_run(ref, simulate_sharded(method, params, 9, shards=4, return_deaths=True, **kwargs))
+
+
+def test_shard_count_is_checked():
+    params = SimParams.from_config(NUM_NODES=10, ROUNDS=5)
+    with pytest.raises(ValueError):
+        simulate_sharded("baseline", params, shards=11)
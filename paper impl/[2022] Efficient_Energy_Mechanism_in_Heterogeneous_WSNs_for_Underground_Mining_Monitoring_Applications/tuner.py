@@ -0,0 +1,190 @@
+import argparse
+import itertools
+import math
+
+import numpy as np
+
+from analytics import NEVER, lifetime_metrics
+from params import SimParams, resolve
+from sweep import METHODS, run_tasks
+
+# ------------------------------
+# Search space
+# ------------------------------
+METRICS = ("FND", "HND", "LND", "throughput", "alive_rounds")
+TUNABLE = ("p_opt", "h", "S", "alpha", "beta")
+DEFAULT_SPACE = {"p_opt": tuple(np.round(np.geomspace(0.005, 0.3, 12), 4))}
+MIN_ROUNDS = 500           # Round budget of the first rung
+ETA = 3                    # Keep 1 / ETA of the candidates per rung, multiply the budget by ETA
+STOP_WHEN = {"FND": "first_death", "HND": 0.5}  # Death metrics known before the budget runs out
+
+
+def candidate_grid(space, max_candidates=None, seed=0):
+    """
+    Cartesian product of the value lists in space, e.g. {"p_opt": [...], "h": [...]}.
+
+    Parameters:
+    - space: dict of TUNABLE field → candidate values
+    - max_candidates: random subset of this size when the product is larger
+    - seed: RNG seed for that subset
+
+    Returns:
+    - list of {field: value} dicts
+    """
+    unknown = set(space) - set(TUNABLE)
+    if unknown:
+        raise ValueError(f"Not tunable: {sorted(unknown)}")
+    names = list(space)
+    grid = [dict(zip(names, map(float, values))) for values in itertools.product(*space.values())]
+    if max_candidates is not None and len(grid) > max_candidates:
+        picks = np.random.default_rng(seed).choice(len(grid), max_candidates, replace=False)
+        grid = [grid[i] for i in sorted(picks)]
+    return grid
+
+
+def score(row, metric, budget):
+    """
+    Lifetime score of one run truncated at budget rounds (higher is better).
+
+    Death milestones not reached within the budget count as the budget
+    (right-censored). Returns (metric, alive node-rounds) so candidates that
+    are censored at the same value are ranked by how much of the network is
+    still alive.
+    """
+    alive_rounds = float(np.sum(row["alive"]))
+    if metric == "alive_rounds":
+        value = alive_rounds
+    elif metric == "throughput":
+        value = float(row["throughput"][-1]) if len(row["throughput"]) else 0.0
+    else:
+        value = lifetime_metrics(row["death_round"])[metric]
+        value = budget if value == NEVER else value
+    return value, alive_rounds
+
+
+def rung_budgets(rounds, min_rounds=MIN_ROUNDS, eta=ETA):
+    """
+    Round budgets min_rounds, min_rounds * eta, ... capped by (and ending at) rounds.
+    """
+    budgets = []
+    budget = min(min_rounds, rounds)
+    while budget < rounds:
+        budgets.append(budget)
+        budget *= eta
+    return budgets + [rounds]
+
+
+def successive_halving(method="proposed", params=None, space=None, metric="HND", seeds=(48,),
+                       min_rounds=MIN_ROUNDS, eta=ETA, max_candidates=None, processes=None,
+                       cache_dir=None, **simulate_kwargs):
+    """
+    Searches p_opt (and optionally h, S, alpha, beta) for the parameters that
+    maximize a lifetime metric of one protocol.
+
+    Every rung runs the surviving candidates for all seeds in parallel
+    (sweep.run_tasks) with simulate(max_rounds=budget), which is the exact
+    prefix of the full ROUNDS-round run, then keeps the best 1 / eta of them
+    for the next, eta times longer, budget. Only the last few candidates are
+    run for the full params.ROUNDS; once a single candidate is left it skips
+    straight to that final budget, so the returned score is never censored
+    by an intermediate budget.
+
+    Parameters:
+    - method: protocol to tune
+    - params: SimParams for everything that is not searched (NUM_NODES, AREA, ROUNDS, ...)
+    - space: dict of TUNABLE field → candidate values (default: 12 log-spaced p_opt)
+    - metric: one of METRICS, averaged over seeds
+    - seeds: RNG seeds every candidate is evaluated on
+    - min_rounds, eta: first-rung budget and reduction factor
+    - max_candidates: random subset of a larger grid
+    - processes: worker count (None = all cores, 1 = serial)
+    - cache_dir: result_cache directory, so repeated searches reuse runs
+    - simulate_kwargs: forwarded to index.simulate
+
+    Returns:
+    - dict with "best" (field → value), "params" (SimParams of the best candidate),
+      "score", "budget" (rounds the score was measured over, always params.ROUNDS)
+      and "history" (one row per rung and candidate: rung, budget, candidate, score)
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    if eta < 2:
+        raise ValueError(f"eta must be at least 2, got {eta}")
+    params = resolve(params)
+    candidates = candidate_grid(DEFAULT_SPACE if space is None else space, max_candidates)
+    stop_when = STOP_WHEN.get(metric)
+
+    history = []
+    budgets = rung_budgets(params.ROUNDS, min_rounds, eta)
+    rung = 0
+    while True:
+        budget = budgets[rung]
+        tasks = [(params.replace(**candidate), method, seed) for candidate in candidates for seed in seeds]
+        rows = run_tasks(tasks, processes, cache_dir, max_rounds=budget, stop_when=stop_when, **simulate_kwargs)
+
+        scores = []
+        for i, candidate in enumerate(candidates):
+            runs = [score(row, metric, budget) for row in rows[i * len(seeds):(i + 1) * len(seeds)]]
+            scores.append(tuple(np.mean(runs, axis=0)))
+            history.append({"rung": rung, "budget": budget, "candidate": candidate, "score": scores[-1][0]})
+
+        # Stable sort: equal scores keep grid order
+        order = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)
+        if rung == len(budgets) - 1:
+            break
+        keep = max(1, math.ceil(len(candidates) / eta))
+        candidates = [candidates[i] for i in order[:keep]]
+        rung = len(budgets) - 1 if len(candidates) == 1 else rung + 1  # A lone survivor goes to the full run
+
+    best = candidates[order[0]]
+    return {
+        "best": best, "params": params.replace(**best), "score": scores[order[0]][0], "budget": budget,
+        "history": history,
+    }
+
+
+def parse_space(items):
+    """
+    ["p_opt=0.01,0.02", "h=0.3,0.5"] → {"p_opt": [0.01, 0.02], "h": [0.3, 0.5]}.
+    """
+    space = {}
+    for item in items:
+        name, values = item.split("=", 1)
+        space[name] = [float(v) for v in values.split(",")]
+    return space
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Successive-halving search for p_opt (and h, S, alpha, beta)")
+    parser.add_argument("--nodes", type=int, required=True, help="NUM_NODES")
+    parser.add_argument("--area", type=float, help="field side (default config.AREA)")
+    parser.add_argument("--method", choices=METHODS, default="proposed")
+    parser.add_argument("--metric", choices=METRICS, default="HND")
+    parser.add_argument("--space", nargs="+", default=[], help="field=v1,v2,... (default: 12 log-spaced p_opt)")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[48])
+    parser.add_argument("--min-rounds", type=int, default=MIN_ROUNDS)
+    parser.add_argument("--eta", type=int, default=ETA)
+    parser.add_argument("--processes", type=int, help="worker count (default: all cores)")
+    parser.add_argument("--cache-dir", help="result_cache directory")
+    args = parser.parse_args(argv)
+
+    overrides = {"NUM_NODES": args.nodes}
+    if args.area is not None:
+        overrides["AREA"] = args.area
+    result = successive_halving(
+        args.method, SimParams.from_config(**overrides), parse_space(args.space) or None, args.metric,
+        tuple(args.seeds), args.min_rounds, args.eta, processes=args.processes, cache_dir=args.cache_dir,
+    )
+
+    for row in result["history"]:
+        values = ", ".join(f"{k}={v:g}" for k, v in row["candidate"].items())
+        print(f"rung {row['rung']}  {row['budget']:>6} rounds  {values:<40} {args.metric}={row['score']:g}")
+    best = ", ".join(f"{k}={v:g}" for k, v in result["best"].items())
+    print(f"\nBest for {args.method}, NUM_NODES={args.nodes}: {best} ({args.metric}={result['score']:g} over {result['budget']} rounds)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,20 +1,15 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
+from analytics import NEVER, milestone_dead_count, milestone_table
+
 
 def print_node_death_comparison(baseline_deaths, proposed_deaths, q_learning_deaths):
-    def extract_milestones(death_rounds):
-        total_nodes = len(death_rounds)
-        death_rounds_sorted = sorted(death_rounds)
-        def get_percentile(p):
-            idx = int(p * total_nodes)
-            return death_rounds_sorted[min(idx, total_nodes - 1)]
-        return {
-            "1st": get_percentile(0.0),
-            "50%": get_percentile(0.5),
-            "90%": get_percentile(0.9),
-            "Last": get_percentile(1.0),
-        }
+    """
+    Milestone table from per-node death rounds (simulate(..., return_deaths=True)),
+    one entry per node; milestones a run never reached print as "never".
+    """
+    def extract_milestones(death_round):
+        return {name: "never" if r == NEVER else r for name, r in milestone_table(death_round).items()}
 
     b = extract_milestones(baseline_deaths)
     p = extract_milestones(proposed_deaths)
@@ -29,3 +24,41 @@ def print_node_death_comparison(baseline_deaths, proposed_deaths, q_learning_dea
     print(f"{'Last Node Death':<30} {b['Last']:>20} {p['Last']:>20} {q['Last']:>20}")
     print("────────────────────────────────────────────────────────────────────────────────────────────────")
 
+
+def stop_dead_count(stop_when, num_nodes):
+    """
+    Dead-node count that ends a run early, or None to run all rounds.
+
+    stop_when: None, "first_death", "all_dead", or a death fraction p in (0, 1]
+    (stops at the same p-milestone print_node_death_comparison reports).
+    """
+    if stop_when is None:
+        return None
+    if stop_when == "first_death":
+        return 1
+    if stop_when == "all_dead":
+        return num_nodes
+    return milestone_dead_count(float(stop_when), num_nodes)
+
+
+def print_ensemble_comparison(baseline, proposed, q_learning):
+    """
+    Milestone table of three ensemble summaries (see ensemble.summarize_ensemble):
+    mean round with the outer percentile band across seeds.
+    """
+    def cell(summary, name):
+        m = summary["milestones"][name]
+        if np.isnan(m["mean"]):
+            return "never"
+        bands = sorted((k for k in m if k.startswith("p")), key=lambda k: float(k[1:]))
+        lo, hi = bands[0], bands[-1]
+        return f"{m['mean']:.0f} [{m[lo]:.0f}-{m[hi]:.0f}]"
+
+    labels = {"1st": "1st Node Death", "50%": "50% Nodes Dead", "90%": "90% Nodes Dead", "Last": "Last Node Death"}
+
+    print("────────────────────────────────────────────────────────────────────────────────────────────────")
+    print(f"{'Milestone (mean [band])':<30} {'Baseline DEECP':>20} {'Enhanced DEECP':>20} {'Q-Learning DEECP':>20}")
+    print("────────────────────────────────────────────────────────────────────────────────────────────────")
+    for name, label in labels.items():
+        print(f"{label:<30} {cell(baseline, name):>20} {cell(proposed, name):>20} {cell(q_learning, name):>20}")
+    print("────────────────────────────────────────────────────────────────────────────────────────────────")